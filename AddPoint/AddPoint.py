@@ -1,28 +1,53 @@
 # -*- coding: utf-8 -*-
-import re
-from qgis.PyQt.QtCore import Qt
+import os
+
+from qgis.PyQt.QtCore import Qt, QTimer, QStringListModel
 from qgis.PyQt.QtGui import QDoubleValidator
 from qgis.PyQt.QtWidgets import (
     QAction, QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLabel, QLineEdit, QPushButton, QCheckBox, QComboBox
+    QLabel, QLineEdit, QPushButton, QCheckBox, QComboBox, QPlainTextEdit,
+    QFileDialog, QSpinBox, QDoubleSpinBox, QApplication, QCompleter
 )
 
 from qgis.core import (
+    QgsApplication,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsFeatureRequest,
     QgsProject,
+    QgsSettings,
     QgsVectorLayer,
     QgsFeature,
     QgsGeometry,
+    QgsLineString,
     QgsPointXY,
     QgsWkbTypes,
-    QgsCoordinateReferenceSystem,
-    QgsCoordinateTransform,
     QgsMessageLog,
+    QgsTask,
     Qgis,
     edit,
     QgsMapLayerProxyModel
 )
 
-from qgis.gui import QgsMapLayerComboBox
+from qgis.gui import QgsMapLayerComboBox, QgsCheckableComboBox, QgsCollapsibleGroupBox, QgsProjectionSelectionWidget
+
+from . import coordparse
+from .instrument import StageStats
+from .repaint import RepaintCoalescer, points_extent
+
+# Batches at least this large use the built-in projection engine when possible
+FAST_PATH_MIN_POINTS = 64
+
+# QgsSettings key remembering whether the panel was open
+SETTINGS_PANEL_VISIBLE = 'AddPoint/panelVisible'
+
+# Entry history database, in the QGIS profile folder
+HISTORY_FILE = 'addpoint_history.sqlite'
+HISTORY_RECENT = 20
+
+# Gazetteer source files (CSV/GeoPackage) and their compiled index
+SETTINGS_GAZETTEER_SOURCES = 'AddPoint/gazetteerSources'
+GAZETTEER_INDEX_FILE = 'addpoint_gazetteer.idx'
 
 LANG = {
     'sl': {
@@ -35,9 +60,15 @@ LANG = {
         'format_3794': 'D96/TM – Slovenija (EPSG:3794, metri)',
         'format_3857': 'Web Mercator (EPSG:3857, metri)',
         'format_utm': 'UTM',
+        'format_mgrs': 'MGRS / UTM s pasom',
 
         # Vnosni način
         'input_mode_single': 'Vnos v enem polju (E N)',
+        'input_mode_batch': 'Paketni vnos (ena točka na vrstico)',
+        'chk_autodetect': 'Samodejno zaznaj format in vrstni red',
+        'msg_detected': 'Zaznano: {fmt}, {order}',
+        'msg_detected_zone': '; predlagana cona {zone}',
+        'batch_label': 'Koordinate (vrstice):',
         'single_label': 'Koordinate:',
         'single_order_label': 'Vrstni red:',
         'single_order_en': 'E N',
@@ -74,10 +105,105 @@ LANG = {
         'warn_parse_dd': 'Pričakovan format DD: npr. 14.50597 ali -14.50597',
         'warn_parse_ddm': 'Pričakovan format DDM: stopinje minute.dec (npr. 14 30.3582 E)',
         'warn_parse_dms': 'Pričakovan format DMS: stopinje minute sekunde (npr. 14 30 21.5 E)',
+        'warn_parse_mgrs': 'Pričakovan MGRS (npr. 33TWM 56789 01234) ali UTM s cono in pasom (npr. 33T 456789 5101234)',
+        'warn_mgrs_polar': 'MGRS ne pokriva polarnih območij (izven 80° J – 84° S).',
         'err_transform': 'Neuspešna transformacija koordinat: {err}',
         'err_add_feature': 'Dodajanje točke je spodletelo.',
         'msg_point_added': 'Točka dodana v sloj: {layer}',
-        'err_mem_layer': 'Neuspešna tvorba memory sloja.'
+        'err_minutes_range': 'Minute morajo biti v intervalu [0, 60).',
+        'err_seconds_range': 'Sekunde morajo biti v intervalu [0, 60).',
+        'err_degrees_bounds': 'Stopinje presegajo dovoljene meje.',
+        'err_unknown_format': 'Neznan format koordinat.',
+        'btn_import': 'Uvozi datoteko …',
+        'import_dialog_title': 'Izberi datoteko s koordinatami',
+        'import_filter': 'Besedilne datoteke (*.csv *.txt);;Vse datoteke (*)',
+        'task_import': 'AddPoint: uvoz {name}',
+        'msg_import_done': 'Uvoženih {added} od {total} vrstic v sloj: {layer} (neuspešnih: {failed})',
+        'msg_import_canceled': 'Uvoz preklican po {added} točkah.',
+        'err_import': 'Uvoz ni uspel: {err}',
+        'chk_fast_proj': 'Hitra projekcija paketov (vgrajen NumPy izračun)',
+        'chk_buffered': 'Odloženo shranjevanje (sloj ostane v urejanju)',
+        'flush_count_label': 'Shrani po številu točk:',
+        'flush_interval_label': 'Shrani vsakih (s, 0 = izklop):',
+        'btn_commit': 'Shrani spremembe',
+        'pending_label': 'Neshranjene točke: {count}',
+        'err_commit': 'Shranjevanje sloja {layer} ni uspelo: {err}',
+        'warn_batch_empty': 'Vnesi vsaj eno vrstico s koordinatami.',
+        'msg_batch_added': 'Dodanih {added} od {total} točk v sloj: {layer}',
+        'warn_batch_failed': 'Neuspešne vrstice: {count} (prva: {first})',
+        'batch_line_error': 'Vrstica {line}: {err}',
+        'err_mem_layer': 'Neuspešna tvorba memory sloja.',
+        'stats_group': 'Meritve časov',
+        'chk_stats': 'Merjenje časov po fazah',
+        'btn_stats_reset': 'Ponastavi',
+        'btn_stats_export': 'Izvozi JSON…',
+        'stats_export_title': 'Shrani meritve',
+        'stats_export_filter': 'JSON (*.json)',
+        'stats_empty': 'Ni meritev.',
+        'stats_transform_cache': 'Predpomnilnik transformacij: {hits} zadetkov, {misses} zgrešitev '
+                                 '({transforms} shranjenih); CRS: {crs_hits} zadetkov, {crs_misses} zgrešitev',
+        'msg_stats_exported': 'Meritve shranjene: {path}',
+        'live_group': 'Živi vir (GNSS/NMEA)',
+        'live_source_label': 'Vir:',
+        'live_policy_label': 'Ob zasičenju:',
+        'live_policy_drop': 'Zavrzi najstarejše',
+        'live_policy_decimate': 'Redči',
+        'live_batch_label': 'Zapiši vsakih N točk:',
+        'live_interval_label': 'ali vsakih (ms):',
+        'btn_live_start': 'Začni',
+        'btn_live_stop': 'Ustavi',
+        'live_status': 'Prejeto: {received}, zapisano: {written}, zavrženo: {dropped}',
+        'err_live_open': 'Vira ni mogoče odpreti: {err}',
+        'err_live_stopped': 'Živi vir ustavljen: {err}',
+        'chk_dedup': 'Preveri dvojnike v razdalji (m):',
+        'dedup_warn': 'Opozori',
+        'dedup_skip': 'Preskoči',
+        'dedup_merge': 'Združi',
+        'msg_duplicates_warn': 'Točk bližje kot {tol} m obstoječim: {count}',
+        'msg_duplicates_skipped': 'Preskočeni dvojniki (bližje kot {tol} m): {count}',
+        'msg_duplicates_merged': 'Združeni dvojniki (bližje kot {tol} m): {count}',
+        'import_workers_label': 'Procesi za uvoz velikih datotek:',
+        'btn_copy_selected': 'Kopiraj koordinate izbranih',
+        'btn_save_selected': 'Shrani koordinate izbranih …',
+        'save_coords_title': 'Shrani koordinate',
+        'save_coords_filter': 'Besedilne datoteke (*.txt *.csv);;Vse datoteke (*)',
+        'warn_no_selection': 'Na sloju {layer} ni izbranih točk.',
+        'msg_coords_copied': 'Koordinate kopirane v odložišče: {count}',
+        'msg_coords_saved': 'Koordinate shranjene ({count}): {path}',
+        'btn_capture': 'Zajemi s karte',
+        'tip_capture': 'Prikaz položaja kazalca v izbranem formatu; klik doda točko v ciljni sloj',
+        'chk_rejected_layer': 'Zavrnjene vrstice v sloj',
+        'rejected_layer_name': 'AddPoint_zavrnjene',
+        'log_batch_code': 'Paket: {count} × {err}',
+        'log_batch_warned': 'Paket: {count} vrstic z opozorilom (prva, vrstica {line}: {warn})',
+        'msg_rejected_layer': 'Zavrnjene vrstice ({count}) so v sloju: {layer}',
+        'output_label': 'Nov sloj kot:',
+        'output_memory': 'Začasni sloj (pomnilnik)',
+        'output_gpkg': 'GeoPackage',
+        'output_fgb': 'FlatGeobuf',
+        'output_crs_label': 'KS novega sloja:',
+        'btn_import_new': 'Uvozi v nov sloj …',
+        'output_dialog_title': 'Shrani nov sloj',
+        'output_filter_gpkg': 'GeoPackage (*.gpkg)',
+        'output_filter_fgb': 'FlatGeobuf (*.fgb)',
+        'warn_fgb_create': 'FlatGeobuf se zapiše v enem kosu; uporabite »Uvozi v nov sloj«.',
+        'chk_write_queue': 'Oddaljene sloje (PostGIS, WFS-T …) zapisuj v ozadju',
+        'queue_status': 'Zapis v ozadju: {pending} v čakanju, {committed} zapisanih, {failed} neuspešnih',
+        'err_queue_write': 'Zapis {count} geoobjektov v sloj {layer} ni uspel: {err}',
+        'extra_layers_label': 'Zapiši tudi v sloje:',
+        'msg_fanout': 'Zapisano v {ok} od {count} slojev: {details}',
+        'fanout_failed': 'napaka',
+        'chk_history': 'Shranjuj vnose v zgodovino',
+        'history_label': 'Zgodovina:',
+        'btn_history_add': 'Dodaj znova',
+        'btn_gazetteer': 'Imenik…',
+        'tt_gazetteer': 'Datoteke z imeni krajev in oznakami točk (CSV/GeoPackage); ime ali oznaka se vpiše v polje koordinat',
+        'gazetteer_dialog_title': 'Izberi datoteke imenika',
+        'gazetteer_filter': 'Imenik (*.csv *.txt *.gpkg);;Vse datoteke (*)',
+        'task_gazetteer': 'AddPoint: gradnja indeksa imenika',
+        'msg_gazetteer_ready': 'Indeks imenika pripravljen: {count} imen',
+        'err_gazetteer': 'Napaka pri gradnji indeksa imenika: {err}',
+        'msg_gazetteer_resolved': '»{text}« → {name} ({epsg})'
     },
     'en': {
         'plugin_title': 'AddPoint',
@@ -89,9 +215,15 @@ LANG = {
         'format_3794': 'D96/TM – Slovenia (EPSG:3794, meters)',
         'format_3857': 'Web Mercator (EPSG:3857, meters)',
         'format_utm': 'UTM',
+        'format_mgrs': 'MGRS / UTM with band',
 
         # Input mode
         'input_mode_single': 'Single-field input',
+        'input_mode_batch': 'Batch input (one point per line)',
+        'chk_autodetect': 'Auto-detect format and order',
+        'msg_detected': 'Detected: {fmt}, {order}',
+        'msg_detected_zone': '; suggested zone {zone}',
+        'batch_label': 'Coordinates (lines):',
         'single_label': 'Coordinates:',
         'single_order_label': 'Order:',
         'single_order_en': 'E N',
@@ -128,10 +260,105 @@ LANG = {
         'warn_parse_dd': 'Expected DD format: e.g. 14.50597 or -14.50597',
         'warn_parse_ddm': 'Expected DDM format: degrees minutes.dec (e.g. 14 30.3582 E)',
         'warn_parse_dms': 'Expected DMS format: degrees minutes seconds (e.g. 14 30 21.5 E)',
+        'warn_parse_mgrs': 'Expected MGRS (e.g. 33TWM 56789 01234) or UTM with zone and band (e.g. 33T 456789 5101234)',
+        'warn_mgrs_polar': 'MGRS does not cover the polar regions (outside 80° S – 84° N).',
         'err_transform': 'Coordinate transformation failed: {err}',
         'err_add_feature': 'Adding point failed.',
         'msg_point_added': 'Point added to layer: {layer}',
-        'err_mem_layer': 'Failed to create memory layer.'
+        'err_minutes_range': 'Minutes must be in [0, 60).',
+        'err_seconds_range': 'Seconds must be in [0, 60).',
+        'err_degrees_bounds': 'Degrees exceed allowed bounds.',
+        'err_unknown_format': 'Unknown coordinate format.',
+        'btn_import': 'Import file …',
+        'import_dialog_title': 'Select coordinate file',
+        'import_filter': 'Text files (*.csv *.txt);;All files (*)',
+        'task_import': 'AddPoint: import {name}',
+        'msg_import_done': 'Imported {added} of {total} lines into layer: {layer} (failed: {failed})',
+        'msg_import_canceled': 'Import canceled after {added} points.',
+        'err_import': 'Import failed: {err}',
+        'chk_fast_proj': 'Fast batch projection (built-in NumPy engine)',
+        'chk_buffered': 'Buffered editing (layer stays in edit mode)',
+        'flush_count_label': 'Commit every N points:',
+        'flush_interval_label': 'Commit every (s, 0 = off):',
+        'btn_commit': 'Commit now',
+        'pending_label': 'Pending points: {count}',
+        'err_commit': 'Commit of layer {layer} failed: {err}',
+        'warn_batch_empty': 'Enter at least one line of coordinates.',
+        'msg_batch_added': 'Added {added} of {total} points to layer: {layer}',
+        'warn_batch_failed': 'Failed lines: {count} (first: {first})',
+        'batch_line_error': 'Line {line}: {err}',
+        'err_mem_layer': 'Failed to create memory layer.',
+        'stats_group': 'Timing statistics',
+        'chk_stats': 'Measure stage timings',
+        'btn_stats_reset': 'Reset',
+        'btn_stats_export': 'Export JSON…',
+        'stats_export_title': 'Save timings',
+        'stats_export_filter': 'JSON (*.json)',
+        'stats_empty': 'No measurements.',
+        'stats_transform_cache': 'Transform cache: {hits} hits, {misses} misses ({transforms} cached); '
+                                 'CRS: {crs_hits} hits, {crs_misses} misses',
+        'msg_stats_exported': 'Timings saved: {path}',
+        'live_group': 'Live feed (GNSS/NMEA)',
+        'live_source_label': 'Source:',
+        'live_policy_label': 'When saturated:',
+        'live_policy_drop': 'Drop oldest',
+        'live_policy_decimate': 'Decimate',
+        'live_batch_label': 'Write every N fixes:',
+        'live_interval_label': 'or every (ms):',
+        'btn_live_start': 'Start',
+        'btn_live_stop': 'Stop',
+        'live_status': 'Received: {received}, written: {written}, dropped: {dropped}',
+        'err_live_open': 'Cannot open source: {err}',
+        'err_live_stopped': 'Live feed stopped: {err}',
+        'chk_dedup': 'Check duplicates within (m):',
+        'dedup_warn': 'Warn',
+        'dedup_skip': 'Skip',
+        'dedup_merge': 'Merge',
+        'msg_duplicates_warn': 'Points closer than {tol} m to existing ones: {count}',
+        'msg_duplicates_skipped': 'Skipped duplicates (closer than {tol} m): {count}',
+        'msg_duplicates_merged': 'Merged duplicates (closer than {tol} m): {count}',
+        'import_workers_label': 'Worker processes for large imports:',
+        'btn_copy_selected': 'Copy coordinates of selected',
+        'btn_save_selected': 'Save coordinates of selected …',
+        'save_coords_title': 'Save coordinates',
+        'save_coords_filter': 'Text files (*.txt *.csv);;All files (*)',
+        'warn_no_selection': 'No points selected in layer {layer}.',
+        'msg_coords_copied': 'Coordinates copied to the clipboard: {count}',
+        'msg_coords_saved': 'Coordinates saved ({count}): {path}',
+        'btn_capture': 'Capture from map',
+        'tip_capture': 'Shows the cursor position in the selected format; a click adds a point to the target layer',
+        'chk_rejected_layer': 'Rejected rows to a layer',
+        'rejected_layer_name': 'AddPoint_rejected',
+        'log_batch_code': 'Batch: {count} × {err}',
+        'log_batch_warned': 'Batch: {count} rows with a warning (first, line {line}: {warn})',
+        'msg_rejected_layer': 'Rejected rows ({count}) are in layer: {layer}',
+        'output_label': 'New layer as:',
+        'output_memory': 'Scratch layer (memory)',
+        'output_gpkg': 'GeoPackage',
+        'output_fgb': 'FlatGeobuf',
+        'output_crs_label': 'New layer CRS:',
+        'btn_import_new': 'Import to new layer …',
+        'output_dialog_title': 'Save new layer',
+        'output_filter_gpkg': 'GeoPackage (*.gpkg)',
+        'output_filter_fgb': 'FlatGeobuf (*.fgb)',
+        'warn_fgb_create': 'FlatGeobuf is written in one pass; use "Import to new layer".',
+        'chk_write_queue': 'Write remote layers (PostGIS, WFS-T …) in the background',
+        'queue_status': 'Background writes: {pending} pending, {committed} written, {failed} failed',
+        'err_queue_write': 'Writing {count} features to layer {layer} failed: {err}',
+        'extra_layers_label': 'Also write to layers:',
+        'msg_fanout': 'Written to {ok} of {count} layers: {details}',
+        'fanout_failed': 'failed',
+        'chk_history': 'Keep entry history',
+        'history_label': 'History:',
+        'btn_history_add': 'Add again',
+        'btn_gazetteer': 'Gazetteer…',
+        'tt_gazetteer': 'Files of place names and marker IDs (CSV/GeoPackage); type a name or ID into the coordinate field',
+        'gazetteer_dialog_title': 'Choose gazetteer files',
+        'gazetteer_filter': 'Gazetteer (*.csv *.txt *.gpkg);;All files (*)',
+        'task_gazetteer': 'AddPoint: building gazetteer index',
+        'msg_gazetteer_ready': 'Gazetteer index ready: {count} names',
+        'err_gazetteer': 'Building the gazetteer index failed: {err}',
+        'msg_gazetteer_resolved': '"{text}" → {name} ({epsg})'
     }
 }
 
@@ -139,7 +366,9 @@ LANG = {
 class AddPointPlugin:
     def __init__(self, iface):
         self.iface = iface
-        self.canvas = iface.mapCanvas()
+        # iface is None when loaded by qgis_process for the Processing provider only
+        self.canvas = iface.mapCanvas() if iface is not None else None
+        self._provider = None
         self._dock = None
         self._action = None
         self._layers_combo = None
@@ -160,11 +389,22 @@ class AddPointPlugin:
         # UTM zone dropdown
         self._utm_zone_label = None
         self._utm_zone_combo = None
+        self._utm_zone_chosen = False  # picked by hand: detection only suggests
 
         self._format_combo = None
         self._add_to_new_after_create = None
+        self._output_label = None
+        self._output_combo = None
+        self._output_crs_label = None
+        self._output_crs = None
         self._btn_create = None
         self._btn_add = None
+        self._btn_import = None
+        self._btn_import_new = None
+        self._import_workers_label = None
+        self._import_workers_spin = None
+        self._btn_copy_selected = None
+        self._btn_save_selected = None
         self._btn_swap = None
         self._btn_refresh = None
         self._fmt_label = None
@@ -172,23 +412,159 @@ class AddPointPlugin:
         self._lang_btn = None
         self._lang = 'sl'  # default Slovenian
 
+        # Format / order detection
+        self._autodetect_chk = None
+        self._detect_label = None
+
+        # Batch (multi-line) input
+        self._batch_mode_chk = None
+        self._batch_label = None
+        self._batch_edit = None
+        self._rejected_chk = None
+
+        # Map tool (live readout, click to add)
+        self._btn_capture = None
+        self._readout_label = None
+        self._capture_tool = None
+
+        # Built-in projection engine for batches
+        self._fast_proj_chk = None
+
+        # Near-duplicate check
+        self._dedup_chk = None
+        self._dedup_tol_spin = None
+        self._dedup_mode_combo = None
+        self._duplicates = None
+
+        # Buffered editing
+        self._buffered_chk = None
+        self._flush_count_label = None
+        self._flush_count_spin = None
+        self._flush_interval_label = None
+        self._flush_interval_spin = None
+        self._btn_commit = None
+        self._pending_label = None
+        self._buffer = None
+
+        # Background writes to remote layers
+        self._queue_chk = None
+        self._queue_label = None
+        self._write_queue = None
+
+        # Further target layers (fan-out)
+        self._extra_layers_label = None
+        self._extra_layers_combo = None
+
+        # Entry history (SQLite) with completion
+        self._history = None
+        self._history_chk = None
+        self._history_label = None
+        self._history_combo = None
+        self._btn_history_add = None
+        self._history_model = None
+        self._history_matches = {}
+
+        # Offline gazetteer (names/IDs -> coordinates), index opened on first use
+        self._gazetteer_index = None
+        self._gazetteer_task = None
+        self._gazetteer_choice = None
+        self._btn_gazetteer = None
+
+        # Per-stage timings (disabled until switched on in the dock)
+        self._stats = StageStats()
+        self._stats_group = None
+        self._stats_chk = None
+        self._stats_view = None
+        self._btn_stats_reset = None
+        self._btn_stats_export = None
+
+        # Live GNSS feed
+        self._live_group = None
+        self._live_source_label = None
+        self._live_source_edit = None
+        self._live_policy_label = None
+        self._live_policy_combo = None
+        self._live_batch_label = None
+        self._live_batch_spin = None
+        self._live_interval_label = None
+        self._live_interval_spin = None
+        self._btn_live = None
+        self._live_status_label = None
+        self._live = None
+        self._live_layer = None
+
+        # Debounced layer repaints (created on first use)
+        self._repaint = None
+
+        # CRS / transform cache (created on first use)
+        self._transform_cache = None
+
+        # Running background imports (kept referenced until finished)
+        self._tasks = []
+
     # ----------------------------
     # QGIS lifecycle
     # ----------------------------
+    def initProcessing(self):
+        """Register the Processing provider (also called by qgis_process)."""
+        if self._provider is None:
+            from .processingprovider import AddPointProvider
+
+            self._provider = AddPointProvider()
+            QgsApplication.processingRegistry().addProvider(self._provider)
+
     def initGui(self):
+        self.initProcessing()
+        visible = QgsSettings().value(SETTINGS_PANEL_VISIBLE, True, type=bool)
         self._action = QAction("AddPoint panel", self.iface.mainWindow())
         self._action.setCheckable(True)
-        self._action.setChecked(True)
+        self._action.setChecked(visible)
         self._action.triggered.connect(self._toggle_dock)
 
         self.iface.addPluginToMenu("AddPoint", self._action)
         self.iface.addToolBarIcon(self._action)
 
-        self._create_dock()
-        self.iface.addDockWidget(Qt.RightDockWidgetArea, self._dock)
-        self._action.setChecked(True)
+        # The dock is built on first show; if it was open last time, build it
+        # once QGIS is back in its event loop instead of during startup.
+        if visible:
+            QTimer.singleShot(0, self._show_dock_deferred)
 
     def unload(self):
+        if self._provider is not None:
+            QgsApplication.processingRegistry().removeProvider(self._provider)
+            self._provider = None
+        if self._live:
+            self._live.stop()
+            self._live = None
+        if self._extra_layers_combo is not None:
+            QgsProject.instance().layersAdded.disconnect(self._refresh_extra_layers)
+            QgsProject.instance().layersRemoved.disconnect(self._refresh_extra_layers)
+        if self._capture_tool is not None:
+            if self.canvas.mapTool() is self._capture_tool:
+                self.canvas.unsetMapTool(self._capture_tool)
+            self._capture_tool.deleteLater()
+            self._capture_tool = None
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks = []
+        if self._write_queue:
+            self._write_queue.close()
+            self._write_queue = None
+        if self._history:
+            self._history.close()
+            self._history = None
+        if self._gazetteer_index:
+            self._gazetteer_index.close()
+            self._gazetteer_index = None
+        if self._buffer:
+            self._buffer.close()
+            self._buffer = None
+        if self._repaint:
+            self._repaint.close()
+            self._repaint = None
+        if self._duplicates:
+            self._duplicates.close()
+            self._duplicates = None
         if self._action:
             self.iface.removeToolBarIcon(self._action)
             self.iface.removePluginMenu("AddPoint", self._action)
@@ -197,10 +573,25 @@ class AddPointPlugin:
             self.iface.removeDockWidget(self._dock)
             self._dock.deleteLater()
             self._dock = None
+        if self._transform_cache:
+            self._transform_cache.close()
+            self._transform_cache = None
 
     # ----------------------------
     # UI
     # ----------------------------
+    def _ensure_dock(self):
+        """Build and register the dock on first use; returns it."""
+        if self._dock is None:
+            self._create_dock()
+            self.iface.addDockWidget(Qt.RightDockWidgetArea, self._dock)
+        return self._dock
+
+    def _show_dock_deferred(self):
+        # plugin may have been unloaded before the event loop got here
+        if self._action is not None and self._action.isChecked():
+            self._ensure_dock().setVisible(True)
+
     def _create_dock(self):
         self._dock = QDockWidget(LANG[self._lang]['plugin_title'], self.iface.mainWindow())
         self._dock.setObjectName("AddPointDock")
@@ -229,11 +620,23 @@ class AddPointPlugin:
         self._single_mode_chk.stateChanged.connect(self._on_input_mode_changed)
         vbox.addWidget(self._single_mode_chk)
 
-        # UTM zone row (only visible when UTM)
+        # Auto-detection (single-field and batch input)
+        self._autodetect_chk = QCheckBox()
+        self._autodetect_chk.setChecked(True)
+        vbox.addWidget(self._autodetect_chk)
+        self._detect_label = QLabel()
+        vbox.addWidget(self._detect_label)
+
+        # Batch mode checkbox
+        self._batch_mode_chk = QCheckBox()
+        self._batch_mode_chk.stateChanged.connect(self._on_input_mode_changed)
+        vbox.addWidget(self._batch_mode_chk)
+
+        # UTM zone row (only visible when UTM; zones are filled on first use)
         utm_row = QHBoxLayout()
         self._utm_zone_label = QLabel()
         self._utm_zone_combo = QComboBox()
-        self._build_utm_zone_combo()
+        self._utm_zone_combo.activated.connect(self._on_utm_zone_chosen)
         utm_row.addWidget(self._utm_zone_label)
         utm_row.addWidget(self._utm_zone_combo)
         vbox.addLayout(utm_row)
@@ -252,6 +655,7 @@ class AddPointPlugin:
         # Single-field widgets
         self._one_label = QLabel()
         self._one_edit = QLineEdit()
+        self._one_edit.textChanged.connect(self._on_single_text_changed)
         form.addRow(self._one_label, self._one_edit)
 
         # Two-field widgets
@@ -264,6 +668,40 @@ class AddPointPlugin:
 
         vbox.addLayout(form)
 
+        # History: completion in the coordinate fields, recent entries to add again
+        self._history_model = QStringListModel(self._dock)
+        completer = QCompleter(self._history_model, self._dock)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.activated[str].connect(self._on_history_chosen)
+        for line_edit in (self._one_edit, self._lon_edit):
+            line_edit.setCompleter(completer)
+            line_edit.textEdited.connect(self._on_history_prefix)
+        history_row = QHBoxLayout()
+        self._history_label = QLabel()
+        self._history_combo = QComboBox()
+        self._btn_history_add = QPushButton()
+        self._btn_history_add.clicked.connect(self._on_history_readd)
+        history_row.addWidget(self._history_label)
+        history_row.addWidget(self._history_combo, 1)
+        history_row.addWidget(self._btn_history_add)
+        self._btn_gazetteer = QPushButton()
+        self._btn_gazetteer.clicked.connect(self._on_choose_gazetteer)
+        history_row.addWidget(self._btn_gazetteer)
+        vbox.addLayout(history_row)
+        self._history_chk = QCheckBox()
+        self._history_chk.setChecked(True)
+        vbox.addWidget(self._history_chk)
+        self._refresh_history_combo()
+
+        # Batch widgets (one coordinate pair per line)
+        self._batch_label = QLabel()
+        self._batch_edit = QPlainTextEdit()
+        self._batch_edit.textChanged.connect(self._on_batch_text_changed)
+        vbox.addWidget(self._batch_label)
+        vbox.addWidget(self._batch_edit)
+        self._rejected_chk = QCheckBox()
+        vbox.addWidget(self._rejected_chk)
+
         # Swap button (two-field only)
         swap_row = QHBoxLayout()
         self._btn_swap = QPushButton()
@@ -286,25 +724,200 @@ class AddPointPlugin:
         refresh_row.addWidget(self._btn_refresh)
         vbox.addLayout(refresh_row)
 
+        # Further targets: every point goes to the selected layer and these
+        self._extra_layers_label = QLabel()
+        self._extra_layers_combo = QgsCheckableComboBox()
+        vbox.addWidget(self._extra_layers_label)
+        vbox.addWidget(self._extra_layers_combo)
+        self._refresh_extra_layers()
+        QgsProject.instance().layersAdded.connect(self._refresh_extra_layers)
+        QgsProject.instance().layersRemoved.connect(self._refresh_extra_layers)
+
         # Checkbox: add after create
         self._add_to_new_after_create = QCheckBox()
         self._add_to_new_after_create.setChecked(True)
         vbox.addWidget(self._add_to_new_after_create)
 
+        # New layer: memory or file, in a chosen CRS
+        output_form = QFormLayout()
+        self._output_label = QLabel()
+        self._output_combo = QComboBox()
+        for driver in (None, 'GPKG', 'FlatGeobuf'):
+            self._output_combo.addItem('', driver)
+        output_form.addRow(self._output_label, self._output_combo)
+        self._output_crs_label = QLabel()
+        self._output_crs = QgsProjectionSelectionWidget()
+        self._output_crs.setCrs(QgsCoordinateReferenceSystem('EPSG:4326'))
+        output_form.addRow(self._output_crs_label, self._output_crs)
+        vbox.addLayout(output_form)
+
         # Action buttons
         btn_row = QHBoxLayout()
         self._btn_create = QPushButton()
         self._btn_add = QPushButton()
         self._btn_create.clicked.connect(self._on_create_layer)
-        self._btn_add.clicked.connect(self._on_add_point)
+        # clicked(bool) would arrive as target_layer
+        self._btn_add.clicked.connect(lambda: self._on_add_point())
         btn_row.addWidget(self._btn_create)
         btn_row.addWidget(self._btn_add)
         vbox.addLayout(btn_row)
 
+        capture_row = QHBoxLayout()
+        self._btn_capture = QPushButton()
+        self._btn_capture.setCheckable(True)
+        self._btn_capture.toggled.connect(self._on_capture_toggled)
+        self._readout_label = QLabel()
+        self._readout_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        capture_row.addWidget(self._btn_capture)
+        capture_row.addWidget(self._readout_label, 1)
+        vbox.addLayout(capture_row)
+
+        # Fast projection for batches
+        self._fast_proj_chk = QCheckBox()
+        self._fast_proj_chk.setChecked(True)
+        vbox.addWidget(self._fast_proj_chk)
+
+        # Near-duplicate check
+        dedup_row = QHBoxLayout()
+        self._dedup_chk = QCheckBox()
+        self._dedup_tol_spin = QDoubleSpinBox()
+        self._dedup_tol_spin.setRange(0.001, 10000.0)
+        self._dedup_tol_spin.setDecimals(3)
+        self._dedup_tol_spin.setValue(0.5)
+        self._dedup_mode_combo = QComboBox()
+        self._dedup_mode_combo.addItem('', userData='warn')
+        self._dedup_mode_combo.addItem('', userData='skip')
+        self._dedup_mode_combo.addItem('', userData='merge')
+        dedup_row.addWidget(self._dedup_chk)
+        dedup_row.addWidget(self._dedup_tol_spin)
+        dedup_row.addWidget(self._dedup_mode_combo)
+        vbox.addLayout(dedup_row)
+
+        # Background writes to remote layers
+        self._queue_chk = QCheckBox()
+        self._queue_chk.setChecked(True)
+        self._queue_label = QLabel()
+        vbox.addWidget(self._queue_chk)
+        vbox.addWidget(self._queue_label)
+
+        # Buffered editing
+        self._buffered_chk = QCheckBox()
+        self._buffered_chk.stateChanged.connect(self._on_buffered_changed)
+        vbox.addWidget(self._buffered_chk)
+
+        buffer_form = QFormLayout()
+        self._flush_count_label = QLabel()
+        self._flush_count_spin = QSpinBox()
+        self._flush_count_spin.setRange(1, 1000000)
+        self._flush_count_spin.setValue(100)
+        self._flush_count_spin.valueChanged.connect(self._on_buffer_settings_changed)
+        buffer_form.addRow(self._flush_count_label, self._flush_count_spin)
+        self._flush_interval_label = QLabel()
+        self._flush_interval_spin = QSpinBox()
+        self._flush_interval_spin.setRange(0, 86400)
+        self._flush_interval_spin.setValue(30)
+        self._flush_interval_spin.valueChanged.connect(self._on_buffer_settings_changed)
+        buffer_form.addRow(self._flush_interval_label, self._flush_interval_spin)
+        vbox.addLayout(buffer_form)
+
+        commit_row = QHBoxLayout()
+        self._pending_label = QLabel()
+        self._btn_commit = QPushButton()
+        self._btn_commit.clicked.connect(self._on_commit_pending)
+        commit_row.addWidget(self._pending_label)
+        commit_row.addWidget(self._btn_commit)
+        vbox.addLayout(commit_row)
+
+        # File import (background task)
+        self._btn_import = QPushButton()
+        self._btn_import.clicked.connect(self._on_import_file)
+        self._btn_import_new = QPushButton()
+        self._btn_import_new.clicked.connect(self._on_import_new_layer)
+        import_row = QHBoxLayout()
+        import_row.addWidget(self._btn_import)
+        import_row.addWidget(self._btn_import_new)
+        vbox.addLayout(import_row)
+
+        # imported here, not at module level: parallelparse pulls in
+        # multiprocessing and concurrent.futures, too slow for plugin load
+        from .parallelparse import default_workers
+
+        import_form = QFormLayout()
+        self._import_workers_label = QLabel()
+        self._import_workers_spin = QSpinBox()
+        self._import_workers_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self._import_workers_spin.setValue(default_workers())
+        import_form.addRow(self._import_workers_label, self._import_workers_spin)
+        vbox.addLayout(import_form)
+
+        # Coordinates of selected features out as text
+        export_row = QHBoxLayout()
+        self._btn_copy_selected = QPushButton()
+        self._btn_copy_selected.clicked.connect(self._on_copy_selected)
+        self._btn_save_selected = QPushButton()
+        self._btn_save_selected.clicked.connect(self._on_save_selected)
+        export_row.addWidget(self._btn_copy_selected)
+        export_row.addWidget(self._btn_save_selected)
+        vbox.addLayout(export_row)
+
+        # Timing statistics (collapsed by default)
+        self._stats_group = QgsCollapsibleGroupBox()
+        self._stats_group.setCollapsed(True)
+        self._stats_group.collapsedStateChanged.connect(self._refresh_stats_view)
+        stats_box = QVBoxLayout(self._stats_group)
+        self._stats_chk = QCheckBox()
+        self._stats_chk.setChecked(self._stats.enabled)
+        self._stats_chk.stateChanged.connect(self._on_stats_toggled)
+        stats_box.addWidget(self._stats_chk)
+        self._stats_view = QPlainTextEdit()
+        self._stats_view.setReadOnly(True)
+        self._stats_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        stats_box.addWidget(self._stats_view)
+        stats_btn_row = QHBoxLayout()
+        self._btn_stats_reset = QPushButton()
+        self._btn_stats_reset.clicked.connect(self._on_stats_reset)
+        self._btn_stats_export = QPushButton()
+        self._btn_stats_export.clicked.connect(self._on_stats_export)
+        stats_btn_row.addWidget(self._btn_stats_reset)
+        stats_btn_row.addWidget(self._btn_stats_export)
+        stats_box.addLayout(stats_btn_row)
+        vbox.addWidget(self._stats_group)
+
+        # Live GNSS feed (collapsed by default)
+        self._live_group = QgsCollapsibleGroupBox()
+        self._live_group.setCollapsed(True)
+        live_form = QFormLayout(self._live_group)
+        self._live_source_label = QLabel()
+        self._live_source_edit = QLineEdit()
+        self._live_source_edit.setPlaceholderText('tcp://host:port, serial://COM3?baud=4800, /dev/pts/3, track.nmea')
+        live_form.addRow(self._live_source_label, self._live_source_edit)
+        self._live_policy_label = QLabel()
+        self._live_policy_combo = QComboBox()
+        self._live_policy_combo.addItem('', userData='drop')
+        self._live_policy_combo.addItem('', userData='decimate')
+        live_form.addRow(self._live_policy_label, self._live_policy_combo)
+        self._live_batch_label = QLabel()
+        self._live_batch_spin = QSpinBox()
+        self._live_batch_spin.setRange(1, 10000)
+        self._live_batch_spin.setValue(10)
+        live_form.addRow(self._live_batch_label, self._live_batch_spin)
+        self._live_interval_label = QLabel()
+        self._live_interval_spin = QSpinBox()
+        self._live_interval_spin.setRange(100, 600000)
+        self._live_interval_spin.setSingleStep(100)
+        self._live_interval_spin.setValue(1000)
+        live_form.addRow(self._live_interval_label, self._live_interval_spin)
+        self._btn_live = QPushButton()
+        self._btn_live.clicked.connect(self._on_live_toggled)
+        self._live_status_label = QLabel()
+        live_form.addRow(self._btn_live, self._live_status_label)
+        vbox.addWidget(self._live_group)
+
         # Apply localization + visibility + validators
         self._apply_localization()
         self._on_format_changed(self._format_combo.currentIndex())
         self._on_input_mode_changed()
+        self._on_buffered_changed()
 
         container.setLayout(vbox)
         self._dock.setWidget(container)
@@ -319,6 +932,7 @@ class AddPointPlugin:
         self._format_combo.addItem(LANG[self._lang]['format_3794'], userData='EPSG:3794')
         self._format_combo.addItem(LANG[self._lang]['format_3857'], userData='EPSG:3857')
         self._format_combo.addItem(LANG[self._lang]['format_utm'], userData='UTM')
+        self._format_combo.addItem(LANG[self._lang]['format_mgrs'], userData='MGRS')
 
         idx = 0
         for i in range(self._format_combo.count()):
@@ -349,6 +963,14 @@ class AddPointPlugin:
 
         self._utm_zone_combo.blockSignals(False)
 
+    def _ensure_utm_zones(self):
+        if self._utm_zone_combo.count() == 0:
+            self._build_utm_zone_combo()
+
+    def _utm_epsg(self):
+        """Selected UTM zone auth id (default zone until the combo is filled)."""
+        return self._utm_zone_combo.currentData() or coordparse.DEFAULT_UTM_EPSG
+
     def _rebuild_single_order_combo(self):
         """
         Single-field order dropdown:
@@ -380,12 +1002,59 @@ class AddPointPlugin:
         self._btn_swap.setText(L['btn_swap'])
         self._existing_label.setText(L['existing_layer_label'])
         self._btn_refresh.setText(L['btn_refresh_layers'])
+        self._extra_layers_label.setText(L['extra_layers_label'])
+        self._history_label.setText(L['history_label'])
+        self._btn_history_add.setText(L['btn_history_add'])
+        self._btn_gazetteer.setText(L['btn_gazetteer'])
+        self._btn_gazetteer.setToolTip(L['tt_gazetteer'])
+        self._history_chk.setText(L['chk_history'])
         self._add_to_new_after_create.setText(L['chk_add_after'])
         self._btn_create.setText(L['btn_create'])
+        self._output_label.setText(L['output_label'])
+        self._output_combo.setItemText(0, L['output_memory'])
+        self._output_combo.setItemText(1, L['output_gpkg'])
+        self._output_combo.setItemText(2, L['output_fgb'])
+        self._output_crs_label.setText(L['output_crs_label'])
         self._btn_add.setText(L['btn_add'])
+        self._btn_import.setText(L['btn_import'])
+        self._btn_import_new.setText(L['btn_import_new'])
+        self._import_workers_label.setText(L['import_workers_label'])
+        self._btn_copy_selected.setText(L['btn_copy_selected'])
+        self._btn_save_selected.setText(L['btn_save_selected'])
+        self._btn_capture.setText(L['btn_capture'])
+        self._btn_capture.setToolTip(L['tip_capture'])
+        self._fast_proj_chk.setText(L['chk_fast_proj'])
+        self._dedup_chk.setText(L['chk_dedup'])
+        self._dedup_mode_combo.setItemText(0, L['dedup_warn'])
+        self._dedup_mode_combo.setItemText(1, L['dedup_skip'])
+        self._dedup_mode_combo.setItemText(2, L['dedup_merge'])
+        self._queue_chk.setText(L['chk_write_queue'])
+        self._update_queue_status()
+        self._buffered_chk.setText(L['chk_buffered'])
+        self._flush_count_label.setText(L['flush_count_label'])
+        self._flush_interval_label.setText(L['flush_interval_label'])
+        self._btn_commit.setText(L['btn_commit'])
+        self._on_pending_changed(self._buffer.pending_count() if self._buffer else 0)
+        self._stats_group.setTitle(L['stats_group'])
+        self._stats_chk.setText(L['chk_stats'])
+        self._btn_stats_reset.setText(L['btn_stats_reset'])
+        self._btn_stats_export.setText(L['btn_stats_export'])
+        self._refresh_stats_view()
+        self._live_group.setTitle(L['live_group'])
+        self._live_source_label.setText(L['live_source_label'])
+        self._live_policy_label.setText(L['live_policy_label'])
+        self._live_policy_combo.setItemText(0, L['live_policy_drop'])
+        self._live_policy_combo.setItemText(1, L['live_policy_decimate'])
+        self._live_batch_label.setText(L['live_batch_label'])
+        self._live_interval_label.setText(L['live_interval_label'])
+        self._update_live_status()
 
         self._single_mode_chk.setText(L['input_mode_single'])
         self._one_label.setText(L['single_label'])
+        self._batch_mode_chk.setText(L['input_mode_batch'])
+        self._autodetect_chk.setText(L['chk_autodetect'])
+        self._batch_label.setText(L['batch_label'])
+        self._rejected_chk.setText(L['chk_rejected_layer'])
 
         self._utm_zone_label.setText(L['utm_zone_label'])
         self._single_order_label.setText(L['single_order_label'])
@@ -406,25 +1075,142 @@ class AddPointPlugin:
                 self._layers_combo.setLayer(current)
             except Exception:
                 pass
+        self._refresh_extra_layers()
+
+    def _refresh_extra_layers(self, *args):
+        """Refill the further-targets list with the project's point layers, keeping checks."""
+        combo = self._extra_layers_combo
+        checked = set(combo.checkedItemsData())
+        combo.clear()
+        for layer in QgsProject.instance().mapLayers().values():
+            if isinstance(layer, QgsVectorLayer) and layer.geometryType() == QgsWkbTypes.PointGeometry:
+                state = Qt.Checked if layer.id() in checked else Qt.Unchecked
+                combo.addItemWithCheckState(layer.name(), state, layer.id())
+
+    def _on_stats_toggled(self):
+        self._stats.enabled = self._stats_chk.isChecked()
+        self._refresh_stats_view()
+
+    def _on_stats_reset(self):
+        self._stats.reset()
+        if self._transform_cache:
+            self._transform_cache.reset_stats()
+        self._refresh_stats_view()
+
+    def _on_stats_export(self):
+        L = LANG[self._lang]
+        path, _ = QFileDialog.getSaveFileName(self._dock, L['stats_export_title'], 'addpoint_timings.json',
+                                              L['stats_export_filter'])
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self._stats.to_json(
+                    transform_cache=self._transform_cache.stats() if self._transform_cache else None))
+        except OSError as ex:
+            self._message(str(ex), level='critical')
+            return
+        self._message(L['msg_stats_exported'].format(path=path), level='info')
+
+    def _on_live_toggled(self):
+        from .livefeed import LiveFeed
+
+        L = LANG[self._lang]
+        if self._live is not None and self._live.is_running():
+            self._live.stop()
+            return
+        spec = self._live_source_edit.text().strip()
+        layer = self._target_layer()
+        if not spec or layer is None:
+            return
+        self._live_layer = layer
+        self._live = LiveFeed(
+            spec,
+            self._write_live_fixes,
+            batch_size=self._live_batch_spin.value(),
+            interval=self._live_interval_spin.value(),
+            policy=self._live_policy_combo.currentData(),
+        )
+        self._live.fixesWritten.connect(self._update_live_status)
+        self._live.stopped.connect(self._on_live_stopped)
+        try:
+            self._live.start()
+        except Exception as ex:
+            self._live = None
+            self._message(L['err_live_open'].format(err=ex), level='critical')
+            QgsMessageLog.logMessage(f"Live feed open failed: {ex}", 'AddPoint', Qgis.Critical)
+        self._update_live_status()
+
+    def _write_live_fixes(self, points):
+        # fixes are WGS84 lon/lat, i.e. the same source CRS as DD input
+        ok = self._insert_points(self._live_layer, points, coordparse.source_epsg('DD')) is not None
+        if not ok:
+            QTimer.singleShot(0, self._live.stop)
+        return ok
+
+    def _on_live_stopped(self, error):
+        if error:
+            L = LANG[self._lang]
+            self._message(L['err_live_stopped'].format(err=error), level='warning')
+            QgsMessageLog.logMessage(f"Live feed stopped: {error}", 'AddPoint', Qgis.Warning)
+        self._update_live_status()
+
+    def _update_live_status(self):
+        if self._btn_live is None:
+            return
+        L = LANG[self._lang]
+        running = self._live is not None and self._live.is_running()
+        self._btn_live.setText(L['btn_live_stop'] if running else L['btn_live_start'])
+        for w in (self._live_source_edit, self._live_policy_combo, self._live_batch_spin, self._live_interval_spin):
+            w.setEnabled(not running)
+        if self._live is None:
+            self._live_status_label.setText('')
+            return
+        self._live_status_label.setText(L['live_status'].format(
+            received=self._live.received, written=self._live.written, dropped=self._live.dropped))
+
+    def _refresh_stats_view(self):
+        if self._stats_view is None:
+            return
+        if not self._stats.enabled:
+            self._stats_view.setPlainText('')
+        elif not self._stats_group.isCollapsed():
+            # only worth formatting while the section is expanded
+            L = LANG[self._lang]
+            text = self._stats.format_table() or L['stats_empty']
+            if self._transform_cache:
+                text += '\n\n' + L['stats_transform_cache'].format(**self._transform_cache.stats())
+            self._stats_view.setPlainText(text)
 
     def _on_input_mode_changed(self):
-        single = self._single_mode_chk.isChecked()
+        batch = self._batch_mode_chk.isChecked()
+        single = self._single_mode_chk.isChecked() and not batch
+        two_field = not single and not batch
+
+        # single-field checkbox has no effect in batch mode
+        self._single_mode_chk.setEnabled(not batch)
 
         # show/hide single-field controls
         self._one_label.setVisible(single)
         self._one_edit.setVisible(single)
 
-        self._single_order_label.setVisible(single)
-        self._single_order_combo.setVisible(single)
+        # batch lines use the same E N / N E order as the single field
+        self._single_order_label.setVisible(single or batch)
+        self._single_order_combo.setVisible(single or batch)
+
+        # show/hide batch controls
+        self._batch_label.setVisible(batch)
+        self._batch_edit.setVisible(batch)
+        self._rejected_chk.setVisible(batch)
 
         # show/hide two-field controls
-        self._x_label.setVisible(not single)
-        self._lon_edit.setVisible(not single)
-        self._y_label.setVisible(not single)
-        self._lat_edit.setVisible(not single)
+        self._x_label.setVisible(two_field)
+        self._lon_edit.setVisible(two_field)
+        self._y_label.setVisible(two_field)
+        self._lat_edit.setVisible(two_field)
 
-        self._btn_swap.setEnabled(not single)
-        self._btn_swap.setVisible(not single)
+        self._btn_swap.setEnabled(two_field)
+        self._btn_swap.setVisible(two_field)
 
         self._apply_validators()
 
@@ -442,7 +1228,7 @@ class AddPointPlugin:
             n_validator = QDoubleValidator(-90.0, 90.0, 8)
             self._lon_edit.setValidator(e_validator)  # E
             self._lat_edit.setValidator(n_validator)  # N
-        elif fmt in ('DDM', 'DMS'):
+        elif fmt in ('DDM', 'DMS') or fmt in coordparse.GRID_FORMATS:
             self._lon_edit.setValidator(None)
             self._lat_edit.setValidator(None)
         else:
@@ -459,6 +1245,8 @@ class AddPointPlugin:
         self._lon_edit.setPlaceholderText('')
         self._lat_edit.setPlaceholderText('')
         self._one_edit.setPlaceholderText('')
+        if fmt in coordparse.GRID_FORMATS:
+            self._one_edit.setPlaceholderText('33TWM 56789 01234')
 
         self._apply_validators()
 
@@ -467,15 +1255,116 @@ class AddPointPlugin:
         self._set_labels_and_placeholders(fmt)
 
         is_utm = (fmt == 'UTM')
+        if is_utm:
+            self._ensure_utm_zones()
         self._utm_zone_label.setVisible(is_utm)
         self._utm_zone_combo.setVisible(is_utm)
 
         self._apply_validators()
+        if self._capture_tool is not None:
+            self._capture_tool.refresh()
+
+    def _on_buffered_changed(self):
+        buffered = self._buffered_chk.isChecked()
+        for w in (self._flush_count_label, self._flush_count_spin,
+                  self._flush_interval_label, self._flush_interval_spin,
+                  self._pending_label, self._btn_commit):
+            w.setVisible(buffered)
+        if not buffered and self._buffer:
+            self._buffer.flush_all()
+
+    def _on_buffer_settings_changed(self):
+        if self._buffer:
+            self._buffer.flush_count = self._flush_count_spin.value()
+            self._buffer.set_flush_interval(self._flush_interval_spin.value() * 1000)
+
+    def _on_pending_changed(self, count):
+        self._pending_label.setText(LANG[self._lang]['pending_label'].format(count=count))
+
+    def _on_commit_failed(self, layer_name, errors):
+        self._message(LANG[self._lang]['err_commit'].format(layer=layer_name, err=errors), level='critical')
+
+    def _on_commit_pending(self):
+        if self._buffer:
+            self._buffer.flush_all()
+
+    def _buffered_editor(self):
+        from .bufferededit import BufferedEditor
+
+        if self._buffer is None:
+            self._buffer = BufferedEditor(
+                flush_count=self._flush_count_spin.value(),
+                flush_interval=self._flush_interval_spin.value() * 1000,
+                project=QgsProject.instance(),
+            )
+            self._buffer.pendingChanged.connect(self._on_pending_changed)
+            self._buffer.commitFailed.connect(self._on_commit_failed)
+        return self._buffer
+
+    def _on_single_text_changed(self, text):
+        from . import detect
+
+        if self._autodetect_chk.isChecked() and self._single_mode_chk.isChecked():
+            self._apply_detection(detect.detect_text(text, self._reference_lonlat()))
+
+    def _on_batch_text_changed(self):
+        from . import detect
+
+        if self._autodetect_chk.isChecked() and self._batch_mode_chk.isChecked():
+            lines = self._batch_edit.toPlainText().splitlines()
+            self._apply_detection(detect.detect_lines(lines, self._reference_lonlat()))
+
+    def _apply_detection(self, det):
+        """
+        Select the detected format and order in the dock. The UTM zone of the
+        canvas centre is only selected while the operator has not picked a
+        zone; otherwise it is shown in the detection label as a suggestion.
+        """
+        if det is None:
+            self._detect_label.setText('')
+            return
+        L = LANG[self._lang]
+        self._select_combo_data(self._format_combo, det.fmt)
+        self._select_combo_data(self._single_order_combo, det.order)
+        hint = ''
+        if det.utm_epsg:
+            self._ensure_utm_zones()
+            if not self._utm_zone_chosen:
+                self._select_combo_data(self._utm_zone_combo, det.utm_epsg)
+            elif det.utm_epsg != self._utm_epsg():
+                zone = self._utm_zone_combo.itemText(self._utm_zone_combo.findData(det.utm_epsg))
+                hint = L['msg_detected_zone'].format(zone=zone)
+        order = L['single_order_ne'] if det.order == 'NE' else L['single_order_en']
+        self._detect_label.setText(
+            L['msg_detected'].format(fmt=self._format_combo.currentText(), order=order) + hint)
+
+    def _on_utm_zone_chosen(self, _index):
+        self._utm_zone_chosen = True
+
+    def _select_combo_data(self, combo, data):
+        idx = combo.findData(data)
+        if idx >= 0 and idx != combo.currentIndex():
+            combo.setCurrentIndex(idx)
+
+    def _reference_lonlat(self):
+        """Map canvas centre in WGS84 (hint for detection), or None."""
+        try:
+            canvas_crs = self.canvas.mapSettings().destinationCrs()
+            if not canvas_crs.isValid() or not canvas_crs.authid():
+                return None
+            xform = self._transforms().transform(canvas_crs.authid(), self._transforms().crs('EPSG:4326'))
+            center = xform.transform(self.canvas.center())
+            return center.x(), center.y()
+        except Exception:
+            return None
 
     def _current_format(self):
         return self._format_combo.currentData()
 
     def _toggle_dock(self, checked):
+        QgsSettings().setValue(SETTINGS_PANEL_VISIBLE, checked)
+        if checked:
+            self._ensure_dock()
         if self._dock:
             self._dock.setVisible(checked)
 
@@ -489,202 +1378,951 @@ class AddPointPlugin:
         self._lat_edit.setText(x)
 
     def _split_single_field(self, s: str):
-        s = (s or '').strip()
-        if not s:
-            return None, None
-        s = re.sub(r'[;,]', ' ', s)
-        s = re.sub(r'\s+', ' ', s).strip()
-        parts = s.split(' ')
-        if len(parts) < 2:
-            return None, None
-        return parts[0].strip(), parts[1].strip()
+        return coordparse.split_single_field(s)
+
+    def _split_ordered(self, s: str):
+        """
+        Split single-field text and apply the selected order.
+        Returns (E text, N text) or (None, None).
+        """
+        # EN: first=E, second=N
+        # NE: first=N, second=E (Google Maps style)
+        order = self._single_order_combo.currentData() or 'EN'
+        return coordparse.split_ordered(s, order)
 
     def _parse_inputs(self):
         L = LANG[self._lang]
         fmt = self._current_format()
         single = self._single_mode_chk.isChecked()
 
+        if single and fmt in coordparse.GRID_FORMATS:
+            # the whole field is one reference (zone and band included)
+            return self._parse_result(coordparse.parse_grid(self._one_edit.text()))
         if single:
-            a_text, b_text = self._split_single_field(self._one_edit.text())
-            if not a_text or not b_text:
+            x_text, y_text = self._split_ordered(self._one_edit.text())
+            if not x_text or not y_text:
                 raise ValueError(L['warn_enter_two_single'])
-
-            order = self._single_order_combo.currentData() or 'EN'
-            # EN: first=E, second=N
-            # NE: first=N, second=E (Google Maps style)
-            if order == 'NE':
-                x_text, y_text = b_text, a_text  # E = second, N = first
-            else:
-                x_text, y_text = a_text, b_text  # E = first, N = second
         else:
             x_text = (self._lon_edit.text() or '').strip()  # E
             y_text = (self._lat_edit.text() or '').strip()  # N
             if x_text == '' or y_text == '':
                 raise ValueError(L['warn_enter_both'])
 
-        if fmt in ('DD', 'DDM', 'DMS'):
-            lon = self._parse_angle(x_text, kind='lon', fmt=fmt)  # E
-            lat = self._parse_angle(y_text, kind='lat', fmt=fmt)  # N
-            if lon < -180 or lon > 180:
-                raise ValueError(L['warn_range_lon'])
-            if lat < -90 or lat > 90:
-                raise ValueError(L['warn_range_lat'])
-            return lon, lat, 'EPSG:4326'
+        return self._parse_pair(x_text, y_text, fmt)
 
-        try:
-            x = float(x_text.replace(',', '.'))
-            y = float(y_text.replace(',', '.'))
-        except Exception:
-            raise ValueError(L['err_invalid_numeric_metric'])
+    def _parse_batch(self, text):
+        """
+        Validate multi-line input, one coordinate pair per line, into a
+        validation.Validation (status codes per row, no text); empty lines
+        are skipped.
+        """
+        from .validation import validate_text
 
-        if fmt == 'EPSG:3794':
-            if not (300000 <= x <= 800000 and 4000000 <= y <= 6000000):
-                QgsMessageLog.logMessage(L['warn_values_outside_3794'].format(x=x, y=y), 'AddPoint', Qgis.Warning)
-            return x, y, 'EPSG:3794'
+        return validate_text(text, self._current_format(), self._single_order_combo.currentData() or 'EN',
+                             self._utm_epsg())
 
-        if fmt == 'EPSG:3857':
-            if not (-20037508.3428 <= x <= 20037508.3428 and -20037508.3428 <= y <= 20037508.3428):
-                QgsMessageLog.logMessage(L['warn_values_outside_3857'].format(x=x, y=y), 'AddPoint', Qgis.Warning)
-            return x, y, 'EPSG:3857'
+    def _parse_pair(self, x_text, y_text, fmt):
+        return self._parse_result(coordparse.parse_pair(x_text, y_text, fmt, self._utm_epsg()))
 
-        if fmt == 'UTM':
-            zone_epsg = self._utm_zone_combo.currentData() or "EPSG:32633"
-            if not (100000 <= x <= 900000 and 0 <= y <= 10000000):
-                QgsMessageLog.logMessage(L['warn_values_outside_utm'].format(x=x, y=y), 'AddPoint', Qgis.Warning)
-            return x, y, zone_epsg
+    def _parse_result(self, res):
+        if res.code != coordparse.OK:
+            raise ValueError(self._code_message(res.code))
+        self._log_parse_warning(res)
+        return res.x, res.y, res.epsg
 
-        return x, y, 'EPSG:4326'
+    def _code_message(self, code):
+        return LANG[self._lang][coordparse.MESSAGE_KEYS[code]]
+
+    def _log_parse_warning(self, res):
+        if res.warning != coordparse.WARN_NONE:
+            text = LANG[self._lang][coordparse.WARNING_KEYS[res.warning]].format(x=res.x, y=res.y)
+            QgsMessageLog.logMessage(text, 'AddPoint', Qgis.Warning)
 
     def _normalize_angle_text(self, s_up: str) -> str:
-        s_up = (s_up
-                .replace('’', "'")
-                .replace('′', "'")
-                .replace('“', '"')
-                .replace('”', '"')
-                .replace('″', '"'))
-        s_up = re.sub(r"''", '"', s_up)
-        s_up = s_up.replace('°', ' ').replace("'", ' ').replace('"', ' ')
-        s_up = re.sub(r'[;:,]', ' ', s_up)
-        s_up = re.sub(r'\s+', ' ', s_up).strip()
-        return s_up
+        return coordparse.normalize_angle_text(s_up)
 
     def _parse_angle(self, text, kind='lon', fmt='DD'):
-        L = LANG[self._lang]
-        s_up = text.strip().upper().replace(',', '.')
-        hemi_match = re.findall(r'[NSEW]', s_up)
-        hemi = hemi_match[-1] if hemi_match else None
-        s_up = re.sub(r'[NSEW]', '', s_up)
-        s_up = self._normalize_angle_text(s_up)
-        tokens = s_up.split()
-        nums = []
-        for t in tokens:
-            try:
-                nums.append(float(t))
-            except Exception:
-                pass
-
-        if fmt == 'DD':
-            if len(nums) < 1:
-                raise ValueError(L['warn_parse_dd'])
-            deg = nums[0]
-            minutes = seconds = 0.0
-        elif fmt == 'DDM':
-            if len(nums) < 2:
-                raise ValueError(L['warn_parse_ddm'])
-            deg, minutes = nums[0], nums[1]
-            seconds = 0.0
-            if not (0 <= abs(minutes) < 60):
-                raise ValueError('Minute [0, 60).')
-        else:
-            if len(nums) < 3:
-                raise ValueError(L['warn_parse_dms'])
-            deg, minutes, seconds = nums[0], nums[1], nums[2]
-            if not (0 <= abs(minutes) < 60):
-                raise ValueError('Minute [0, 60).')
-            if not (0 <= abs(seconds) < 60):
-                raise ValueError('Seconds [0, 60).')
-
-        sign = 1
-        if deg < 0:
-            sign *= -1
-            deg = abs(deg)
-        if kind == 'lon' and hemi in ('W',):
-            sign = -1
-        if kind == 'lat' and hemi in ('S',):
-            sign = -1
-        if kind == 'lon' and hemi in ('E',):
-            sign = +1 if sign > 0 else -1
-        if kind == 'lat' and hemi in ('N',):
-            sign = +1 if sign > 0 else -1
-
-        value = deg + (abs(minutes) / 60.0) + (abs(seconds) / 3600.0)
-        value *= sign
-
-        max_deg = 180 if kind == 'lon' else 90
-        if deg > max_deg or (deg == max_deg and (abs(minutes) > 0 or abs(seconds) > 0)):
-            raise ValueError('Degrees exceed allowed bounds.')
+        value, code = coordparse.parse_angle(text, kind=kind, fmt=fmt)
+        if code != coordparse.OK:
+            raise ValueError(self._code_message(code))
         return value
 
     def _on_create_layer(self):
         L = LANG[self._lang]
+        driver = self._output_combo.currentData()
+        if driver == 'FlatGeobuf':
+            self._message(L['warn_fgb_create'], level='warning')
+            return
         try:
-            layer_name = 'AddPoint_Scratch'
-            mem_layer = QgsVectorLayer('Point?crs=EPSG:4326', layer_name, 'memory')
-            if not mem_layer or not mem_layer.isValid():
-                raise RuntimeError(L['err_mem_layer'])
-            QgsProject.instance().addMapLayer(mem_layer)
-            self._message(L['msg_layer_created'].format(name=layer_name), level='info')
+            if driver is None:
+                new_layer = self._new_memory_layer()
+            else:
+                from .filewriter import create_point_layer
+
+                path = self._output_path(driver)
+                if not path:
+                    return
+                new_layer = create_point_layer(path, self._output_crs.crs(),
+                                               QgsProject.instance().transformContext(),
+                                               os.path.splitext(os.path.basename(path))[0], driver)
+            QgsProject.instance().addMapLayer(new_layer)
+            self._message(L['msg_layer_created'].format(name=new_layer.name()), level='info')
             if self._add_to_new_after_create.isChecked():
-                self._on_add_point(target_layer=mem_layer)
+                self._on_add_point(target_layer=new_layer)
         except Exception as ex:
             self._message(str(ex), level='critical')
             QgsMessageLog.logMessage(f"_on_create_layer exception: {ex}", 'AddPoint', Qgis.Critical)
 
+    def _new_memory_layer(self):
+        """Empty scratch point layer in the chosen CRS (not added to the project)."""
+        L = LANG[self._lang]
+        crs = self._output_crs.crs()
+        layer_name = 'AddPoint_Scratch'
+        if crs.authid():
+            mem_layer = QgsVectorLayer(f'Point?crs={crs.authid()}', layer_name, 'memory')
+        else:
+            mem_layer = QgsVectorLayer('Point', layer_name, 'memory')
+            mem_layer.setCrs(crs)
+        if not mem_layer or not mem_layer.isValid():
+            raise RuntimeError(L['err_mem_layer'])
+        return mem_layer
+
+    def _output_path(self, driver):
+        from .filewriter import EXTENSIONS
+
+        L = LANG[self._lang]
+        filters = {'GPKG': L['output_filter_gpkg'], 'FlatGeobuf': L['output_filter_fgb']}
+        path, _ = QFileDialog.getSaveFileName(self._dock, L['output_dialog_title'],
+                                              'addpoint' + EXTENSIONS[driver], filters[driver])
+        if path and not path.lower().endswith(EXTENSIONS[driver]):
+            path += EXTENSIONS[driver]
+        return path
+
     def _on_add_point(self, target_layer=None):
+        if self._batch_mode_chk.isChecked():
+            self._on_add_batch(target_layer=target_layer)
+            return
+
+        L = LANG[self._lang]
+        try:
+            with self._stats.stage('parse'):
+                x, y, src_epsg = self._parse_inputs()
+        except Exception as ex:
+            # not coordinates: maybe a place name or marker ID
+            place = self._resolve_place(self._one_edit.text()) if self._single_mode_chk.isChecked() else None
+            if place is None:
+                self._message(str(ex), level='warning')
+                QgsMessageLog.logMessage(f"Parse inputs failed: {ex}", 'AddPoint', Qgis.Warning)
+                return
+            x, y, src_epsg = place.x, place.y, place.epsg
+            QgsMessageLog.logMessage(L['msg_gazetteer_resolved'].format(
+                text=self._one_edit.text().strip(), name=place.name, epsg=place.epsg), 'AddPoint', Qgis.Info)
+
+        layers = self._target_layers(target_layer)
+        if not layers:
+            return
+        if self._add_single_point(layers, x, y, src_epsg):
+            self._remember_entry(x, y, src_epsg, layers)
+
+    def _add_single_point(self, layers, x, y, src_epsg):
+        """Insert one point into the targets and report it; True if it was written anywhere."""
+        L = LANG[self._lang]
+        results = self._insert_points_fanout(layers, [(x, y)], src_epsg)
+        if len(results) > 1:
+            self._message(*self._fanout_message(results))
+        else:
+            # 0 when the point was skipped as a duplicate (already reported)
+            if not results[0][1]:
+                return False
+            self._message(L['msg_point_added'].format(layer=layers[0].name()), level='info')
+        self._refresh_stats_view()
+        return any(n for _layer, n in results)
+
+    def _entry_history(self):
+        """The history database, opened on first use; None if it cannot be opened."""
+        if self._history is None:
+            import sqlite3
+            from .history import EntryHistory
+
+            path = os.path.join(QgsApplication.qgisSettingsDirPath(), HISTORY_FILE)
+            try:
+                self._history = EntryHistory(path)
+            except sqlite3.Error as ex:
+                QgsMessageLog.logMessage(f"History unavailable ({path}): {ex}", 'AddPoint', Qgis.Warning)
+                self._history_chk.setChecked(False)
+                self._history_chk.setEnabled(False)
+        return self._history
+
+    def _remember_entry(self, x, y, src_epsg, layers):
+        """Store the entry just added with its parsed value."""
+        if not self._history_chk.isChecked() or self._entry_history() is None:
+            return
+        if self._single_mode_chk.isChecked():
+            text = self._one_edit.text().strip()
+            e_text = n_text = None
+        else:
+            e_text = self._lon_edit.text().strip()
+            n_text = self._lat_edit.text().strip()
+            text = f'{e_text}  {n_text}'
+        lon, lat = x, y
+        if src_epsg != 'EPSG:4326':
+            xform = self._transforms().transform(src_epsg, self._transforms().crs('EPSG:4326'))
+            pt = xform.transform(QgsPointXY(x, y))
+            lon, lat = pt.x(), pt.y()
+        fmt = self._current_format()
+        self._history.add(text, fmt, self._single_order_combo.currentData() or 'EN',
+                          self._utm_epsg() if fmt == 'UTM' else '', x, y, src_epsg, lon, lat,
+                          ', '.join(layer.name() for layer in layers), e_text, n_text)
+        self._refresh_history_combo()
+
+    def _refresh_history_combo(self):
+        history = self._entry_history()
+        self._history_combo.clear()
+        if history is None:
+            return
+        for entry in history.recent(HISTORY_RECENT):
+            self._history_combo.addItem(f'{entry.text}  [{entry.fmt}]', entry.id)
+
+    def _on_history_prefix(self, text):
+        history = self._entry_history() if self._history_chk.isChecked() else None
+        entries = history.complete(text) if history is not None else []
+        self._history_matches = {entry.text: entry for entry in entries}
+        # the single field also takes place names and marker IDs
+        gazetteer = self._gazetteer() if self._single_mode_chk.isChecked() else None
+        if gazetteer is not None and any(c.isalpha() for c in text):
+            for place in gazetteer.complete(text):
+                self._history_matches.setdefault(place.name, place)
+        self._history_model.setStringList(list(self._history_matches))
+
+    def _on_history_chosen(self, text):
+        from .gazetteer import Place
+
+        entry = self._history_matches.get(text)
+        if isinstance(entry, Place):
+            # the field now shows the display name, which may differ from the key
+            self._gazetteer_choice = entry
+        elif entry is not None:
+            # after the completer has written its text into the field
+            QTimer.singleShot(0, lambda: self._apply_history_entry(entry))
+
+    def _apply_history_entry(self, entry):
+        """Put a past entry back into the inputs with its format, order and zone."""
+        self._select_combo_data(self._format_combo, entry.fmt)
+        self._select_combo_data(self._single_order_combo, entry.order)
+        if entry.utm_epsg:
+            self._ensure_utm_zones()
+            self._select_combo_data(self._utm_zone_combo, entry.utm_epsg)
+            # the entry's zone, not the canvas one, when detection runs on its text
+            self._utm_zone_chosen = True
+        if entry.e_text is None:
+            self._single_mode_chk.setChecked(True)
+            self._one_edit.setText(entry.text)
+        else:
+            self._single_mode_chk.setChecked(False)
+            self._lon_edit.setText(entry.e_text)
+            self._lat_edit.setText(entry.n_text)
+
+    def _gazetteer_sources(self):
+        sources = QgsSettings().value(SETTINGS_GAZETTEER_SOURCES, [], type=list)
+        return [path for path in sources if path]
+
+    def _gazetteer_index_path(self):
+        return os.path.join(QgsApplication.qgisSettingsDirPath(), GAZETTEER_INDEX_FILE)
+
+    def _gazetteer(self):
+        """
+        The gazetteer index, opened on first use. A missing or outdated index
+        is rebuilt in the background; None until it is ready.
+        """
+        if self._gazetteer_index is not None or self._gazetteer_task is not None:
+            return self._gazetteer_index
+        sources = self._gazetteer_sources()
+        if not sources:
+            return None
+        from . import gazetteer
+
+        path = self._gazetteer_index_path()
+        if not gazetteer.index_is_current(path, sources):
+            self._build_gazetteer(sources)
+            return None
+        try:
+            self._gazetteer_index = gazetteer.Gazetteer(path)
+        except (OSError, ValueError) as ex:
+            QgsMessageLog.logMessage(f"Gazetteer index unavailable ({path}): {ex}", 'AddPoint', Qgis.Warning)
+            self._build_gazetteer(sources)
+        return self._gazetteer_index
+
+    def _build_gazetteer(self, sources):
+        from . import gazetteer
+
+        L = LANG[self._lang]
+        path = self._gazetteer_index_path()
+        if self._gazetteer_index is not None:
+            self._gazetteer_index.close()
+            self._gazetteer_index = None
+
+        def build(task):
+            return gazetteer.build_index(sources, path)
+
+        def finished(exception, count=None):
+            self._gazetteer_task = None
+            if exception is not None:
+                self._message(LANG[self._lang]['err_gazetteer'].format(err=exception), level='critical')
+                QgsMessageLog.logMessage(f"Gazetteer index failed: {exception}", 'AddPoint', Qgis.Critical)
+            elif count is not None:
+                self._message(LANG[self._lang]['msg_gazetteer_ready'].format(count=count), level='info')
+
+        self._gazetteer_task = QgsTask.fromFunction(L['task_gazetteer'], build, on_finished=finished)
+        QgsApplication.taskManager().addTask(self._gazetteer_task)
+
+    def _on_choose_gazetteer(self):
         L = LANG[self._lang]
+        sources = self._gazetteer_sources()
+        start_dir = os.path.dirname(sources[0]) if sources else ''
+        paths, _ = QFileDialog.getOpenFileNames(self._dock, L['gazetteer_dialog_title'], start_dir,
+                                                L['gazetteer_filter'])
+        if not paths or self._gazetteer_task is not None:
+            return
+        QgsSettings().setValue(SETTINGS_GAZETTEER_SOURCES, paths)
+        self._build_gazetteer(paths)
+
+    def _resolve_place(self, text):
+        """Place for a name or marker ID typed into the single field, or None."""
+        text = (text or '').strip()
+        choice = self._gazetteer_choice
+        if choice is not None and choice.name == text:
+            return choice
+        gazetteer = self._gazetteer()
+        return gazetteer.lookup(text) if gazetteer is not None else None
+
+    def _on_history_readd(self):
+        """Add the selected past entry again from its stored value (no parsing)."""
+        history = self._entry_history()
+        entry_id = self._history_combo.currentData()
+        entry = history.get(entry_id) if history is not None and entry_id is not None else None
+        if entry is None:
+            return
+        layers = self._target_layers()
+        if not layers:
+            return
+        if self._add_single_point(layers, entry.x, entry.y, entry.src_epsg):
+            history.touch(entry.id, ', '.join(layer.name() for layer in layers))
+            self._refresh_history_combo()
+
+    def _on_capture_toggled(self, checked):
+        if self.canvas is None:
+            return
+        if not checked:
+            if self._capture_tool is not None and self.canvas.mapTool() is self._capture_tool:
+                self.canvas.unsetMapTool(self._capture_tool)
+            return
+        if self._capture_tool is None:
+            from .maptool import CoordinateTool
+
+            self._capture_tool = CoordinateTool(self.canvas, self._capture_readout)
+            self._capture_tool.readoutChanged.connect(self._readout_label.setText)
+            self._capture_tool.pointCaptured.connect(self._on_point_captured)
+            # another map tool was chosen
+            self._capture_tool.deactivated.connect(lambda: self._btn_capture.setChecked(False))
+        self.canvas.setMapTool(self._capture_tool)
+
+    def _canvas_point_in_format(self, point):
+        """Canvas position as (x, y, auth id) in the CRS of the current format."""
+        if self._current_format() in coordparse.GRID_FORMATS:
+            x, y, epsg, _lat = self._canvas_point_utm(point)
+            return x, y, epsg
+        epsg = coordparse.source_epsg(self._current_format(), self._utm_epsg())
+        canvas_crs = self.canvas.mapSettings().destinationCrs()
+        if self._transforms().crs(epsg) == canvas_crs:
+            return point.x(), point.y(), epsg
+        # the cached format -> canvas transform, run backwards
+        xform = self._transforms().transform(epsg, canvas_crs)
+        pt = xform.transform(point, QgsCoordinateTransform.ReverseTransform)
+        return pt.x(), pt.y(), epsg
+
+    def _canvas_point_utm(self, point):
+        """Canvas position as (x, y, auth id, latitude) in the MGRS grid zone containing it."""
+        from .mgrs import grid_zone_epsg
+
+        canvas_crs = self.canvas.mapSettings().destinationCrs()
+        wgs84 = self._transforms().transform('EPSG:4326', canvas_crs).transform(
+            point, QgsCoordinateTransform.ReverseTransform)
+        epsg = grid_zone_epsg(wgs84.x(), wgs84.y())
+        pt = self._transforms().transform(epsg, canvas_crs).transform(point, QgsCoordinateTransform.ReverseTransform)
+        return pt.x(), pt.y(), epsg, wgs84.y()
+
+    def _capture_readout(self, point):
+        from .coordformat import format_point
+
+        if self._current_format() in coordparse.GRID_FORMATS:
+            from .mgrs import encode
+
+            x, y, epsg, lat = self._canvas_point_utm(point)
+            try:
+                return encode(int(epsg[-2:]), lat, x, y)
+            except ValueError:
+                return LANG[self._lang]['warn_mgrs_polar']
+        x, y, _epsg = self._canvas_point_in_format(point)
+        return format_point(x, y, self._current_format(), self._single_order_combo.currentData() or 'EN', '  ')
+
+    def _on_point_captured(self, point):
+        layers = self._target_layers()
+        if not layers:
+            return
         try:
-            x, y, src_epsg = self._parse_inputs()
+            x, y, src_epsg = self._canvas_point_in_format(point)
         except Exception as ex:
             self._message(str(ex), level='warning')
-            QgsMessageLog.logMessage(f"Parse inputs failed: {ex}", 'AddPoint', Qgis.Warning)
             return
+        # same insert path (and duplicate check) as typed coordinates
+        self._add_single_point(layers, x, y, src_epsg)
+
+    def _on_add_batch(self, target_layer=None):
+        L = LANG[self._lang]
+        text = self._batch_edit.toPlainText()
+        with self._stats.stage('parse', items=text.count('\n') + 1):
+            result = self._parse_batch(text)
+        if not len(result):
+            self._message(L['warn_batch_empty'], level='warning')
+            return
+
+        rejected = result.rejected()
+        self._log_batch_summary(result, rejected)
+
+        layers = self._target_layers(target_layer)
+        if not layers:
+            return
+
+        # one group per source CRS (per UTM zone for MGRS)
+        groups = result.points_by_epsg()
+        if groups:
+            results = self._insert_groups_fanout(layers, groups)
+        else:
+            results = [(layer, 0) for layer in layers]
+        if len(results) > 1:
+            text, level = self._fanout_message(results)
+            level = 'warning' if rejected else level
+        else:
+            added = results[0][1]
+            if added is None:
+                return
+            level = 'warning' if rejected else 'info'
+            text = L['msg_batch_added'].format(added=added, total=len(result), layer=layers[0].name())
+        if rejected:
+            # the only row text rendered for the message bar
+            first = L['batch_line_error'].format(line=result.line_numbers[rejected[0]],
+                                                 err=result.message(rejected[0], L))
+            text += '. ' + L['warn_batch_failed'].format(count=len(rejected), first=first)
+            if self._rejected_chk.isChecked():
+                rejected_layer = self._rejected_layer(result, rejected)
+                text += '. ' + L['msg_rejected_layer'].format(count=len(rejected), layer=rejected_layer.name())
+        self._message(text, level=level, duration=10)
+        self._refresh_stats_view()
+
+    def _log_batch_summary(self, result, rejected):
+        """One log line per status code (and one for warnings), not one per row."""
+        L = LANG[self._lang]
+        if rejected:
+            for code, count in sorted(result.counts().items()):
+                if code != coordparse.OK:
+                    QgsMessageLog.logMessage(L['log_batch_code'].format(count=count, err=self._code_message(code)),
+                                             'AddPoint', Qgis.Warning)
+        warned = result.warned()
+        if warned:
+            QgsMessageLog.logMessage(L['log_batch_warned'].format(count=len(warned),
+                                                                  line=result.line_numbers[warned[0]],
+                                                                  warn=result.message(warned[0], L)),
+                                     'AddPoint', Qgis.Warning)
+
+    def _rejected_layer(self, result, rejected):
+        """Memory layer (no geometry) listing the rejected rows with their status."""
+        L = LANG[self._lang]
+        layer = QgsVectorLayer('None?field=line:integer&field=text:string&field=code:integer'
+                               '&field=message:string', L['rejected_layer_name'], 'memory')
+        # text once per distinct code, not per row
+        messages = {}
+        feats = []
+        for i in rejected:
+            code = result.codes[i]
+            if code not in messages:
+                messages[code] = result.message(i, L)
+            feat = QgsFeature(layer.fields())
+            feat.setAttributes([result.line_numbers[i], result.texts[i], code, messages[code]])
+            feats.append(feat)
+        layer.dataProvider().addFeatures(feats)
+        QgsProject.instance().addMapLayer(layer)
+        return layer
+
+    def _on_import_file(self):
+        from .importtask import CoordinateImportTask
+
+        layer = self._target_layer()
+        if layer is None:
+            return
+        path = self._import_source_path()
+        if not path:
+            return
+        task = CoordinateImportTask(self._import_description(path), path, layer, self._current_format(),
+                                    **self._import_options())
+        self._start_import(task)
+
+    def _on_import_new_layer(self):
+        """Import a file into a new layer (memory, GeoPackage or FlatGeobuf)."""
+        from .importtask import CoordinateImportTask, FileImportTask
+
+        driver = self._output_combo.currentData()
+        path = self._import_source_path()
+        if not path:
+            return
+        if driver is None:
+            try:
+                layer = self._new_memory_layer()
+            except RuntimeError as ex:
+                self._message(str(ex), level='critical')
+                return
+            QgsProject.instance().addMapLayer(layer)
+            task = CoordinateImportTask(self._import_description(path), path, layer, self._current_format(),
+                                        **self._import_options())
+        else:
+            output_path = self._output_path(driver)
+            if not output_path:
+                return
+            task = FileImportTask(self._import_description(path), path, output_path, self._output_crs.crs(),
+                                  QgsProject.instance().transformContext(), self._current_format(),
+                                  layer_name=os.path.splitext(os.path.basename(output_path))[0],
+                                  **self._import_options())
+        self._start_import(task)
+
+    def _import_source_path(self):
+        L = LANG[self._lang]
+        path, _ = QFileDialog.getOpenFileName(self._dock, L['import_dialog_title'], '', L['import_filter'])
+        # decide format and order once per file from its first rows
+        if path and self._autodetect_chk.isChecked():
+            self._apply_detection(self._detect_file(path))
+        return path
+
+    def _import_description(self, path):
+        return LANG[self._lang]['task_import'].format(name=os.path.basename(path))
+
+    def _import_options(self):
+        return {
+            'order': self._single_order_combo.currentData() or 'EN',
+            'utm_epsg': self._utm_epsg(),
+            'fast_projection': self._fast_proj_chk.isChecked(),
+            'workers': self._import_workers_spin.value(),
+        }
+
+    def _start_import(self, task):
+        task.taskCompleted.connect(lambda: self._on_import_finished(task))
+        task.taskTerminated.connect(lambda: self._on_import_finished(task))
+        self._tasks.append(task)
+        QgsApplication.taskManager().addTask(task)
+
+    def _detect_file(self, path, sample_size=200):
+        from . import detect
+
+        head = []
+        with open(path, 'rb') as f:
+            for raw in f:
+                head.append(raw.decode('utf-8', errors='replace'))
+                if len(head) >= sample_size:
+                    break
+        return detect.detect_lines(head, self._reference_lonlat(), sample_size=sample_size,
+                                   split=lambda line: coordparse.split_line(line.strip(), 'EN'))
+
+    def _on_import_finished(self, task):
+        L = LANG[self._lang]
+        if task in self._tasks:
+            self._tasks.remove(task)
+        # features were written through the provider, not the edit buffer
+        if self._duplicates and task.layer is not None:
+            self._duplicates.invalidate(task.layer)
+
+        if task.failures:
+            details = '\n'.join(L['batch_line_error'].format(line=n, err=self._code_message(code))
+                                for n, code in task.failures)
+            QgsMessageLog.logMessage(f"Import failed lines ({task.failed} total):\n{details}", 'AddPoint', Qgis.Warning)
+
+        if task.exception is not None:
+            self._message(L['err_import'].format(err=task.exception), level='critical')
+        elif task.isCanceled():
+            self._message(L['msg_import_canceled'].format(added=task.added), level='warning')
+        else:
+            level = 'warning' if task.failed else 'info'
+            self._message(L['msg_import_done'].format(added=task.added, total=task.total,
+                                                      failed=task.failed, layer=task.layer.name()),
+                          level=level, duration=10)
+
+    def _on_copy_selected(self):
+        L = LANG[self._lang]
+        lines = self._selected_coordinate_lines()
+        if lines is None:
+            return
+        QApplication.clipboard().setText('\n'.join(lines))
+        self._message(L['msg_coords_copied'].format(count=len(lines)), level='info')
+
+    def _on_save_selected(self):
+        L = LANG[self._lang]
+        lines = self._selected_coordinate_lines()
+        if lines is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self._dock, L['save_coords_title'], 'coordinates.txt',
+                                              L['save_coords_filter'])
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(line + '\n' for line in lines)
+        except OSError as ex:
+            self._message(str(ex), level='critical')
+            return
+        self._message(L['msg_coords_saved'].format(count=len(lines), path=path), level='info')
+
+    def _selected_coordinate_lines(self):
+        """
+        Coordinates of the selected features of the active point layer (else
+        the target layer) as text lines in the current format and order, or
+        None after warning the user.
+        """
+        from array import array
+        from .coordformat import format_lines
 
+        L = LANG[self._lang]
+        active = self.iface.activeLayer()
+        if (isinstance(active, QgsVectorLayer) and active.geometryType() == QgsWkbTypes.PointGeometry
+                and active.selectedFeatureCount()):
+            layer = active
+        else:
+            layer = self._target_layer()
+            if layer is None:
+                return None
+        if not layer.selectedFeatureCount():
+            self._message(L['warn_no_selection'].format(layer=layer.name()), level='warning')
+            return None
+
+        # geometry only: no attributes are fetched
+        xs = array('d')
+        ys = array('d')
+        request = QgsFeatureRequest().setNoAttributes()
+        for feat in layer.getSelectedFeatures(request):
+            geom = feat.geometry()
+            if geom.isEmpty():
+                continue
+            for pt in (geom.asMultiPoint() if geom.isMultipart() else (geom.asPoint(),)):
+                xs.append(pt.x())
+                ys.append(pt.y())
+
+        fmt = self._current_format()
+        if fmt in coordparse.GRID_FORMATS:
+            with self._stats.stage('transform', layer, len(xs)):
+                return self._mgrs_lines(layer, xs, ys)
+        out_epsg = coordparse.source_epsg(fmt, self._utm_epsg())
+        with self._stats.stage('transform', layer, len(xs)):
+            engine = self._fast_projection(xs, out_epsg, layer.crs())
+            if engine is not None:
+                xs, ys = engine.transform(layer.crs().authid(), out_epsg, xs, ys)
+            elif self._transforms().crs(out_epsg) != layer.crs():
+                # the cached format -> layer transform, run backwards
+                xform = self._transform_to_layer(out_epsg, layer)
+                xs, ys = self._transform_xy(xform, xs, ys, QgsCoordinateTransform.ReverseTransform)
+        return format_lines(xs, ys, fmt, self._single_order_combo.currentData() or 'EN')
+
+    def _mgrs_lines(self, layer, xs, ys):
+        """
+        MGRS references of layer coordinates, or None after warning the user.
+        Zone and band come from WGS84; points are grouped by zone, so each
+        zone transform is looked up once.
+        """
+        from . import mgrs
+        reverse = QgsCoordinateTransform.ReverseTransform
+        lons, lats = self._transform_xy(self._transform_to_layer('EPSG:4326', layer), xs, ys, reverse)
+        if any(mgrs.band_letter(lat) is None for lat in lats):
+            self._message(LANG[self._lang]['warn_mgrs_polar'], level='warning')
+            return None
+        zones = [mgrs.grid_zone_epsg(lon, lat) for lon, lat in zip(lons, lats)]
+        lines = [None] * len(zones)
+        for epsg, rows in mgrs.group_by_epsg(zones).items():
+            zone = int(epsg[-2:])
+            eastings, northings = self._transform_xy(self._transform_to_layer(epsg, layer),
+                                                     [xs[i] for i in rows], [ys[i] for i in rows], reverse)
+            for i, e, n in zip(rows, eastings, northings):
+                lines[i] = mgrs.encode(zone, lats[i], e, n)
+        return lines
+
+    @staticmethod
+    def _transform_xy(xform, xs, ys, direction=QgsCoordinateTransform.ForwardTransform):
+        """
+        Transform coordinate arrays in one call: the points go through PROJ
+        as a single line string instead of one QgsPointXY at a time.
+        """
+        from array import array
+
+        if not len(xs):
+            return array('d'), array('d')
+        line = QgsLineString(list(xs), list(ys))
+        line.transform(xform, direction)
+        return array('d', line.xVector()), array('d', line.yVector())
+
+    def _target_layer(self, target_layer=None):
+        """Return the target point layer or None (after warning the user)."""
+        L = LANG[self._lang]
         layer = target_layer or self._layers_combo.currentLayer()
         if layer is None:
             self._message(L['warn_no_point_layer'], level='warning')
-            return
+            return None
 
         if not isinstance(layer, QgsVectorLayer) or layer.geometryType() != QgsWkbTypes.PointGeometry:
             self._message(L['warn_not_point_layer'], level='warning')
-            return
+            return None
+        return layer
+
+    def _target_layers(self, target_layer=None):
+        """
+        The target layer followed by the checked further targets; only
+        target_layer when one is given. Empty after warning the user.
+        """
+        layer = self._target_layer(target_layer)
+        if layer is None:
+            return []
+        layers = [layer]
+        if not target_layer and self._extra_layers_combo is not None:
+            project = QgsProject.instance()
+            for layer_id in self._extra_layers_combo.checkedItemsData():
+                extra = project.mapLayer(layer_id)
+                if extra is not None and extra not in layers:
+                    layers.append(extra)
+        return layers
+
+    def _insert_points_fanout(self, layers, points, src_epsg):
+        """
+        Insert the same points into several layers: one transform per
+        distinct layer CRS, one edit session per layer. Returns a list of
+        (layer, points added or None on failure) in the order of layers.
+        """
+        return self._insert_groups_fanout(layers, [(src_epsg, points)])
+
+    def _insert_groups_fanout(self, layers, groups):
+        """
+        _insert_points_fanout for points in several source CRSs (groups of
+        (auth id, points), e.g. one per UTM zone): each group is transformed
+        once per layer CRS and all of them are written in one edit session.
+        """
+        from .crscache import crs_key
+
+        by_crs = {}
+        for layer in layers:
+            by_crs.setdefault(crs_key(layer.crs()), []).append(layer)
+        added = {}
+        for group in by_crs.values():
+            pts_dst = []
+            for src_epsg, points in groups:
+                transformed = self._transform_or_report(points, src_epsg, group[0])
+                if transformed is None:
+                    pts_dst = None
+                    break
+                pts_dst.extend(transformed)
+            for layer in group:
+                added[layer.id()] = None if pts_dst is None else self._write_points(layer, list(pts_dst))
+        return [(layer, added[layer.id()]) for layer in layers]
+
+    def _fanout_message(self, results):
+        """Summary (text, level) of a fan-out insert."""
+        L = LANG[self._lang]
+        details = ', '.join(f"{layer.name()}: {L['fanout_failed'] if n is None else n}" for layer, n in results)
+        ok = sum(1 for _layer, n in results if n is not None)
+        level = 'info' if ok == len(results) else 'warning'
+        return L['msg_fanout'].format(ok=ok, count=len(results), details=details), level
 
+    def _insert_points(self, layer, points, src_epsg):
+        """
+        Transform all points with a single transform and add them to the layer
+        in one edit session. Returns the number of points added (duplicates
+        may be skipped or merged), None on failure.
+        """
+        pts_dst = self._transform_or_report(points, src_epsg, layer)
+        if pts_dst is None:
+            return None
+        return self._write_points(layer, pts_dst)
+
+    def _transform_or_report(self, points, src_epsg, layer):
+        """Points in the layer CRS, or None after reporting the error."""
+        L = LANG[self._lang]
         try:
-            src_crs = QgsCoordinateReferenceSystem(src_epsg)
-            dst_crs = layer.crs()
-            xform = QgsCoordinateTransform(src_crs, dst_crs, QgsProject.instance())
-            pt_dst = xform.transform(QgsPointXY(x, y))
+            return self._transform_points(points, src_epsg, layer)
         except Exception as ex:
             self._message(L['err_transform'].format(err=ex), level='critical')
             QgsMessageLog.logMessage(f"Transform failed: {ex}", 'AddPoint', Qgis.Critical)
-            return
+            return None
+
+    def _write_points(self, layer, pts_dst):
+        """Add points (QgsPointXY in the layer CRS); see _insert_points."""
+        L = LANG[self._lang]
+        moves = {}
+        if self._dedup_chk is not None and self._dedup_chk.isChecked():
+            pts_dst, moves = self._resolve_duplicates(layer, pts_dst)
+            if not pts_dst and not moves:
+                return 0
 
         try:
-            feat = QgsFeature(layer.fields())
-            feat.setGeometry(QgsGeometry.fromPointXY(pt_dst))
-            with edit(layer):
-                ok = layer.addFeature(feat)
-                if not ok:
-                    raise RuntimeError(L['err_add_feature'])
+            with self._stats.stage('feature_create', layer, len(pts_dst)):
+                fields = layer.fields()
+                feats = []
+                for pt in pts_dst:
+                    feat = QgsFeature(fields)
+                    feat.setGeometry(QgsGeometry.fromPointXY(pt))
+                    feats.append(feat)
+                geoms = {fid: QgsGeometry.fromPointXY(pt) for fid, pt in moves.items()}
+            with self._stats.stage('commit', layer, len(feats) + len(geoms)):
+                if self._queued_writes(layer):
+                    # committed (and repainted) by the worker thread later
+                    self._queue().add(layer, feats, geoms)
+                    return len(feats)
+                if self._buffered_chk is not None and self._buffered_chk.isChecked():
+                    editor = self._buffered_editor()
+                    if geoms and not editor.change_geometries(layer, geoms):
+                        raise RuntimeError(L['err_add_feature'])
+                    if feats and not editor.add_features(layer, feats):
+                        raise RuntimeError(L['err_add_feature'])
+                else:
+                    with edit(layer):
+                        for fid, geom in geoms.items():
+                            if not layer.changeGeometry(fid, geom):
+                                raise RuntimeError(L['err_add_feature'])
+                        if feats and not layer.addFeatures(feats):
+                            raise RuntimeError(L['err_add_feature'])
         except Exception as ex:
             self._message(str(ex), level='critical')
             QgsMessageLog.logMessage(f"Add feature failed: {ex}", 'AddPoint', Qgis.Critical)
+            return None
+
+        # single points are debounced; a batch gets its one refresh right away
+        changed = pts_dst + list(moves.values())
+        repaints = self._repaints()
+        repaints.request(layer, points_extent(changed))
+        if len(changed) > 1:
+            repaints.flush()
+        return len(feats)
+
+    def _queued_writes(self, layer):
+        from .writequeue import is_remote
+
+        return self._queue_chk is not None and self._queue_chk.isChecked() and is_remote(layer)
+
+    def _queue(self):
+        if self._write_queue is None:
+            from .writequeue import WriteQueue
+
+            self._write_queue = WriteQueue()
+            self._write_queue.pendingChanged.connect(self._update_queue_status)
+            self._write_queue.committed.connect(self._on_queue_committed)
+            self._write_queue.failed.connect(self._on_queue_failed)
+        return self._write_queue
+
+    def _on_queue_committed(self, layer_id, count):
+        layer = QgsProject.instance().mapLayer(layer_id)
+        if layer is None:
             return
+        # written through another connection: reload, re-index, redraw
+        layer.dataProvider().reloadData()
+        layer.updateExtents()
+        if self._duplicates:
+            self._duplicates.invalidate(layer)
+        self._repaints().request(layer)
+
+    def _on_queue_failed(self, layer_id, count, error):
+        L = LANG[self._lang]
+        layer = QgsProject.instance().mapLayer(layer_id)
+        name = layer.name() if layer is not None else layer_id
+        self._message(L['err_queue_write'].format(count=count, layer=name, err=error), level='critical', duration=10)
 
-        self._message(L['msg_point_added'].format(layer=layer.name()), level='info')
+    def _update_queue_status(self, pending=None):
+        if self._queue_label is None:
+            return
+        queue = self._write_queue
+        if queue is None:
+            self._queue_label.setText('')
+            return
+        L = LANG[self._lang]
+        self._queue_label.setText(L['queue_status'].format(
+            pending=queue.pending() if pending is None else pending,
+            committed=queue.committed_count, failed=queue.failed_count))
+
+    def _resolve_duplicates(self, layer, pts):
+        """Apply the selected duplicate mode; returns (points to add, {fid: merged point})."""
+        L = LANG[self._lang]
+        tolerance = self._dedup_tol_spin.value()
+        mode = self._dedup_mode_combo.currentData()
+        with self._stats.stage('dedup', layer, len(pts)):
+            keep, moves, count = self._duplicate_index().resolve(layer, pts, tolerance, mode)
+        if count:
+            key = {'warn': 'msg_duplicates_warn', 'skip': 'msg_duplicates_skipped',
+                   'merge': 'msg_duplicates_merged'}[mode]
+            self._message(L[key].format(count=count, tol=tolerance), level='warning')
+        return keep, moves
+
+    def _duplicate_index(self):
+        if self._duplicates is None:
+            from .dedup import DuplicateIndex
+
+            self._duplicates = DuplicateIndex(QgsProject.instance())
+        return self._duplicates
+
+    def _transform_points(self, points, src_epsg, layer):
+        """Transform (x, y) pairs into the layer CRS; returns a list of QgsPointXY."""
+        with self._stats.stage('crs_lookup', layer):
+            engine = self._fast_projection(points, src_epsg, layer.crs())
+            xform = self._transform_to_layer(src_epsg, layer) if engine is None else None
+        with self._stats.stage('transform', layer, len(points)):
+            if engine is not None:
+                xs, ys = engine.transform(src_epsg, layer.crs().authid(),
+                                          [p[0] for p in points], [p[1] for p in points])
+                return [QgsPointXY(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+            return [xform.transform(QgsPointXY(x, y)) for x, y in points]
+
+    def _fast_projection(self, points, src_epsg, dst_crs):
+        """
+        Built-in NumPy projection engine for large batches between supported
+        CRSs, or None to use QgsCoordinateTransform.
+        """
+        if len(points) < FAST_PATH_MIN_POINTS:
+            return None
+        if self._fast_proj_chk is None or not self._fast_proj_chk.isChecked():
+            return None
         try:
-            layer.triggerRepaint()
-        except Exception:
-            pass
+            from . import projection
+        except ImportError:  # NumPy not available
+            return None
+        if not (projection.supports(src_epsg) and projection.supports(dst_crs.authid())):
+            return None
+        # respect coordinate operations the user pinned in the project
+        context = QgsProject.instance().transformContext()
+        if context.calculateCoordinateOperation(self._transforms().crs(src_epsg), dst_crs):
+            return None
+        return projection
+
+    def _repaints(self):
+        if self._repaint is None:
+            self._repaint = RepaintCoalescer(self._map_views, stats=self._stats)
+        return self._repaint
+
+    def _map_views(self):
+        """Open map canvases for the repaint check, or None while a 3D view is open."""
+        if self.iface is None:
+            return None
+        views_3d = getattr(self.iface, 'mapCanvases3D', None)  # QGIS 3.36+
+        if views_3d is not None and views_3d():
+            return None
+        return self.iface.mapCanvases()
+
+    def _transforms(self):
+        if self._transform_cache is None:
+            from .crscache import TransformCache
+
+            self._transform_cache = TransformCache(QgsProject.instance())
+        return self._transform_cache
+
+    def _transform_to_layer(self, src_epsg, layer):
+        return self._transforms().transform_for_layer(src_epsg, layer)
 
     def _message(self, text, level='info', duration=5):
         bar = self.iface.messageBar()
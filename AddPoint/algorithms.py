@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+Processing algorithms wrapping the AddPoint parser.
+
+Same format / order / UTM zone semantics as the dock (coordparse), usable
+without a GUI from the Processing toolbox, batch mode and qgis_process.
+Grid references (MGRS) carry their own UTM zone, so points are transformed
+with one cached transform per source CRS.
+"""
+from qgis.PyQt.QtCore import QCoreApplication
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsFeature,
+    QgsFeatureSink,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingException,
+    QgsProcessingFeatureBasedAlgorithm,
+    QgsProcessingOutputNumber,
+    QgsProcessingOutputVectorLayer,
+    QgsProcessingParameterCrs,
+    QgsProcessingParameterEnum,
+    QgsProcessingParameterField,
+    QgsProcessingParameterFile,
+    QgsProcessingParameterString,
+    QgsProcessingParameterVectorLayer,
+    QgsWkbTypes,
+)
+
+from . import coordparse
+from .mgrs import group_by_epsg
+
+FORMAT_LABELS = (
+    'Decimal degrees (DD)',
+    'Degrees, decimal minutes (DDM)',
+    'Degrees, minutes, seconds (DMS)',
+    'D96/TM (EPSG:3794)',
+    'Web Mercator (EPSG:3857)',
+    'UTM (WGS84)',
+    'MGRS or zone/band UTM (33TWM5678901234, 33T 456789 5101234)',
+)
+ORDERS = ('EN', 'NE')
+ORDER_LABELS = ('E N (lon lat)', 'N E (lat lon)')
+CHUNK_SIZE = 5000
+
+
+def tr(text):
+    return QCoreApplication.translate('AddPoint', text)
+
+
+def code_message(code):
+    from .AddPoint import LANG
+
+    return LANG['en'][coordparse.MESSAGE_KEYS[code]]
+
+
+def _add_format_parameters(alg):
+    alg.addParameter(QgsProcessingParameterEnum(
+        'FORMAT', tr('Coordinate format'), options=[tr(label) for label in FORMAT_LABELS], defaultValue=0))
+    alg.addParameter(QgsProcessingParameterEnum(
+        'ORDER', tr('Value order (single-field text)'), options=[tr(label) for label in ORDER_LABELS],
+        defaultValue=0))
+    alg.addParameter(QgsProcessingParameterCrs(
+        'UTM_ZONE', tr('UTM zone (UTM format only)'), defaultValue=coordparse.DEFAULT_UTM_EPSG))
+
+
+class _Transforms(dict):
+    """source auth id -> QgsCoordinateTransform to one destination CRS, built on first use"""
+
+    def __init__(self, dest_crs, transform_context):
+        super().__init__()
+        self.dest_crs = dest_crs
+        self._context = transform_context
+
+    def __missing__(self, epsg):
+        xform = self[epsg] = QgsCoordinateTransform(QgsCoordinateReferenceSystem(epsg), self.dest_crs,
+                                                    self._context)
+        return xform
+
+
+def _format_parameters(alg, parameters, context):
+    fmt = coordparse.FORMATS[alg.parameterAsEnum(parameters, 'FORMAT', context)]
+    order = ORDERS[alg.parameterAsEnum(parameters, 'ORDER', context)]
+    utm_epsg = alg.parameterAsCrs(parameters, 'UTM_ZONE', context).authid() or coordparse.DEFAULT_UTM_EPSG
+    return fmt, order, utm_epsg
+
+
+class PointsFromTextAlgorithm(QgsProcessingFeatureBasedAlgorithm):
+    """
+    Point geometry from coordinate text stored in attributes. In place on a
+    point layer it replaces each feature's geometry.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._dest_crs = QgsCoordinateReferenceSystem()
+
+    def name(self):
+        return 'pointsfromtext'
+
+    def displayName(self):
+        return tr('Points from coordinate text')
+
+    def shortHelpString(self):
+        return tr('Builds point geometries from coordinates stored as text in one field ("E N" or '
+                  '"N E") or in two fields (E and N). Formats and order are the same as in the '
+                  'AddPoint panel. The output is in the input layer CRS when the input has one, '
+                  'otherwise in the CRS of the coordinate format (WGS84 for MGRS). Features whose '
+                  'text cannot be parsed are skipped and reported.')
+
+    def createInstance(self):
+        return PointsFromTextAlgorithm()
+
+    def flags(self):
+        return super().flags() | QgsProcessingAlgorithm.FlagSupportsInPlaceEdits
+
+    def inputLayerTypes(self):
+        return [QgsProcessing.TypeVector]
+
+    def outputName(self):
+        return tr('Points')
+
+    def outputWkbType(self, input_wkb_type):
+        return QgsWkbTypes.Point
+
+    def outputCrs(self, input_crs):
+        return self._dest_crs if self._dest_crs.isValid() else input_crs
+
+    def supportInPlaceEdit(self, layer):
+        return (layer.geometryType() == QgsWkbTypes.PointGeometry
+                and super().supportInPlaceEdit(layer))
+
+    def initParameters(self, config=None):
+        self.addParameter(QgsProcessingParameterField(
+            'FIELD', tr('Coordinate field (E, or "E N" text)'), parentLayerParameterName='INPUT'))
+        self.addParameter(QgsProcessingParameterField(
+            'FIELD_N', tr('N field (leave empty for single-field text)'),
+            parentLayerParameterName='INPUT', optional=True))
+        _add_format_parameters(self)
+
+    def prepareAlgorithm(self, parameters, context, feedback):
+        self._fmt, self._order, self._utm_epsg = _format_parameters(self, parameters, context)
+        self._field = self.parameterAsString(parameters, 'FIELD', context)
+        self._field_n = self.parameterAsString(parameters, 'FIELD_N', context)
+        source = self.parameterAsSource(parameters, 'INPUT', context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, 'INPUT'))
+
+        # like the dock: into the target (input) layer CRS when there is one;
+        # grid formats have no common source CRS
+        input_crs = source.sourceCrs()
+        if input_crs.isValid():
+            self._dest_crs = input_crs
+        else:
+            self._dest_crs = QgsCoordinateReferenceSystem(
+                coordparse.source_epsg(self._fmt, self._utm_epsg) or 'EPSG:4326')
+        self._transforms = _Transforms(self._dest_crs, context.transformContext())
+        self._failed = 0
+        return True
+
+    def processFeature(self, feature, context, feedback):
+        if self._field_n:
+            res = coordparse.parse_pair(str(feature[self._field] or ''), str(feature[self._field_n] or ''),
+                                        self._fmt, self._utm_epsg)
+        else:
+            res = coordparse.parse_text(str(feature[self._field] or ''), self._fmt, self._order, self._utm_epsg)
+        if res.code != coordparse.OK:
+            self._failed += 1
+            feedback.reportError(tr('Feature {fid}: {err}').format(fid=feature.id(), err=code_message(res.code)))
+            return []
+        out = QgsFeature(feature)
+        out.setGeometry(QgsGeometry.fromPointXY(self._transforms[res.epsg].transform(QgsPointXY(res.x, res.y))))
+        return [out]
+
+    def postProcessAlgorithm(self, context, feedback):
+        if self._failed:
+            feedback.pushWarning(tr('{count} features could not be parsed').format(count=self._failed))
+        return {}
+
+
+class AppendCoordinatesAlgorithm(QgsProcessingAlgorithm):
+    """Stream coordinate text (parameter or file, one pair per line) into a point layer."""
+
+    def name(self):
+        return 'appendcoordinates'
+
+    def displayName(self):
+        return tr('Append coordinates to layer')
+
+    def shortHelpString(self):
+        return tr('Parses coordinate pairs, one per line, from the text parameter and/or a text '
+                  'file and appends them to an existing point layer, transformed to its CRS. '
+                  'Files are streamed in chunks, so their size is not limited by memory.')
+
+    def createInstance(self):
+        return AppendCoordinatesAlgorithm()
+
+    def flags(self):
+        # writes to a project layer; keep it on the main thread
+        return super().flags() | QgsProcessingAlgorithm.FlagNoThreading
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterVectorLayer(
+            'LAYER', tr('Target point layer'), types=[QgsProcessing.TypeVectorPoint]))
+        self.addParameter(QgsProcessingParameterString(
+            'TEXT', tr('Coordinates (one pair per line)'), multiLine=True, optional=True))
+        self.addParameter(QgsProcessingParameterFile(
+            'FILE', tr('Coordinate file'), optional=True))
+        _add_format_parameters(self)
+        self.addOutput(QgsProcessingOutputVectorLayer('OUTPUT', tr('Target layer')))
+        self.addOutput(QgsProcessingOutputNumber('ADDED', tr('Points added')))
+        self.addOutput(QgsProcessingOutputNumber('FAILED', tr('Lines that failed to parse')))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        layer = self.parameterAsVectorLayer(parameters, 'LAYER', context)
+        if layer is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, 'LAYER'))
+        fmt, order, utm_epsg = _format_parameters(self, parameters, context)
+        text = self.parameterAsString(parameters, 'TEXT', context)
+        path = self.parameterAsFile(parameters, 'FILE', context)
+        if not text and not path:
+            raise QgsProcessingException(tr('Enter coordinates or choose a file'))
+
+        transforms = _Transforms(layer.crs(), context.transformContext())
+        provider = layer.dataProvider()
+        fields = layer.fields()
+        self._added = 0
+        self._failed = 0
+
+        def write(chunk):
+            feats = []
+            # grouped by source CRS, like the dock does for grid references
+            for epsg, rows in group_by_epsg([res.epsg for res in chunk]).items():
+                xform = transforms[epsg]
+                for i in rows:
+                    feat = QgsFeature(fields)
+                    feat.setGeometry(QgsGeometry.fromPointXY(xform.transform(QgsPointXY(chunk[i].x, chunk[i].y))))
+                    feats.append(feat)
+            if not provider.addFeatures(feats, QgsFeatureSink.FastInsert)[0]:
+                raise QgsProcessingException('; '.join(provider.errors()) or tr('Could not add features'))
+            self._added += len(feats)
+
+        chunk = []
+        for source_name, line_no, line in self._lines(text, path):
+            if feedback.isCanceled():
+                break
+            if fmt in coordparse.GRID_FORMATS:
+                res = coordparse.parse_grid(line)
+            else:
+                x_text, y_text = coordparse.split_line(line, order)
+                res = coordparse.parse_pair(x_text, y_text, fmt, utm_epsg) if x_text and y_text else None
+            if res is None or res.code != coordparse.OK:
+                self._failed += 1
+                err = code_message(res.code if res is not None else coordparse.ERR_SPLIT)
+                feedback.reportError(tr('{source} line {line}: {err}').format(source=source_name, line=line_no, err=err))
+                continue
+            chunk.append(res)
+            if len(chunk) >= CHUNK_SIZE:
+                write(chunk)
+                chunk = []
+                feedback.pushInfo(tr('{count} points added').format(count=self._added))
+        if chunk:
+            write(chunk)
+
+        layer.updateExtents()
+        layer.triggerRepaint()
+        return {'OUTPUT': layer.id(), 'ADDED': self._added, 'FAILED': self._failed}
+
+    @staticmethod
+    def _lines(text, path):
+        for line_no, line in enumerate((text or '').splitlines(), start=1):
+            if line.strip():
+                yield 'TEXT', line_no, line.strip()
+        if path:
+            with open(path, 'rb') as f:
+                for line_no, raw in enumerate(f, start=1):
+                    line = raw.decode('utf-8', errors='replace').strip()
+                    if line:
+                        yield path, line_no, line
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Buffered editing: keep target layers in edit mode and commit in batches.
+
+Points go into the layer edit buffer; the buffer is committed once
+``flush_count`` points are pending, every ``flush_interval`` ms, or on demand.
+If the edit buffer is committed, rolled back or closed outside the plugin,
+its pending count is dropped.
+"""
+from qgis.PyQt.QtCore import QObject, QTimer, pyqtSignal
+from qgis.core import QgsProject, QgsMessageLog, Qgis
+
+
+class BufferedEditor(QObject):
+    pendingChanged = pyqtSignal(int)
+    commitFailed = pyqtSignal(str, str)  # layer name, errors
+
+    def __init__(self, flush_count=100, flush_interval=30000, project=None, parent=None):
+        super().__init__(parent)
+        self.flush_count = flush_count
+        self._project = project or QgsProject.instance()
+        self._layers = {}   # layer id -> layer
+        self._pending = {}  # layer id -> number of uncommitted points
+        self._started = set()  # layers put into edit mode by us
+        self._watched = {}  # layer id -> slot connected to its editing signals
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.flush_all)
+        self.set_flush_interval(flush_interval)
+
+        self._project.layersWillBeRemoved.connect(self._on_layers_removed)
+
+    def set_flush_interval(self, msec):
+        """Commit pending points every msec milliseconds (0 disables the timer)."""
+        self._timer.stop()
+        self._timer.setInterval(max(0, int(msec)))
+        if msec > 0 and self.pending_count():
+            self._timer.start()
+
+    def pending_count(self):
+        return sum(self._pending.values())
+
+    def add_features(self, layer, feats):
+        """Add features to the layer edit buffer. Returns False if the layer refused them."""
+        if not self._begin(layer) or not layer.addFeatures(feats):
+            return False
+        return self._track(layer, len(feats))
+
+    def change_geometries(self, layer, geometries):
+        """Change geometries ({fid: QgsGeometry}) in the layer edit buffer."""
+        if not self._begin(layer):
+            return False
+        if not all(layer.changeGeometry(fid, geom) for fid, geom in geometries.items()):
+            return False
+        return self._track(layer, len(geometries))
+
+    def _begin(self, layer):
+        if not layer.isEditable():
+            if not layer.startEditing():
+                return False
+            self._started.add(layer.id())
+        return True
+
+    def _track(self, layer, count):
+        layer_id = layer.id()
+        self._layers[layer_id] = layer
+        self._watch(layer)
+        self._pending[layer_id] = self._pending.get(layer_id, 0) + count
+        self.pendingChanged.emit(self.pending_count())
+
+        # commit failures are reported through commitFailed; the points stay buffered
+        if self._pending[layer_id] >= self.flush_count:
+            self.flush(layer)
+        elif self._timer.interval() > 0 and not self._timer.isActive():
+            self._timer.start()
+        return True
+
+    def _watch(self, layer):
+        layer_id = layer.id()
+        if layer_id in self._watched:
+            return
+
+        def _buffer_gone():
+            self._forget(layer_id)
+        layer.editingStopped.connect(_buffer_gone)
+        layer.afterRollBack.connect(_buffer_gone)
+        self._watched[layer_id] = _buffer_gone
+
+    def _unwatch(self, layer_id):
+        slot = self._watched.pop(layer_id, None)
+        layer = self._layers.get(layer_id)
+        if slot is None or layer is None:
+            return
+        try:
+            layer.editingStopped.disconnect(slot)
+            layer.afterRollBack.disconnect(slot)
+        except (TypeError, RuntimeError):
+            pass
+
+    def _forget(self, layer_id):
+        """The layer left edit mode or was rolled back: nothing is pending any more."""
+        if self._pending.pop(layer_id, None) is None:
+            return
+        layer = self._layers.get(layer_id)
+        if layer is None or not layer.isEditable():
+            self._started.discard(layer_id)
+        self.pendingChanged.emit(self.pending_count())
+        if not self.pending_count():
+            self._timer.stop()
+
+    def flush(self, layer, stop_editing=False):
+        """Commit the layer edit buffer, keeping edit mode unless stop_editing."""
+        layer_id = layer.id()
+        if not self._pending.get(layer_id) and not stop_editing:
+            return True
+        if not layer.isEditable():
+            # edits were stopped outside the plugin
+            self._forget(layer_id)
+            return True
+        ok = layer.commitChanges(stopEditing=stop_editing)
+        if ok:
+            self._pending.pop(layer_id, None)
+            if stop_editing:
+                self._started.discard(layer_id)
+                self._unwatch(layer_id)
+                self._layers.pop(layer_id, None)
+        else:
+            errors = '\n'.join(layer.commitErrors())
+            QgsMessageLog.logMessage(f"Buffered commit failed for {layer.name()}: {errors}", 'AddPoint', Qgis.Critical)
+            self.commitFailed.emit(layer.name(), errors)
+        self.pendingChanged.emit(self.pending_count())
+        if not self.pending_count():
+            self._timer.stop()
+        return ok
+
+    def flush_all(self):
+        ok = True
+        for layer in list(self._layers.values()):
+            ok = self.flush(layer) and ok
+        return ok
+
+    def close(self):
+        """
+        Commit everything and leave edit mode on layers we started editing.
+        Layers whose commit fails stay in edit mode so nothing is lost.
+        """
+        self._timer.stop()
+        try:
+            self._project.layersWillBeRemoved.disconnect(self._on_layers_removed)
+        except (TypeError, RuntimeError):
+            pass
+        for layer_id, layer in list(self._layers.items()):
+            self.flush(layer, stop_editing=layer_id in self._started)
+        for layer_id in list(self._watched):
+            self._unwatch(layer_id)
+        self._layers.clear()
+        self._pending.clear()
+        self._started.clear()
+
+    def _on_layers_removed(self, layer_ids):
+        # The edit buffer dies with the layer: commit, or roll back if that fails
+        for layer_id in layer_ids:
+            layer = self._layers.get(layer_id)
+            if layer is None:
+                continue
+            if not self.flush(layer, stop_editing=True):
+                layer.rollBack()
+            self._unwatch(layer_id)
+            self._layers.pop(layer_id, None)
+            self._pending.pop(layer_id, None)
+            self._started.discard(layer_id)
+        self.pendingChanged.emit(self.pending_count())
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Coordinate text output, the inverse of coordparse.
+
+Values are split into degree/minute/second parts with integer arithmetic on
+whole columns (NumPy when available), then every line is built from one
+%-template, so formatting costs one C-level string operation per point.
+Output parses back with coordparse in the same format and order.
+"""
+from . import coordparse
+
+# Decimals per format: DD ~0.1 m, DDM ~0.2 m, DMS ~0.3 m, metric formats cm
+DECIMALS = {
+    'DD': 6,
+    'DDM': 4,
+    'DMS': 2,
+    'EPSG:3794': 2,
+    'EPSG:3857': 2,
+    'UTM': 2,
+}
+DEFAULT_DELIMITER = '\t'
+
+
+def _angle_template(fmt, decimals):
+    if fmt == 'DD':
+        return f'%.{decimals}f°%s'
+    width = 3 + decimals if decimals else 2
+    if fmt == 'DDM':
+        return f'%d°%0{width}.{decimals}f′%s'
+    return f'%d°%02d′%0{width}.{decimals}f″%s'
+
+
+def _angle_columns_numpy(np, values, fmt, decimals, hemis):
+    values = np.asarray(values, dtype=float)
+    hemi = np.where(values < 0, hemis[1], hemis[0]).tolist()
+    absolute = np.abs(values)
+    if fmt == 'DD':
+        return [absolute.tolist(), hemi]
+    # whole units of the last decimal, so rounding carries into minutes/degrees
+    scale = 10 ** decimals
+    if fmt == 'DDM':
+        units = np.rint(absolute * (60 * scale)).astype(np.int64)
+        deg, rest = np.divmod(units, 60 * scale)
+        return [deg.tolist(), (rest / scale).tolist(), hemi]
+    units = np.rint(absolute * (3600 * scale)).astype(np.int64)
+    deg, rest = np.divmod(units, 3600 * scale)
+    minutes, rest = np.divmod(rest, 60 * scale)
+    return [deg.tolist(), minutes.tolist(), (rest / scale).tolist(), hemi]
+
+
+def _angle_columns_python(values, fmt, decimals, hemis):
+    hemi = [hemis[1] if v < 0 else hemis[0] for v in values]
+    absolute = [abs(v) for v in values]
+    if fmt == 'DD':
+        return [absolute, hemi]
+    scale = 10 ** decimals
+    if fmt == 'DDM':
+        units = [round(v * 60 * scale) for v in absolute]
+        return [[u // (60 * scale) for u in units], [u % (60 * scale) / scale for u in units], hemi]
+    units = [round(v * 3600 * scale) for v in absolute]
+    return [[u // (3600 * scale) for u in units],
+            [u % (3600 * scale) // (60 * scale) for u in units],
+            [u % (60 * scale) / scale for u in units],
+            hemi]
+
+
+def _angle_columns(values, fmt, decimals, hemis):
+    try:
+        import numpy as np
+    except ImportError:
+        return _angle_columns_python(values, fmt, decimals, hemis)
+    return _angle_columns_numpy(np, values, fmt, decimals, hemis)
+
+
+def format_lines(xs, ys, fmt='DD', order='EN', delimiter=DEFAULT_DELIMITER, decimals=None):
+    """
+    Format E/N columns (lon/lat for angle formats, source CRS units
+    otherwise) as a list of text lines, one per point.
+    """
+    if fmt not in coordparse.FORMATS:
+        raise ValueError(f'Unknown format: {fmt}')
+    if fmt in coordparse.GRID_FORMATS:
+        # needs the latitude for the band: see mgrs.encode
+        raise ValueError(f'{fmt} is not a column format')
+    if decimals is None:
+        decimals = DECIMALS[fmt]
+    if fmt in coordparse.ANGLE_FORMATS:
+        template = _angle_template(fmt, decimals)
+        e_cols = _angle_columns(xs, fmt, decimals, ('E', 'W'))
+        n_cols = _angle_columns(ys, fmt, decimals, ('N', 'S'))
+    else:
+        template = f'%.{decimals}f'
+        e_cols = [xs.tolist() if hasattr(xs, 'tolist') else list(xs)]
+        n_cols = [ys.tolist() if hasattr(ys, 'tolist') else list(ys)]
+    if order == 'NE':
+        e_cols, n_cols = n_cols, e_cols
+    line = template + delimiter.replace('%', '%%') + template
+    return [line % row for row in zip(*e_cols, *n_cols)]
+
+
+def format_point(x, y, fmt='DD', order='EN', delimiter=DEFAULT_DELIMITER, decimals=None):
+    """Text of a single point (see format_lines)."""
+    return format_lines([x], [y], fmt, order, delimiter, decimals)[0]
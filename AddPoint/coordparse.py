@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Coordinate parsing core for AddPoint.
+
+Pure Python, no QGIS/Qt imports, so it can be used headlessly (scripts,
+worker processes, Processing algorithms). Functions never raise on bad input;
+they return a status code instead. Codes map to keys of the plugin's LANG
+table through MESSAGE_KEYS, so localized text is only built when shown.
+"""
+import re
+from collections import namedtuple
+
+# Status codes (small ints so they fit into compact arrays)
+OK = 0
+ERR_EMPTY = 1          # one of the two values is missing
+ERR_SPLIT = 2          # single field does not contain two values
+ERR_PARSE_DD = 3
+ERR_PARSE_DDM = 4
+ERR_PARSE_DMS = 5
+ERR_MINUTES = 6        # minutes outside [0, 60)
+ERR_SECONDS = 7        # seconds outside [0, 60)
+ERR_DEGREES = 8        # degrees exceed 180 (lon) / 90 (lat)
+ERR_RANGE_LON = 9
+ERR_RANGE_LAT = 10
+ERR_NUMERIC = 11       # metric formats expect plain numbers
+ERR_FORMAT = 12        # unknown format code
+ERR_PARSE_MGRS = 13    # not an MGRS or zone/band UTM reference
+
+# Non-fatal warnings (value is still usable)
+WARN_NONE = 0
+WARN_OUTSIDE_3794 = 1
+WARN_OUTSIDE_3857 = 2
+WARN_OUTSIDE_UTM = 3
+
+MESSAGE_KEYS = {
+    ERR_EMPTY: 'warn_enter_both',
+    ERR_SPLIT: 'warn_enter_two_single',
+    ERR_PARSE_DD: 'warn_parse_dd',
+    ERR_PARSE_DDM: 'warn_parse_ddm',
+    ERR_PARSE_DMS: 'warn_parse_dms',
+    ERR_MINUTES: 'err_minutes_range',
+    ERR_SECONDS: 'err_seconds_range',
+    ERR_DEGREES: 'err_degrees_bounds',
+    ERR_RANGE_LON: 'warn_range_lon',
+    ERR_RANGE_LAT: 'warn_range_lat',
+    ERR_NUMERIC: 'err_invalid_numeric_metric',
+    ERR_FORMAT: 'err_unknown_format',
+    ERR_PARSE_MGRS: 'warn_parse_mgrs',
+}
+
+WARNING_KEYS = {
+    WARN_OUTSIDE_3794: 'warn_values_outside_3794',
+    WARN_OUTSIDE_3857: 'warn_values_outside_3857',
+    WARN_OUTSIDE_UTM: 'warn_values_outside_utm',
+}
+
+ANGLE_FORMATS = ('DD', 'DDM', 'DMS')
+METRIC_FORMATS = ('EPSG:3794', 'EPSG:3857', 'UTM')
+# one text per point, zone and band included (decoded by the mgrs module)
+GRID_FORMATS = ('MGRS',)
+FORMATS = ANGLE_FORMATS + METRIC_FORMATS + GRID_FORMATS
+
+DEFAULT_UTM_EPSG = 'EPSG:32633'
+
+ParseResult = namedtuple('ParseResult', 'x y epsg code warning')
+ParseResult.__doc__ = """
+x, y: E/N in the source CRS (lon/lat for angle formats), None on error.
+epsg: source CRS auth id, code: status code, warning: warning code.
+"""
+
+# Patterns compiled once at import time
+_HEMI_RE = re.compile(r'[NSEW]')
+
+# Degree/minute/second symbols and separators in angle text
+_ANGLE_SEPARATORS = str.maketrans({c: ' ' for c in '’′“”″°\'";:,'})
+
+_MIN_TOKENS = {'DD': 1, 'DDM': 2, 'DMS': 3}
+_PARSE_ERRORS = {'DD': ERR_PARSE_DD, 'DDM': ERR_PARSE_DDM, 'DMS': ERR_PARSE_DMS}
+
+
+def split_single_field(s):
+    """Split single-field text into its first two values or (None, None)."""
+    parts = (s or '').replace(';', ' ').replace(',', ' ').split()
+    if len(parts) < 2:
+        return None, None
+    return parts[0], parts[1]
+
+
+def split_ordered(s, order='EN'):
+    """
+    Split single-field text and apply the order ('EN' or 'NE', Google Maps
+    style). Returns (E text, N text) or (None, None).
+    """
+    a_text, b_text = split_single_field(s)
+    if not a_text or not b_text:
+        return None, None
+    if order == 'NE':
+        return b_text, a_text
+    return a_text, b_text
+
+
+def split_line(line, order='EN', delimiter=None):
+    """
+    Split one file line into (E text, N text).
+    Tab separated lines keep spaces inside values (e.g. DMS "46 3 25 N");
+    other lines follow the single-field rules (space, comma or semicolon).
+    """
+    if delimiter is None and '\t' in line:
+        delimiter = '\t'
+    if delimiter is None:
+        return split_ordered(line, order)
+    parts = [p.strip() for p in line.split(delimiter)]
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        return None, None
+    if order == 'NE':
+        return parts[1], parts[0]
+    return parts[0], parts[1]
+
+
+def normalize_angle_text(s_up):
+    """Replace degree/minute/second symbols and separators with single spaces."""
+    return ' '.join(s_up.translate(_ANGLE_SEPARATORS).split())
+
+
+def _float_tokens(tokens):
+    nums = []
+    for t in tokens:
+        try:
+            nums.append(float(t))
+        except ValueError:
+            pass
+    return nums
+
+
+def angle_tokens(text):
+    """
+    Numbers and hemisphere letter of angle text: ([numbers], 'N'/'S'/'E'/'W' or None).
+    The last N/S/E/W letter in the text is the hemisphere.
+    """
+    s_up = text.strip().upper().replace(',', '.')
+    hemi_match = _HEMI_RE.findall(s_up)
+    hemi = hemi_match[-1] if hemi_match else None
+    if hemi is not None:
+        s_up = _HEMI_RE.sub('', s_up)
+    return _float_tokens(s_up.translate(_ANGLE_SEPARATORS).split()), hemi
+
+
+def parse_angle(text, kind='lon', fmt='DD'):
+    """Parse a DD/DDM/DMS angle. Returns (value, code); value is None on error."""
+    nums, hemi = angle_tokens(text)
+
+    min_tokens = _MIN_TOKENS.get(fmt)
+    if min_tokens is None:
+        return None, ERR_FORMAT
+    if len(nums) < min_tokens:
+        return None, _PARSE_ERRORS[fmt]
+
+    deg = nums[0]
+    minutes = nums[1] if min_tokens > 1 else 0.0
+    seconds = nums[2] if min_tokens > 2 else 0.0
+    if min_tokens > 1 and not (0 <= abs(minutes) < 60):
+        return None, ERR_MINUTES
+    if min_tokens > 2 and not (0 <= abs(seconds) < 60):
+        return None, ERR_SECONDS
+
+    sign = 1
+    if deg < 0:
+        sign = -1
+        deg = abs(deg)
+    if (kind == 'lon' and hemi == 'W') or (kind == 'lat' and hemi == 'S'):
+        sign = -1
+
+    value = deg + (abs(minutes) / 60.0) + (abs(seconds) / 3600.0)
+    value *= sign
+
+    max_deg = 180 if kind == 'lon' else 90
+    if deg > max_deg or (deg == max_deg and (abs(minutes) > 0 or abs(seconds) > 0)):
+        return None, ERR_DEGREES
+    return value, OK
+
+
+def source_epsg(fmt, utm_epsg=DEFAULT_UTM_EPSG):
+    """
+    Auth id of the CRS the values of a format are expressed in; None for
+    grid formats, where every value has its own (ParseResult.epsg).
+    """
+    if fmt in GRID_FORMATS:
+        return None
+    if fmt == 'UTM':
+        return utm_epsg or DEFAULT_UTM_EPSG
+    if fmt in ('EPSG:3794', 'EPSG:3857'):
+        return fmt
+    return 'EPSG:4326'
+
+
+def parse_pair(x_text, y_text, fmt='DD', utm_epsg=DEFAULT_UTM_EPSG):
+    """Parse an E/N text pair in the given format into a ParseResult."""
+    x_text = (x_text or '').strip()
+    y_text = (y_text or '').strip()
+    if x_text == '' or y_text == '':
+        return ParseResult(None, None, None, ERR_EMPTY, WARN_NONE)
+
+    if fmt in GRID_FORMATS:
+        # a reference split over the two fields (e.g. "33TWM 56789" and "01234")
+        return parse_grid(f'{x_text} {y_text}')
+
+    if fmt in ANGLE_FORMATS:
+        lon, code = parse_angle(x_text, kind='lon', fmt=fmt)
+        if code != OK:
+            return ParseResult(None, None, None, code, WARN_NONE)
+        lat, code = parse_angle(y_text, kind='lat', fmt=fmt)
+        if code != OK:
+            return ParseResult(None, None, None, code, WARN_NONE)
+        if lon < -180 or lon > 180:
+            return ParseResult(None, None, None, ERR_RANGE_LON, WARN_NONE)
+        if lat < -90 or lat > 90:
+            return ParseResult(None, None, None, ERR_RANGE_LAT, WARN_NONE)
+        return ParseResult(lon, lat, 'EPSG:4326', OK, WARN_NONE)
+
+    if fmt not in METRIC_FORMATS:
+        return ParseResult(None, None, None, ERR_FORMAT, WARN_NONE)
+
+    try:
+        x = float(x_text.replace(',', '.'))
+        y = float(y_text.replace(',', '.'))
+    except ValueError:
+        return ParseResult(None, None, None, ERR_NUMERIC, WARN_NONE)
+
+    warning = WARN_NONE
+    if fmt == 'EPSG:3794':
+        if not (300000 <= x <= 800000 and 4000000 <= y <= 6000000):
+            warning = WARN_OUTSIDE_3794
+    elif fmt == 'EPSG:3857':
+        if not (-20037508.3428 <= x <= 20037508.3428 and -20037508.3428 <= y <= 20037508.3428):
+            warning = WARN_OUTSIDE_3857
+    elif not (100000 <= x <= 900000 and 0 <= y <= 10000000):
+        warning = WARN_OUTSIDE_UTM
+    return ParseResult(x, y, source_epsg(fmt, utm_epsg), OK, warning)
+
+
+def parse_text(s, fmt='DD', order='EN', utm_epsg=DEFAULT_UTM_EPSG):
+    """Parse single-field text ("E N" or "N E", or a grid reference) into a ParseResult."""
+    if fmt in GRID_FORMATS:
+        return parse_grid(s)
+    x_text, y_text = split_ordered(s, order)
+    if not x_text or not y_text:
+        return ParseResult(None, None, None, ERR_SPLIT, WARN_NONE)
+    return parse_pair(x_text, y_text, fmt, utm_epsg)
+
+
+def parse_grid(s):
+    """Parse an MGRS or zone/band UTM reference (see mgrs.decode)."""
+    from . import mgrs
+
+    return mgrs.decode(s)
+
+
+def parse_many(items, fmt='DD', order='EN', utm_epsg=DEFAULT_UTM_EPSG):
+    """
+    Lazily parse an iterable of inputs, yielding one ParseResult per item.
+    Items are either single-field strings or (E text, N text) pairs.
+    """
+    for item in items:
+        if isinstance(item, str):
+            yield parse_text(item, fmt, order, utm_epsg)
+        else:
+            yield parse_pair(item[0], item[1], fmt, utm_epsg)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded LRU cache of CRS and coordinate transform objects.
+
+Building QgsCoordinateReferenceSystem / QgsCoordinateTransform hits the SRS
+database and PROJ pipeline setup, so the plugin keeps them around. Transforms
+are keyed by (source auth id, destination CRS, transform context generation);
+the generation changes whenever the project's transform context changes, and
+the cache is emptied when the CRS of a watched layer changes.
+"""
+from collections import OrderedDict
+
+from qgis.core import QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProject
+
+# 120 UTM zones + the other formats fit comfortably
+DEFAULT_MAX_SIZE = 160
+
+
+def crs_key(crs):
+    """Hashable identity of a CRS (auth id, or WKT for custom CRSs)."""
+    return crs.authid() or crs.toWkt()
+
+
+class TransformCache:
+    def __init__(self, project=None, max_size=DEFAULT_MAX_SIZE):
+        self._project = project or QgsProject.instance()
+        self._max_size = max_size
+        self._crs = OrderedDict()
+        self._transforms = OrderedDict()
+        self._generation = 0
+        self._watched = {}  # layer id -> layer with crsChanged connected
+
+        self.hits = 0
+        self.misses = 0
+        self.crs_hits = 0
+        self.crs_misses = 0
+
+        self._project.transformContextChanged.connect(self._on_context_changed)
+        self._project.layersWillBeRemoved.connect(self._on_layers_removed)
+
+    def close(self):
+        """Disconnect from the project and watched layers, drop all entries."""
+        for signal, slot in ((self._project.transformContextChanged, self._on_context_changed),
+                             (self._project.layersWillBeRemoved, self._on_layers_removed)):
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        for layer in self._watched.values():
+            try:
+                layer.crsChanged.disconnect(self.clear)
+            except (TypeError, RuntimeError):
+                pass
+        self._watched.clear()
+        self.clear()
+
+    def clear(self):
+        self._crs.clear()
+        self._transforms.clear()
+        self._generation += 1
+
+    def crs(self, authid):
+        """QgsCoordinateReferenceSystem for an auth id such as 'EPSG:32633'."""
+        crs = self._crs.get(authid)
+        if crs is not None:
+            self._crs.move_to_end(authid)
+            self.crs_hits += 1
+            return crs
+        self.crs_misses += 1
+        crs = QgsCoordinateReferenceSystem(authid)
+        self._crs[authid] = crs
+        if len(self._crs) > self._max_size:
+            self._crs.popitem(last=False)
+        return crs
+
+    def transform(self, src_authid, dst_crs):
+        """Cached QgsCoordinateTransform from src_authid to dst_crs."""
+        key = (src_authid, crs_key(dst_crs), self._generation)
+        xform = self._transforms.get(key)
+        if xform is not None:
+            self._transforms.move_to_end(key)
+            self.hits += 1
+            return xform
+        self.misses += 1
+        xform = QgsCoordinateTransform(self.crs(src_authid), dst_crs, self._project)
+        self._transforms[key] = xform
+        if len(self._transforms) > self._max_size:
+            self._transforms.popitem(last=False)
+        return xform
+
+    def transform_for_layer(self, src_authid, layer):
+        """Transform into the layer's CRS; the cache is dropped if that CRS changes."""
+        if layer.id() not in self._watched:
+            layer.crsChanged.connect(self.clear)
+            self._watched[layer.id()] = layer
+        return self.transform(src_authid, layer.crs())
+
+    def stats(self):
+        """Hit / miss counters and sizes (shown with the dock's timing statistics)."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'crs_hits': self.crs_hits,
+            'crs_misses': self.crs_misses,
+            'transforms': len(self._transforms),
+            'crs': len(self._crs),
+        }
+
+    def reset_stats(self):
+        self.hits = self.misses = self.crs_hits = self.crs_misses = 0
+
+    def _on_context_changed(self):
+        self.clear()
+
+    def _on_layers_removed(self, layer_ids):
+        for layer_id in layer_ids:
+            layer = self._watched.pop(layer_id, None)
+            if layer is not None:
+                try:
+                    layer.crsChanged.disconnect(self.clear)
+                except (TypeError, RuntimeError):
+                    pass
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate detection against the points already in a layer.
+
+Each target layer gets a QgsSpatialIndex built once from its features and
+kept current from the layer's edit signals, so a lookup is one query for
+the tolerance box (O(log n)) however large the layer is; the candidates
+are then ranked by distance in metres, not in layer units, which differ
+per axis on geographic layers. Points of the same batch are checked
+against each other through a hash grid.
+"""
+import math
+
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsFeature,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProject,
+    QgsRectangle,
+    QgsSpatialIndex,
+    QgsUnitTypes,
+)
+
+MODE_WARN = 'warn'
+MODE_SKIP = 'skip'
+MODE_MERGE = 'merge'
+MODES = (MODE_WARN, MODE_SKIP, MODE_MERGE)
+
+# metres per degree of latitude (mean); enough for a metre-level tolerance
+_METRES_PER_DEGREE = 111320.0
+
+
+class _LayerIndex:
+    def __init__(self, layer):
+        self.layer = layer
+        self.crs = QgsCoordinateReferenceSystem(layer.crs())
+        self.index = QgsSpatialIndex()
+        self.points = {}    # fid -> (x, y)
+        self.weights = {}   # fid -> number of merged points (absent = 1)
+        self.geographic = layer.crs().isGeographic()
+        self.to_metres = QgsUnitTypes.fromUnitToUnitFactor(layer.crs().mapUnits(), QgsUnitTypes.DistanceMeters)
+        self._connected = False
+
+        request = QgsFeatureRequest().setNoAttributes()
+        for feat in layer.getFeatures(request):
+            self._insert(feat.id(), feat.geometry())
+
+        for signal, slot in self._signals():
+            signal.connect(slot)
+        self._connected = True
+
+    def _signals(self):
+        layer = self.layer
+        return (
+            (layer.featureAdded, self._on_feature_added),
+            (layer.featureDeleted, self._on_feature_deleted),
+            (layer.geometryChanged, self._on_geometry_changed),
+            (layer.committedFeaturesAdded, self._on_committed_features_added),
+            (layer.afterRollBack, self._on_rolled_back),
+        )
+
+    def close(self):
+        if not self._connected:
+            return
+        for signal, slot in self._signals():
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        self._connected = False
+
+    # -- index maintenance ------------------------------------------------
+    def _insert(self, fid, geom):
+        if geom is None or geom.isEmpty():
+            return
+        pt = geom.asPoint() if not geom.isMultipart() else geom.centroid().asPoint()
+        self.points[fid] = (pt.x(), pt.y())
+        self.index.addFeature(fid, QgsRectangle(pt.x(), pt.y(), pt.x(), pt.y()))
+
+    def _remove(self, fid):
+        xy = self.points.pop(fid, None)
+        if xy is None:
+            return
+        self.weights.pop(fid, None)
+        feat = QgsFeature(fid)
+        feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(*xy)))
+        self.index.deleteFeature(feat)
+
+    def _on_feature_added(self, fid):
+        # new features live in the edit buffer; getFeature() reads it
+        feat = self.layer.getFeature(fid)
+        self._insert(fid, feat.geometry())
+
+    def _on_feature_deleted(self, fid):
+        self._remove(fid)
+
+    def _on_geometry_changed(self, fid, geom):
+        weight = self.weights.get(fid)
+        self._remove(fid)
+        self._insert(fid, geom)
+        if weight:
+            self.weights[fid] = weight
+
+    def _on_committed_features_added(self, layer_id, features):
+        # committed features get provider ids; move the temporary (negative)
+        # entries over by matching coordinates
+        temporary = {}
+        for fid, xy in self.points.items():
+            if fid < 0:
+                temporary.setdefault(xy, []).append(fid)
+        for feat in features:
+            geom = feat.geometry()
+            if geom.isEmpty():
+                continue
+            pt = geom.asPoint() if not geom.isMultipart() else geom.centroid().asPoint()
+            fids = temporary.get((pt.x(), pt.y()))
+            if fids:
+                temp = fids.pop()
+                weight = self.weights.get(temp)
+                self._remove(temp)
+                if weight:
+                    self.weights[feat.id()] = weight
+            self._insert(feat.id(), geom)
+
+    def _on_rolled_back(self):
+        for fid in [f for f in self.points if f < 0]:
+            self._remove(fid)
+
+    # -- queries ----------------------------------------------------------
+    def search_box(self, x, y, tolerance_m):
+        """Half sizes (dx, dy) in layer units of a box of tolerance_m around x, y."""
+        if self.geographic:
+            dy = tolerance_m / _METRES_PER_DEGREE
+            dx = dy / max(math.cos(math.radians(y)), 1e-6)
+            return dx, dy
+        d = tolerance_m / (self.to_metres or 1.0)
+        return d, d
+
+    def distance_m(self, a, b):
+        if self.geographic:
+            # equirectangular; exact enough at tolerance scale
+            lat = math.radians((a[1] + b[1]) / 2.0)
+            dx = (a[0] - b[0]) * math.cos(lat)
+            dy = a[1] - b[1]
+            return math.hypot(dx, dy) * _METRES_PER_DEGREE
+        return math.hypot(a[0] - b[0], a[1] - b[1]) * self.to_metres
+
+    def nearest(self, x, y, tolerance_m):
+        """(fid, distance in m) of the nearest point within tolerance, or None."""
+        dx, dy = self.search_box(x, y, tolerance_m)
+        # all points in the box: the nearest one in degrees need not be the
+        # nearest one in metres
+        fids = self.index.intersects(QgsRectangle(x - dx, y - dy, x + dx, y + dy))
+        best = None
+        for fid in fids:
+            xy = self.points.get(fid)
+            if xy is None:
+                continue
+            dist = self.distance_m((x, y), xy)
+            if dist <= tolerance_m and (best is None or dist < best[1]):
+                best = (fid, dist)
+        return best
+
+
+class DuplicateIndex:
+    """Per-layer spatial indexes, created on first use."""
+
+    def __init__(self, project=None):
+        self._project = project or QgsProject.instance()
+        self._layers = {}  # layer id -> _LayerIndex
+        self._project.layersWillBeRemoved.connect(self._on_layers_removed)
+
+    def close(self):
+        try:
+            self._project.layersWillBeRemoved.disconnect(self._on_layers_removed)
+        except (TypeError, RuntimeError):
+            pass
+        for entry in self._layers.values():
+            entry.close()
+        self._layers.clear()
+
+    def invalidate(self, layer):
+        """Forget a layer's index (e.g. after features were written behind its back)."""
+        entry = self._layers.pop(layer.id(), None)
+        if entry is not None:
+            entry.close()
+
+    def _on_layers_removed(self, layer_ids):
+        for layer_id in layer_ids:
+            entry = self._layers.pop(layer_id, None)
+            if entry is not None:
+                entry.close()
+
+    def layer_index(self, layer):
+        entry = self._layers.get(layer.id())
+        if entry is None or entry.crs != layer.crs():
+            if entry is not None:
+                entry.close()
+            entry = self._layers[layer.id()] = _LayerIndex(layer)
+        return entry
+
+    def find(self, layer, points, tolerance_m):
+        """
+        Match each point (QgsPointXY in layer CRS) with an earlier point within
+        tolerance_m metres. Returns a list parallel to points with None,
+        ('layer', fid) for a point already in the layer or ('batch', i) for an
+        earlier point of the same list.
+        """
+        if tolerance_m <= 0 or not points:
+            return [None] * len(points)
+        entry = self.layer_index(layer)
+        # grid cells at least as large as the tolerance: a match is in one of
+        # the 9 cells around a point (widest cell at the highest latitude)
+        far = max(points, key=lambda p: abs(p.y())) if entry.geographic else points[0]
+        cell = entry.search_box(far.x(), min(abs(far.y()), 89.0), tolerance_m)
+        matches = []
+        grid = {}
+        for i, pt in enumerate(points):
+            x, y = pt.x(), pt.y()
+            hit = entry.nearest(x, y, tolerance_m)
+            if hit is not None:
+                matches.append(('layer', hit[0]))
+                continue
+            matches.append(self._batch_match(entry, grid, cell, points, x, y, tolerance_m, i))
+        return matches
+
+    def resolve(self, layer, points, tolerance_m, mode):
+        """
+        Apply a duplicate mode to points (QgsPointXY in layer CRS). Returns
+        (points to add, {fid: QgsPointXY} moves of existing features, number
+        of duplicates). 'merge' replaces each group of duplicates by its mean,
+        weighting existing features by the points merged into them before.
+        """
+        matches = self.find(layer, points, tolerance_m)
+        count = sum(1 for m in matches if m is not None)
+        if not count or mode == MODE_WARN:
+            return list(points), {}, count
+        if mode == MODE_SKIP:
+            return [p for p, m in zip(points, matches) if m is None], {}, count
+
+        entry = self._layers[layer.id()]
+        sums = {}  # ('layer', fid) / ('batch', i) -> [sum x, sum y, weight]
+        for i, (pt, match) in enumerate(zip(points, matches)):
+            key = match or ('batch', i)
+            acc = sums.get(key)
+            if acc is None:
+                if key[0] == 'layer':
+                    x, y = entry.points[key[1]]
+                    n = entry.weights.get(key[1], 1)
+                    acc = sums[key] = [x * n, y * n, n]
+                else:
+                    acc = sums[key] = [0.0, 0.0, 0]
+            acc[0] += pt.x()
+            acc[1] += pt.y()
+            acc[2] += 1
+
+        keep = []
+        moves = {}
+        for (kind, ref), (sx, sy, n) in sums.items():
+            mean = QgsPointXY(sx / n, sy / n)
+            if kind == 'layer':
+                moves[ref] = mean
+                entry.weights[ref] = n
+            else:
+                keep.append(mean)
+        return keep, moves, count
+
+    def _batch_match(self, entry, grid, cell, points, x, y, tolerance_m, i):
+        dx, dy = cell
+        cx, cy = int(math.floor(x / dx)), int(math.floor(y / dy))
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for j in grid.get((gx, gy), ()):
+                    other = points[j]
+                    if entry.distance_m((x, y), (other.x(), other.y())) <= tolerance_m:
+                        return ('batch', j)
+        grid.setdefault((cx, cy), []).append(i)
+        return None
+
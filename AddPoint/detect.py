@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Guess input format, E/N order and UTM zone from coordinate text.
+
+Pure Python and cheap enough to run on every keystroke. Angle formats are told
+apart by the number of numeric tokens, symbols and hemisphere letters; plain
+numbers are matched against the typical value ranges of the metric formats.
+"""
+from collections import Counter, namedtuple
+
+from . import coordparse, mgrs
+
+Detection = namedtuple('Detection', 'fmt order utm_epsg confidence')
+Detection.__doc__ = """
+fmt: format code (as in coordparse.FORMATS), order: 'EN' or 'NE',
+utm_epsg: suggested zone auth id (UTM only, may be None),
+confidence: 0..1 (1 = unambiguous).
+"""
+
+_ANGLE_MARKS = frozenset('°\'"′″’“”:')
+_ANGLE_FORMATS = ('DD', 'DDM', 'DMS')
+
+# Typical E/N ranges; checked from the most specific to the least specific
+_WEB_MERCATOR_MAX = 20037508.3428
+_METRIC_RANGES = (
+    # D96/TM covers Slovenia: E 370-630 km, N 30-200 km (with margin)
+    ('EPSG:3794', 300000, 800000, 0, 300000),
+    ('UTM', 100000, 900000, 0, 10000000),
+    ('EPSG:3857', -_WEB_MERCATOR_MAX, _WEB_MERCATOR_MAX, -_WEB_MERCATOR_MAX, _WEB_MERCATOR_MAX),
+)
+
+
+def utm_zone_epsg(lon, lat):
+    """Auth id of the WGS84 UTM zone containing lon/lat."""
+    zone = int((lon + 180.0) // 6.0) % 60 + 1
+    return f"EPSG:{(32600 if lat >= 0 else 32700) + zone}"
+
+
+def _metric_format(x, y):
+    for rank, (fmt, x_min, x_max, y_min, y_max) in enumerate(_METRIC_RANGES):
+        if x_min <= x <= x_max and y_min <= y <= y_max:
+            return fmt, len(_METRIC_RANGES) - rank
+    return None, 0
+
+
+def _angle_order(a_hemi, b_hemi, a_deg, b_deg, ref_lonlat):
+    """Order of two angles and whether it was decided unambiguously."""
+    if a_hemi in ('N', 'S') or b_hemi in ('E', 'W'):
+        return 'NE', True
+    if a_hemi in ('E', 'W') or b_hemi in ('N', 'S'):
+        return 'EN', True
+    if abs(a_deg) > 90 >= abs(b_deg):
+        return 'EN', True
+    if abs(b_deg) > 90 >= abs(a_deg):
+        return 'NE', True
+    if ref_lonlat is not None:
+        lon, lat = ref_lonlat
+        en = abs(a_deg - lon) + abs(b_deg - lat)
+        ne = abs(b_deg - lon) + abs(a_deg - lat)
+        return ('NE' if ne < en else 'EN'), False
+    return 'EN', False
+
+
+def detect_pair(a_text, b_text, ref_lonlat=None):
+    """
+    Detect format and order of two values as typed (first, second).
+    ref_lonlat (e.g. the map canvas centre in WGS84) breaks ties and picks the
+    UTM zone. Returns a Detection or None.
+    """
+    a_text = (a_text or '').strip()
+    b_text = (b_text or '').strip()
+    a_nums, a_hemi = coordparse.angle_tokens(a_text)
+    b_nums, b_hemi = coordparse.angle_tokens(b_text)
+    if not a_nums or not b_nums:
+        return None
+
+    marks = any(c in _ANGLE_MARKS for c in a_text) or any(c in _ANGLE_MARKS for c in b_text)
+    tokens = max(len(a_nums), len(b_nums))
+    if a_hemi or b_hemi or marks or tokens > 1:
+        fmt = _ANGLE_FORMATS[min(tokens, 3) - 1]
+        order, sure = _angle_order(a_hemi, b_hemi, a_nums[0], b_nums[0], ref_lonlat)
+        return Detection(fmt, order, None, 1.0 if sure else 0.5)
+
+    a, b = a_nums[0], b_nums[0]
+    if abs(a) <= 180 and abs(b) <= 180 and (abs(a) <= 90 or abs(b) <= 90):
+        order, sure = _angle_order(None, None, a, b, ref_lonlat)
+        return Detection('DD', order, None, 1.0 if sure else 0.5)
+
+    en_fmt, en_rank = _metric_format(a, b)
+    ne_fmt, ne_rank = _metric_format(b, a)
+    if not en_fmt and not ne_fmt:
+        return None
+    if ne_rank > en_rank:
+        fmt, order = ne_fmt, 'NE'
+    else:
+        fmt, order = en_fmt, 'EN'
+    confidence = 1.0 if en_rank != ne_rank else 0.5
+    utm_epsg = None
+    if fmt == 'UTM' and ref_lonlat is not None:
+        utm_epsg = utm_zone_epsg(*ref_lonlat)
+    return Detection(fmt, order, utm_epsg, confidence)
+
+
+def detect_text(s, ref_lonlat=None):
+    """Detect format and order of single-field text."""
+    if mgrs.is_reference(s):
+        return Detection('MGRS', 'EN', None, 1.0)
+    a_text, b_text = coordparse.split_single_field(s)
+    if not a_text or not b_text:
+        return None
+    return detect_pair(a_text, b_text, ref_lonlat)
+
+
+def detect_lines(lines, ref_lonlat=None, sample_size=64, split=coordparse.split_single_field):
+    """
+    Decide format and order once for many lines by sampling rows.
+    Sequences are sampled evenly; other iterables use their first non-empty
+    rows. split(line) must return the two value texts as typed.
+    """
+    if hasattr(lines, '__getitem__') and hasattr(lines, '__len__'):
+        step = max(1, len(lines) // sample_size)
+        sample = lines[::step]
+    else:
+        sample = lines
+    votes = Counter()
+    utm = Counter()
+    seen = 0
+    for line in sample:
+        if not line.strip():
+            continue
+        seen += 1
+        if mgrs.is_reference(line):
+            votes[('MGRS', 'EN')] += 1.0
+            if seen >= sample_size:
+                break
+            continue
+        a_text, b_text = split(line)
+        det = detect_pair(a_text, b_text, ref_lonlat) if a_text and b_text else None
+        if det is not None:
+            votes[(det.fmt, det.order)] += det.confidence
+            if det.utm_epsg:
+                utm[det.utm_epsg] += 1
+        if seen >= sample_size:
+            break
+    if not votes:
+        return None
+    (fmt, order), score = votes.most_common(1)[0]
+    utm_epsg = utm.most_common(1)[0][0] if fmt == 'UTM' and utm else None
+    return Detection(fmt, order, utm_epsg, score / seen)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming point output to GeoPackage or FlatGeobuf.
+
+PointFileWriter keeps one QgsVectorFileWriter open for the whole output, so
+all features go into a single OGR transaction that is committed when the
+writer is closed. The spatial index is built once at the end: GeoPackage
+layers are created without their R-tree (no trigger per insert) and get it
+on close; FlatGeobuf writes its packed index when the file is finalized.
+The layer is created in the requested CRS, so nothing is reprojected when
+it is drawn.
+"""
+import os
+
+from qgis.core import (
+    QgsFeature,
+    QgsFeatureSink,
+    QgsFields,
+    QgsGeometry,
+    QgsVectorDataProvider,
+    QgsVectorFileWriter,
+    QgsVectorLayer,
+    QgsWkbTypes,
+)
+
+DRIVER_GPKG = 'GPKG'
+DRIVER_FLATGEOBUF = 'FlatGeobuf'
+EXTENSIONS = {DRIVER_GPKG: '.gpkg', DRIVER_FLATGEOBUF: '.fgb'}
+
+
+def driver_for_path(path):
+    """Driver name for a file extension, GeoPackage by default."""
+    ext = os.path.splitext(path)[1].lower()
+    for driver, driver_ext in EXTENSIONS.items():
+        if ext == driver_ext:
+            return driver
+    return DRIVER_GPKG
+
+
+def layer_uri(path, driver, layer_name):
+    if driver == DRIVER_GPKG:
+        return f'{path}|layername={layer_name}'
+    return path
+
+
+class PointFileWriter:
+    """
+    Writes point features to a new file. Used like a data provider by the
+    import task: addFeatures() returns (ok, features) and errors() the
+    messages of the last failure.
+    """
+
+    def __init__(self, path, crs, transform_context, driver=DRIVER_GPKG, layer_name='AddPoint', fields=None):
+        self.path = path
+        self.driver = driver
+        self.layer_name = layer_name
+        self.fields = fields if fields is not None else QgsFields()
+        self.count = 0
+        self._errors = []
+
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = driver
+        options.layerName = layer_name
+        options.fileEncoding = 'UTF-8'
+        # GeoPackage: no R-tree (and its insert triggers) until close()
+        options.layerOptions = ['SPATIAL_INDEX=NO'] if driver == DRIVER_GPKG else ['SPATIAL_INDEX=YES']
+        self._writer = QgsVectorFileWriter.create(path, self.fields, QgsWkbTypes.Point, crs,
+                                                  transform_context, options)
+        if self._writer.hasError() != QgsVectorFileWriter.NoError:
+            message = self._writer.errorMessage()
+            self._writer = None
+            raise RuntimeError(message or f'Cannot create {path}')
+
+    def addFeatures(self, features, flags=QgsFeatureSink.FastInsert):
+        if not self._writer.addFeatures(features, flags):
+            self._errors = [self._writer.lastError() or 'addFeatures failed']
+            return False, features
+        self.count += len(features)
+        return True, features
+
+    def add_points(self, points):
+        """Write QgsPointXY (in the output CRS); returns the number written."""
+        feats = []
+        for pt in points:
+            feat = QgsFeature(self.fields)
+            feat.setGeometry(QgsGeometry.fromPointXY(pt))
+            feats.append(feat)
+        ok, _ = self.addFeatures(feats)
+        if not ok:
+            raise RuntimeError('; '.join(self._errors))
+        return len(feats)
+
+    def errors(self):
+        return list(self._errors)
+
+    def close(self):
+        """Commit, build the spatial index and return the layer URI."""
+        if self._writer is None:
+            return layer_uri(self.path, self.driver, self.layer_name)
+        # deleting the writer commits the transaction and finalizes the file
+        del self._writer
+        self._writer = None
+        uri = layer_uri(self.path, self.driver, self.layer_name)
+        if self.driver == DRIVER_GPKG:
+            layer = QgsVectorLayer(uri, self.layer_name, 'ogr')
+            provider = layer.dataProvider() if layer.isValid() else None
+            if provider is not None and provider.capabilities() & QgsVectorDataProvider.CreateSpatialIndex:
+                provider.createSpatialIndex()
+        return uri
+
+    def discard(self):
+        """Drop the writer and delete the partly written file."""
+        if self._writer is not None:
+            del self._writer
+            self._writer = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def create_point_layer(path, crs, transform_context, layer_name='AddPoint', driver=None):
+    """Create an empty point layer file and return it loaded (not added to the project)."""
+    writer = PointFileWriter(path, crs, transform_context, driver or driver_for_path(path), layer_name)
+    uri = writer.close()
+    layer = QgsVectorLayer(uri, layer_name, 'ogr')
+    if not layer.isValid():
+        raise RuntimeError(f'Cannot open {uri}')
+    return layer
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Offline gazetteer: place names and survey-marker IDs resolved to coordinates.
+
+Sources (CSV or GeoPackage point layers) are compiled once into a sorted,
+memory-mapped index file; lookups never read the sources. A name and an ID
+of the same place are two index records. Keys are normalized (upper case,
+no diacritics, single spaces), so 'crnomelj' finds 'Črnomelj'.
+
+Index file layout (little endian):
+    header      MAGIC, record count (uint64)
+    offsets     uint64 per record, into the record area, sorted by key
+    records     key length (uint16), name length (uint16), CRS length (uint8),
+                key, name, CRS (UTF-8), x, y (float64, in that CRS)
+
+Prefix completion is a binary search over the offsets followed by a forward
+scan, so only the pages it touches are read, whatever the size of the index.
+QGIS-free, like coordparse.
+"""
+import csv
+import mmap
+import os
+import sqlite3
+import struct
+import unicodedata
+from collections import namedtuple
+
+MAGIC = b'APGAZ\x00\x01\x00'
+DEFAULT_EPSG = 'EPSG:4326'
+
+# column names recognized in the sources (case-insensitive, first match wins)
+NAME_FIELDS = ('name', 'naziv', 'ime', 'title', 'label')
+ID_FIELDS = ('id', 'code', 'oznaka', 'marker', 'station', 'tocka')
+X_FIELDS = ('x', 'lon', 'long', 'longitude', 'e', 'east', 'easting')
+Y_FIELDS = ('y', 'lat', 'latitude', 'n', 'north', 'northing')
+EPSG_FIELDS = ('epsg', 'crs', 'srid')
+
+_HEADER = struct.Struct('<8sQ')
+_OFFSET = struct.Struct('<Q')
+_RECORD = struct.Struct('<HHB')
+_XY = struct.Struct('<dd')
+_GPKG_ENVELOPE = {0: 0, 1: 32, 2: 48, 3: 48, 4: 64}
+
+Place = namedtuple('Place', 'key name x y epsg')
+Place.__doc__ = """
+key: normalized text the place was found by (its name or ID),
+name: display text ('name (ID)' for ID records), x, y: in epsg.
+"""
+
+
+def normalize(text):
+    """Index key: upper case without diacritics, single spaces."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.upper().split())
+
+
+def _field(names, candidates):
+    lower = [n.strip().lower() for n in names]
+    for candidate in candidates:
+        if candidate in lower:
+            return lower.index(candidate)
+    return None
+
+
+def read_csv(path, epsg=DEFAULT_EPSG):
+    """Yield (name, marker id, x, y, epsg) from a CSV file with a header row."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        sample = f.read(65536)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t|')
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = next(reader, None) or []
+        name_i = _field(header, NAME_FIELDS)
+        id_i = _field(header, ID_FIELDS)
+        x_i = _field(header, X_FIELDS)
+        y_i = _field(header, Y_FIELDS)
+        epsg_i = _field(header, EPSG_FIELDS)
+        if x_i is None or y_i is None or (name_i is None and id_i is None):
+            raise ValueError(f'{path}: needs a name or ID column and x/y columns')
+        for row in reader:
+            try:
+                x = float(row[x_i].replace(',', '.'))
+                y = float(row[y_i].replace(',', '.'))
+            except (IndexError, ValueError):
+                continue
+            name = row[name_i].strip() if name_i is not None and name_i < len(row) else ''
+            marker = row[id_i].strip() if id_i is not None and id_i < len(row) else ''
+            row_epsg = row[epsg_i].strip() if epsg_i is not None and epsg_i < len(row) else ''
+            if row_epsg.isdigit():
+                row_epsg = f'EPSG:{row_epsg}'
+            yield name, marker, x, y, row_epsg or epsg
+
+
+def _gpkg_point(blob):
+    """(x, y) of a GeoPackage point geometry blob, None if empty or not a point."""
+    if not blob or blob[:2] != b'GP':
+        return None
+    flags = blob[3]
+    if flags & 0x10:  # empty geometry
+        return None
+    start = 8 + _GPKG_ENVELOPE.get((flags >> 1) & 0x07, 0)
+    endian = '<' if blob[start] == 1 else '>'
+    (geom_type,) = struct.unpack_from(endian + 'I', blob, start + 1)
+    if geom_type & 0x0fffffff not in (1, 1001, 2001, 3001):
+        return None
+    return struct.unpack_from(endian + 'dd', blob, start + 5)
+
+
+def read_gpkg(path):
+    """Yield (name, marker id, x, y, epsg) from the point layers of a GeoPackage."""
+    db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        tables = db.execute(
+            'SELECT g.table_name, g.column_name, s.organization, s.organization_coordsys_id '
+            'FROM gpkg_geometry_columns g JOIN gpkg_spatial_ref_sys s ON s.srs_id = g.srs_id '
+            "WHERE upper(g.geometry_type_name) IN ('POINT', 'MULTIPOINT', 'GEOMETRY')").fetchall()
+        for table, geom_col, org, org_id in tables:
+            columns = [row[1] for row in db.execute(f'PRAGMA table_info("{table}")')]
+            name_i = _field(columns, NAME_FIELDS)
+            id_i = _field(columns, ID_FIELDS[1:])  # 'id' is usually the feature id
+            if name_i is None and id_i is None:
+                continue
+            epsg = f'{org.upper()}:{org_id}' if org else DEFAULT_EPSG
+            select = ', '.join(f'"{columns[i]}"' if i is not None else "''" for i in (name_i, id_i))
+            for name, marker, blob in db.execute(f'SELECT {select}, "{geom_col}" FROM "{table}"'):
+                xy = _gpkg_point(blob)
+                if xy is not None:
+                    yield str(name or '').strip(), str(marker or '').strip(), xy[0], xy[1], epsg
+    finally:
+        db.close()
+
+
+def read_source(path, epsg=DEFAULT_EPSG):
+    if os.path.splitext(path)[1].lower() == '.gpkg':
+        return read_gpkg(path)
+    return read_csv(path, epsg)
+
+
+def build_index(sources, index_path, epsg=DEFAULT_EPSG):
+    """
+    Compile source files into an index at index_path (written next to it and
+    renamed, so an open index stays valid). Returns the number of records.
+    """
+    records = []
+    for path in sources:
+        for name, marker, x, y, place_epsg in read_source(path, epsg):
+            crs = place_epsg.encode('ascii', 'replace')[:255]
+            if name:
+                records.append((normalize(name).encode('utf-8'), name.encode('utf-8'), crs, x, y))
+            if marker:
+                label = f'{name} ({marker})' if name else marker
+                records.append((normalize(marker).encode('utf-8'), label.encode('utf-8'), crs, x, y))
+    records = [r for r in records if r[0] and len(r[0]) <= 0xffff and len(r[1]) <= 0xffff]
+    # byte order of the UTF-8 keys, which is what lookups compare
+    records.sort(key=lambda r: r[0])
+
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(records)))
+        offset = 0
+        offsets = bytearray()
+        for key, name, crs, _x, _y in records:
+            offsets += _OFFSET.pack(offset)
+            offset += _RECORD.size + len(key) + len(name) + len(crs) + _XY.size
+        f.write(offsets)
+        for key, name, crs, x, y in records:
+            f.write(_RECORD.pack(len(key), len(name), len(crs)))
+            f.write(key)
+            f.write(name)
+            f.write(crs)
+            f.write(_XY.pack(x, y))
+    os.replace(tmp_path, index_path)
+    return len(records)
+
+
+def index_is_current(index_path, sources):
+    """True if the index exists and is newer than every source."""
+    try:
+        built = os.path.getmtime(index_path)
+        return all(os.path.getmtime(path) <= built for path in sources)
+    except OSError:
+        return False
+
+
+class Gazetteer:
+    """Read-only view of an index file (memory-mapped)."""
+
+    def __init__(self, index_path):
+        self.path = index_path
+        self._file = open(index_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f'{index_path}: not a gazetteer index')
+        magic, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{index_path}: not a gazetteer index')
+        self._records = _HEADER.size + self._count * _OFFSET.size
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._file.close()
+
+    def _key_at(self, i):
+        (offset,) = _OFFSET.unpack_from(self._map, _HEADER.size + i * _OFFSET.size)
+        pos = self._records + offset
+        key_len = _RECORD.unpack_from(self._map, pos)[0]
+        start = pos + _RECORD.size
+        return self._map[start:start + key_len], pos
+
+    def _place_at(self, pos):
+        key_len, name_len, crs_len = _RECORD.unpack_from(self._map, pos)
+        start = pos + _RECORD.size
+        key = self._map[start:start + key_len].decode('utf-8')
+        start += key_len
+        name = self._map[start:start + name_len].decode('utf-8')
+        start += name_len
+        epsg = self._map[start:start + crs_len].decode('ascii')
+        x, y = _XY.unpack_from(self._map, start + crs_len)
+        return Place(key, name, x, y, epsg)
+
+    def _lower_bound(self, key):
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def complete(self, prefix, limit=20):
+        """Places whose key starts with the normalized prefix, in key order."""
+        key = normalize(prefix).encode('utf-8')
+        if not key:
+            return []
+        places = []
+        i = self._lower_bound(key)
+        while i < self._count and len(places) < limit:
+            found, pos = self._key_at(i)
+            if not found.startswith(key):
+                break
+            places.append(self._place_at(pos))
+            i += 1
+        return places
+
+    def lookup(self, text):
+        """First place named (or with the ID) text exactly, None if there is none."""
+        key = normalize(text).encode('utf-8')
+        if not key:
+            return None
+        i = self._lower_bound(key)
+        if i < self._count:
+            found, pos = self._key_at(i)
+            if found == key:
+                return self._place_at(pos)
+        return None
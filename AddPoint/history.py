@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent history of entered coordinates (SQLite, QGIS-free).
+
+One row per distinct entry (text, format, order, UTM zone) with its parsed
+value, so a past entry can be added again without parsing. Lookups use
+indexes only:
+    prefix completion   range scan on the normalized text (key >= p AND key < p + U+10FFFF)
+                        and a sort of the matches by use; for prefixes with
+                        many matches first a bounded walk of the use-count index
+    bounding box        R-tree on the WGS84 position (plain lon/lat index if
+                        the SQLite build has no R-tree module)
+"""
+import math
+import sqlite3
+import time
+from collections import namedtuple
+
+DEFAULT_MAX_ENTRIES = 500000
+RANK_SCAN = 20000   # most used entries searched first for prefixes with many matches
+
+Entry = namedtuple('Entry', 'id text e_text n_text fmt order utm_epsg x y src_epsg lon lat layer uses last_used')
+Entry.__doc__ = """
+text: the entry as shown (single-field text, or E and N text for two fields),
+e_text/n_text: the two-field values (None for single-field entries),
+x, y, src_epsg: parsed value in the source CRS, lon/lat: WGS84,
+layer: target layer name(s), last_used: UNIX time.
+"""
+
+_COLUMNS = 'id, text, e_text, n_text, fmt, ord, utm_epsg, x, y, src_epsg, lon, lat, layer, uses, last_used'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entry (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    text TEXT NOT NULL,
+    e_text TEXT,
+    n_text TEXT,
+    fmt TEXT NOT NULL,
+    ord TEXT NOT NULL,
+    utm_epsg TEXT NOT NULL,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    src_epsg TEXT NOT NULL,
+    lon REAL NOT NULL,
+    lat REAL NOT NULL,
+    layer TEXT,
+    uses INTEGER NOT NULL DEFAULT 1,
+    last_used REAL NOT NULL,
+    UNIQUE (text, fmt, ord, utm_epsg)
+);
+CREATE INDEX IF NOT EXISTS entry_key ON entry (key);
+CREATE INDEX IF NOT EXISTS entry_last_used ON entry (last_used);
+CREATE INDEX IF NOT EXISTS entry_rank ON entry (uses DESC, last_used DESC);
+"""
+
+
+def normalize(text):
+    """Search key: upper case, single spaces."""
+    return ' '.join((text or '').upper().split())
+
+
+class EntryHistory:
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._db = sqlite3.connect(path)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+        try:
+            self._db.execute('CREATE VIRTUAL TABLE IF NOT EXISTS entry_rtree '
+                             'USING rtree(id, min_lon, max_lon, min_lat, max_lat)')
+            self.rtree = True
+        except sqlite3.OperationalError:  # SQLite built without R-tree
+            self._db.execute('CREATE INDEX IF NOT EXISTS entry_lonlat ON entry (lon, lat)')
+            self.rtree = False
+        self._db.commit()
+        self._prune()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def add(self, text, fmt, order, utm_epsg, x, y, src_epsg, lon, lat, layer=None, e_text=None, n_text=None):
+        """Record an entry (or count another use of it); returns its id."""
+        now = time.time()
+        with self._db:
+            self._db.execute(
+                'INSERT INTO entry (key, text, e_text, n_text, fmt, ord, utm_epsg, x, y, src_epsg, lon, lat, '
+                'layer, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (text, fmt, ord, utm_epsg) DO UPDATE SET uses = uses + 1, '
+                'last_used = excluded.last_used, layer = excluded.layer',
+                (normalize(text), text, e_text, n_text, fmt, order, utm_epsg or '', x, y, src_epsg, lon, lat,
+                 layer, now))
+            entry_id = self._db.execute(
+                'SELECT id FROM entry WHERE text = ? AND fmt = ? AND ord = ? AND utm_epsg = ?',
+                (text, fmt, order, utm_epsg or '')).fetchone()[0]
+            if self.rtree:
+                self._db.execute('INSERT OR REPLACE INTO entry_rtree VALUES (?, ?, ?, ?, ?)',
+                                 (entry_id, lon, lon, lat, lat))
+        return entry_id
+
+    def touch(self, entry_id, layer=None):
+        """Count another use of an existing entry."""
+        with self._db:
+            self._db.execute('UPDATE entry SET uses = uses + 1, last_used = ?, layer = COALESCE(?, layer) '
+                             'WHERE id = ?', (time.time(), layer, entry_id))
+
+    def get(self, entry_id):
+        row = self._db.execute(f'SELECT {_COLUMNS} FROM entry WHERE id = ?', (entry_id,)).fetchone()
+        return Entry(*row) if row else None
+
+    def complete(self, prefix, limit=20):
+        """Entries whose text starts with prefix (case-insensitive), most used (then most recent) first."""
+        key = normalize(prefix)
+        if not key:
+            return []
+        bounds = (key, key + '\U0010ffff')
+        # Sorting m matches costs about m rows; walking the rank index until
+        # limit matches are found about entries * limit / m. Past
+        # sqrt(entries * limit) matches try the walk, over the RANK_SCAN most
+        # used entries only (new entries share a prefix and are all used once).
+        many = math.isqrt(self.max_entries * limit)
+        matches = self._db.execute(
+            'SELECT COUNT(*) FROM (SELECT 1 FROM entry INDEXED BY entry_key WHERE key >= ? AND key < ? LIMIT ?)',
+            bounds + (many,)).fetchone()[0]
+        if matches >= many:
+            rows = self._db.execute(
+                f'SELECT {_COLUMNS} FROM (SELECT * FROM entry INDEXED BY entry_rank '
+                'ORDER BY uses DESC, last_used DESC LIMIT ?) WHERE key >= ? AND key < ? LIMIT ?',
+                (RANK_SCAN,) + bounds + (limit,)).fetchall()
+            # the subquery hands its rows over in rank order
+            if len(rows) == limit:
+                return [Entry(*row) for row in rows]
+        rows = self._db.execute(
+            f'SELECT {_COLUMNS} FROM entry INDEXED BY entry_key WHERE key >= ? AND key < ? '
+            'ORDER BY uses DESC, last_used DESC LIMIT ?', bounds + (limit,)).fetchall()
+        return [Entry(*row) for row in rows]
+
+    def recent(self, limit=20):
+        rows = self._db.execute(f'SELECT {_COLUMNS} FROM entry ORDER BY last_used DESC LIMIT ?',
+                                (limit,)).fetchall()
+        return [Entry(*row) for row in rows]
+
+    def in_bbox(self, min_lon, min_lat, max_lon, max_lat, limit=100):
+        """Entries inside a WGS84 bounding box."""
+        if self.rtree:
+            sql = (f'SELECT {_COLUMNS} FROM entry WHERE id IN (SELECT id FROM entry_rtree '
+                   'WHERE min_lon >= ? AND max_lon <= ? AND min_lat >= ? AND max_lat <= ?) LIMIT ?')
+        else:
+            sql = (f'SELECT {_COLUMNS} FROM entry WHERE lon BETWEEN ? AND ? AND lat BETWEEN ? AND ? LIMIT ?')
+        rows = self._db.execute(sql, (min_lon, max_lon, min_lat, max_lat, limit)).fetchall()
+        return [Entry(*row) for row in rows]
+
+    def count(self):
+        return self._db.execute('SELECT COUNT(*) FROM entry').fetchone()[0]
+
+    def _prune(self):
+        """Drop the least recently used entries above max_entries."""
+        excess = self.count() - self.max_entries
+        if excess <= 0:
+            return
+        with self._db:
+            ids = [r[0] for r in self._db.execute('SELECT id FROM entry ORDER BY last_used LIMIT ?', (excess,))]
+            self._db.executemany('DELETE FROM entry WHERE id = ?', [(i,) for i in ids])
+            if self.rtree:
+                self._db.executemany('DELETE FROM entry_rtree WHERE id = ?', [(i,) for i in ids])
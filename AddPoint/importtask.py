@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+Background import of delimited coordinate files.
+
+The file is streamed line by line; lines are parsed with coordparse (same
+format / order / UTM zone semantics as the dock), transformed and written to
+the target layer in fixed-size chunks, so memory use does not depend on the
+file size. With workers > 1, files of at least PARALLEL_MIN_BYTES are parsed
+in worker processes (parallelparse) while this task writes the results.
+Grid references (MGRS) carry their own UTM zone: each chunk is grouped by
+zone and one transform per zone is built for the whole import.
+Memory layers cannot be reopened from their source and their provider is
+read by rendering and the attribute table without locking, so for them the
+task only builds the features: each chunk goes to the main thread through a
+queued signal and is added there, at most MAX_QUEUED_CHUNKS ahead.
+FileImportTask writes into a new GeoPackage/FlatGeobuf file (filewriter)
+instead of an existing layer.
+"""
+import os
+import threading
+
+from qgis.PyQt.QtCore import pyqtSignal
+from qgis.core import (
+    QgsTask,
+    QgsFeature,
+    QgsFields,
+    QgsGeometry,
+    QgsProject,
+    QgsPointXY,
+    QgsVectorLayer,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsMessageLog,
+    Qgis,
+)
+
+from . import coordparse
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_FAILURES = 100
+PARALLEL_MIN_BYTES = 16 << 20
+MAX_QUEUED_CHUNKS = 4
+
+
+class _MainThreadSink:
+    """Stands in for a memory provider in the task thread (see the module docstring)."""
+
+    def __init__(self, task):
+        self._task = task
+
+    def addFeatures(self, feats):
+        return self._task._queue_features(feats), feats
+
+    def errors(self):
+        return ['Import canceled'] if self._task.isCanceled() else []
+
+
+class CoordinateImportTask(QgsTask):
+    featuresReady = pyqtSignal(list)  # memory layers: a chunk to add on the main thread
+
+    def __init__(self, description, path, layer, fmt, order='EN',
+                 utm_epsg=coordparse.DEFAULT_UTM_EPSG, delimiter=None,
+                 encoding='utf-8', chunk_size=DEFAULT_CHUNK_SIZE, fast_projection=False,
+                 workers=1):
+        super().__init__(description, QgsTask.CanCancel)
+        self.path = path
+        self.fmt = fmt
+        self.order = order
+        self.utm_epsg = utm_epsg
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.fast_projection = fast_projection
+        self.workers = workers
+
+        self.layer = layer
+        self._main_thread_sink = False
+        if layer is not None:
+            self._dst_crs = QgsCoordinateReferenceSystem(layer.crs())
+            self._context = layer.transformContext()
+            self._fields = layer.fields()
+            self._source = layer.source()
+            self._provider_type = layer.providerType()
+            # Other providers get their own connection in the task thread
+            if self._provider_type == 'memory':
+                self._main_thread_sink = True
+                self._queued_chunks = threading.Semaphore(MAX_QUEUED_CHUNKS)
+                self.featuresReady.connect(self._add_features)
+
+        self.total = 0
+        self.added = 0
+        self.failed = 0
+        self.failures = []  # first MAX_REPORTED_FAILURES (line number, code)
+        self.exception = None
+
+    def run(self):
+        try:
+            return self._import()
+        except Exception as ex:
+            if not self.isCanceled():
+                self.exception = ex
+            return False
+
+    def _queue_features(self, feats):
+        # task thread: wait while the main thread is MAX_QUEUED_CHUNKS behind
+        while not self._queued_chunks.acquire(timeout=0.1):
+            if self.isCanceled():
+                return False
+        self.featuresReady.emit(feats)
+        return True
+
+    def _add_features(self, feats):
+        # main thread (queued connection)
+        self._queued_chunks.release()
+        if self.exception is not None:
+            return
+        try:
+            provider = self.layer.dataProvider()
+            ok, _ = provider.addFeatures(feats)
+            if not ok:
+                self.exception = RuntimeError('; '.join(provider.errors()) or 'addFeatures failed')
+        except RuntimeError as ex:
+            # layer was removed meanwhile
+            self.exception = ex
+        if self.exception is not None:
+            self.cancel()
+
+    def _open_provider(self):
+        if self._main_thread_sink:
+            return _MainThreadSink(self), None
+        layer = QgsVectorLayer(self._source, 'AddPoint import', self._provider_type)
+        if not layer.isValid():
+            raise RuntimeError(f"Cannot open layer source: {self._source}")
+        return layer.dataProvider(), layer
+
+    def _import(self):
+        # keep the private layer alive while its provider is used
+        provider, _own_layer = self._open_provider()
+        if self.fmt in coordparse.GRID_FORMATS:
+            return self._import_grid(provider)
+        src_epsg = coordparse.source_epsg(self.fmt, self.utm_epsg)
+        src_crs = QgsCoordinateReferenceSystem(src_epsg)
+        xform = QgsCoordinateTransform(src_crs, self._dst_crs, self._context)
+        engine = self._projection_engine(src_epsg, src_crs)
+
+        size = os.path.getsize(self.path) or 1
+        if self.workers > 1 and size >= PARALLEL_MIN_BYTES:
+            return self._import_parallel(provider, xform, engine, src_epsg)
+        read = 0
+        chunk = []
+        with open(self.path, 'rb') as f:
+            for line_no, raw in enumerate(f, start=1):
+                read += len(raw)
+                line = raw.decode(self.encoding, errors='replace').strip()
+                if not line:
+                    continue
+                self.total += 1
+                x_text, y_text = coordparse.split_line(line, self.order, self.delimiter)
+                if not x_text or not y_text:
+                    self._fail(line_no, coordparse.ERR_SPLIT)
+                    continue
+                res = coordparse.parse_pair(x_text, y_text, self.fmt, self.utm_epsg)
+                if res.code != coordparse.OK:
+                    self._fail(line_no, res.code)
+                    continue
+                chunk.append((res.x, res.y))
+
+                if len(chunk) >= self.chunk_size:
+                    self._write_chunk(provider, xform, engine, src_epsg, chunk)
+                    chunk = []
+                    self.setProgress(100.0 * read / size)
+                    if self.isCanceled():
+                        return False
+
+        if chunk:
+            self._write_chunk(provider, xform, engine, src_epsg, chunk)
+        self.setProgress(100.0)
+        return True
+
+    def _import_grid(self, provider):
+        from . import mgrs
+
+        transforms = {}  # auth id -> (xform, engine), built on first use
+        size = os.path.getsize(self.path) or 1
+        read = 0
+        chunk = []
+        with open(self.path, 'rb') as f:
+            for line_no, raw in enumerate(f, start=1):
+                read += len(raw)
+                line = raw.decode(self.encoding, errors='replace').strip()
+                if not line:
+                    continue
+                self.total += 1
+                res = mgrs.decode(line)
+                if res.code != coordparse.OK:
+                    self._fail(line_no, res.code)
+                    continue
+                chunk.append(res)
+
+                if len(chunk) >= self.chunk_size:
+                    self._write_zones(provider, transforms, chunk)
+                    chunk = []
+                    self.setProgress(100.0 * read / size)
+                    if self.isCanceled():
+                        return False
+
+        if chunk:
+            self._write_zones(provider, transforms, chunk)
+        self.setProgress(100.0)
+        return True
+
+    def _write_zones(self, provider, transforms, results):
+        """Write ParseResults grouped by source CRS."""
+        groups = {}
+        for res in results:
+            xs, ys = groups.setdefault(res.epsg, ([], []))
+            xs.append(res.x)
+            ys.append(res.y)
+        for src_epsg, (xs, ys) in groups.items():
+            if src_epsg not in transforms:
+                src_crs = QgsCoordinateReferenceSystem(src_epsg)
+                transforms[src_epsg] = (QgsCoordinateTransform(src_crs, self._dst_crs, self._context),
+                                        self._projection_engine(src_epsg, src_crs))
+            xform, engine = transforms[src_epsg]
+            self._write_arrays(provider, xform, engine, src_epsg, xs, ys)
+
+    def _import_parallel(self, provider, xform, engine, src_epsg):
+        from . import parallelparse
+
+        chunks = parallelparse.parse_file(self.path, self.fmt, self.order, self.utm_epsg,
+                                          self.delimiter, self.encoding, self.workers)
+        size = os.path.getsize(self.path) or 1
+        read = 0
+        try:
+            for chunk in chunks:
+                self.total += chunk.total
+                self.failed += chunk.failed
+                room = MAX_REPORTED_FAILURES - len(self.failures)
+                self.failures.extend(chunk.failures[:max(0, room)])
+                for i in range(0, len(chunk.xs), self.chunk_size):
+                    self._write_arrays(provider, xform, engine, src_epsg,
+                                       chunk.xs[i:i + self.chunk_size], chunk.ys[i:i + self.chunk_size])
+                    if self.isCanceled():
+                        return False
+                read += chunk.bytes
+                self.setProgress(100.0 * read / size)
+        finally:
+            # cancels the ranges still being parsed
+            chunks.close()
+        self.setProgress(100.0)
+        return True
+
+    def _fail(self, line_no, code):
+        self.failed += 1
+        if len(self.failures) < MAX_REPORTED_FAILURES:
+            self.failures.append((line_no, code))
+
+    def _projection_engine(self, src_epsg, src_crs):
+        """Built-in NumPy projection engine if usable for this import, else None."""
+        if not self.fast_projection:
+            return None
+        try:
+            from . import projection
+        except ImportError:  # NumPy not available
+            return None
+        if not (projection.supports(src_epsg) and projection.supports(self._dst_crs.authid())):
+            return None
+        if self._context.calculateCoordinateOperation(src_crs, self._dst_crs):
+            return None
+        return projection
+
+    def _write_chunk(self, provider, xform, engine, src_epsg, chunk):
+        self._write_arrays(provider, xform, engine, src_epsg,
+                           [p[0] for p in chunk], [p[1] for p in chunk])
+
+    def _write_arrays(self, provider, xform, engine, src_epsg, xs, ys):
+        if engine is not None:
+            xs, ys = engine.transform(src_epsg, self._dst_crs.authid(), xs, ys)
+            pts = [QgsPointXY(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+        else:
+            pts = [xform.transform(QgsPointXY(x, y)) for x, y in zip(xs, ys)]
+        feats = []
+        for pt in pts:
+            feat = QgsFeature(self._fields)
+            feat.setGeometry(QgsGeometry.fromPointXY(pt))
+            feats.append(feat)
+        ok, _ = provider.addFeatures(feats)
+        if not ok:
+            raise RuntimeError('; '.join(provider.errors()) or 'addFeatures failed')
+        self.added += len(feats)
+
+    def finished(self, result):
+        # Runs on the main thread
+        try:
+            if not self._main_thread_sink:
+                self.layer.dataProvider().reloadData()
+            self.layer.updateExtents()
+            self.layer.triggerRepaint()
+        except RuntimeError:
+            # layer was removed meanwhile
+            pass
+        if self.exception is not None:
+            QgsMessageLog.logMessage(f"Import failed: {self.exception}", 'AddPoint', Qgis.Critical)
+
+
+class FileImportTask(CoordinateImportTask):
+    """
+    Import into a new GeoPackage or FlatGeobuf file in the given CRS. All
+    features are streamed through one writer; the spatial index is built
+    when it is closed and the layer is added to the project when done.
+    A failed or canceled import removes the partial file.
+    """
+
+    def __init__(self, description, path, output_path, crs, transform_context, fmt,
+                 layer_name='AddPoint', **kwargs):
+        from .filewriter import driver_for_path
+
+        super().__init__(description, path, None, fmt, **kwargs)
+        self.output_path = output_path
+        self.layer_name = layer_name
+        self.driver = driver_for_path(output_path)
+        self.uri = None
+        self._dst_crs = QgsCoordinateReferenceSystem(crs)
+        self._context = transform_context
+        self._fields = QgsFields()
+        self._writer = None
+
+    def _open_provider(self):
+        from .filewriter import PointFileWriter
+
+        self._writer = PointFileWriter(self.output_path, self._dst_crs, self._context, self.driver,
+                                       self.layer_name, self._fields)
+        return self._writer, None
+
+    def run(self):
+        ok = super().run()
+        if self._writer is None:
+            return ok
+        if ok:
+            try:
+                self.uri = self._writer.close()
+            except Exception as ex:
+                self.exception = ex
+                ok = False
+        if not ok:
+            self._writer.discard()
+        return ok
+
+    def finished(self, result):
+        # Runs on the main thread
+        if result and self.uri:
+            layer = QgsVectorLayer(self.uri, self.layer_name, 'ogr')
+            if layer.isValid():
+                QgsProject.instance().addMapLayer(layer)
+                self.layer = layer
+            else:
+                self.exception = RuntimeError(f"Cannot open layer source: {self.uri}")
+        if self.exception is not None:
+            QgsMessageLog.logMessage(f"Import failed: {self.exception}", 'AddPoint', Qgis.Critical)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Per-stage timing of the parse -> transform -> insert pipeline.
+
+Durations are measured with time.perf_counter() and kept in rolling windows
+keyed by (stage, layer name, provider type). While disabled, stage() hands out
+one shared no-op context manager, so instrumented code pays a single attribute
+check per stage.
+"""
+import json
+import math
+import time
+from collections import deque
+
+STAGES = ('parse', 'crs_lookup', 'transform', 'dedup', 'feature_create', 'commit', 'repaint')
+DEFAULT_WINDOW = 1000
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('_stats', '_key', '_items', '_start')
+
+    def __init__(self, stats, key, items):
+        self._stats = stats
+        self._key = key
+        self._items = items
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._stats._add(self._key, time.perf_counter() - self._start, self._items)
+        return False
+
+
+class _Histogram:
+    __slots__ = ('samples', 'count', 'items', 'total')
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.items = 0
+        self.total = 0.0
+
+
+def _layer_key(layer):
+    if layer is None:
+        return '', ''
+    try:
+        return layer.name(), layer.providerType()
+    except RuntimeError:  # layer deleted
+        return '', ''
+
+
+def _percentile(ordered, q):
+    # nearest rank
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class StageStats:
+    def __init__(self, window=DEFAULT_WINDOW, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self._hist = {}
+
+    def stage(self, name, layer=None, items=1):
+        """Context manager timing one run of a stage (no-op while disabled)."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, (name,) + _layer_key(layer), items)
+
+    def record(self, name, seconds, layer=None, items=1):
+        if self.enabled:
+            self._add((name,) + _layer_key(layer), seconds, items)
+
+    def _add(self, key, seconds, items):
+        hist = self._hist.get(key)
+        if hist is None:
+            hist = self._hist[key] = _Histogram(self.window)
+        hist.samples.append(seconds)
+        hist.count += 1
+        hist.items += items
+        hist.total += seconds
+
+    def reset(self):
+        self._hist.clear()
+
+    def snapshot(self):
+        """
+        List of dicts per (stage, layer, provider): count and items since the
+        last reset, p50 / p95 / max in ms over the rolling window.
+        """
+        order = {name: i for i, name in enumerate(STAGES)}
+        rows = []
+        for (stage, layer, provider), hist in self._hist.items():
+            ordered = sorted(hist.samples)
+            rows.append({
+                'stage': stage,
+                'layer': layer,
+                'provider': provider,
+                'count': hist.count,
+                'items': hist.items,
+                'total_ms': hist.total * 1e3,
+                'p50_ms': _percentile(ordered, 0.50) * 1e3,
+                'p95_ms': _percentile(ordered, 0.95) * 1e3,
+                'max_ms': ordered[-1] * 1e3,
+            })
+        rows.sort(key=lambda r: (r['layer'], r['provider'], order.get(r['stage'], len(order)), r['stage']))
+        return rows
+
+    def to_json(self, indent=2, **extra):
+        """The snapshot as JSON; extra keyword values (other than None) are added as keys."""
+        data = {'window': self.window, 'stages': self.snapshot()}
+        data.update((key, value) for key, value in extra.items() if value is not None)
+        return json.dumps(data, indent=indent)
+
+    def format_table(self):
+        """Plain-text summary for the dock."""
+        lines = []
+        current = None
+        for r in self.snapshot():
+            group = (r['layer'], r['provider'])
+            if group != current:
+                current = group
+                lines.append(f"{r['layer'] or '-'} [{r['provider'] or '-'}]")
+            lines.append(f"  {r['stage']:<15}{r['count']:>7}  p50 {r['p50_ms']:9.3f}  "
+                         f"p95 {r['p95_ms']:9.3f}  max {r['max_ms']:9.3f} ms")
+        return '\n'.join(lines)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Live GNSS feed: NMEA sentences from a serial port, TCP socket or file/pty.
+
+A reader thread decodes sentences into a bounded queue; the GUI thread drains
+the queue from a QTimer and hands fixes to a write callback in batches (every
+``batch_size`` fixes or ``interval`` ms). When the queue is full the reader
+either drops the oldest fix ('drop') or starts keeping only every n-th fix
+('decimate'), so a fast receiver cannot stall QGIS.
+
+Sources:
+    tcp://host:port
+    serial://PORT[?baud=4800]     (needs pyserial)
+    anything else                 file, FIFO or pty path; regular files are
+                                  replayed at ``replay_hz`` fixes per second
+"""
+import os
+import queue
+import socket
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+from qgis.PyQt.QtCore import QObject, QTimer, pyqtSignal
+
+from . import nmea
+
+POLICY_DROP = 'drop'
+POLICY_DECIMATE = 'decimate'
+POLICIES = (POLICY_DROP, POLICY_DECIMATE)
+
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_INTERVAL = 1000  # ms
+DEFAULT_REPLAY_HZ = 10.0
+READ_TIMEOUT = 0.5  # s; how often blocking reads check for stop()
+RECV_SIZE = 4096
+MAX_DECIMATION = 64
+POLL_INTERVAL = 100  # ms
+
+
+class _LineSource:
+    """Line reader over a binary stream with close() from another thread."""
+
+    def __init__(self, stream, closer=None, pace=0.0, eof_on_empty=True):
+        self._stream = stream
+        self._closer = closer or stream.close
+        self.pace = pace  # seconds between fixes (file replay)
+        # serial ports return b'' on read timeout, everything else at the end
+        self.eof_on_empty = eof_on_empty
+
+    def readline(self):
+        return self._stream.readline()
+
+    def close(self):
+        try:
+            self._closer()
+        except OSError:
+            pass
+
+
+class _SocketSource(_LineSource):
+    """
+    Line reader over a TCP socket. Reads with recv() into its own buffer:
+    a file from socket.makefile() cannot be read again after one timeout,
+    which would end the feed of any receiver slower than READ_TIMEOUT.
+    """
+
+    def __init__(self, sock):
+        super().__init__(None, self._shutdown)
+        self._sock = sock
+        self._buffer = bytearray()
+
+    def readline(self):
+        while True:
+            end = self._buffer.find(b'\n')
+            if end >= 0:
+                line = bytes(self._buffer[:end + 1])
+                del self._buffer[:end + 1]
+                return line
+            chunk = self._sock.recv(RECV_SIZE)  # socket.timeout every READ_TIMEOUT
+            if not chunk:
+                line = bytes(self._buffer)
+                self._buffer.clear()
+                return line
+            self._buffer += chunk
+
+    def _shutdown(self):
+        # wakes a recv() blocked in the reader thread
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+def open_source(spec, replay_hz=DEFAULT_REPLAY_HZ):
+    """Open a source spec (see module docstring); returns a line source."""
+    spec = spec.strip()
+    url = urlsplit(spec)
+    if url.scheme == 'tcp':
+        sock = socket.create_connection((url.hostname, url.port), timeout=10)
+        sock.settimeout(READ_TIMEOUT)
+        return _SocketSource(sock)
+    if url.scheme == 'serial':
+        import serial  # pyserial; optional
+
+        port = (url.netloc + url.path) or url.path
+        baud = int(parse_qs(url.query).get('baud', ['4800'])[0])
+        port = serial.Serial(port, baud, timeout=READ_TIMEOUT)
+        return _LineSource(port, eof_on_empty=False)
+    regular = os.path.isfile(spec)
+    # unbuffered for pipes/ptys so each sentence is seen as soon as it arrives
+    stream = open(spec, 'rb') if regular else open(spec, 'rb', buffering=0)
+    pace = 1.0 / replay_hz if regular and replay_hz else 0.0
+    return _LineSource(stream, pace=pace)
+
+
+class _Reader(threading.Thread):
+    def __init__(self, source, fixes, policy):
+        super().__init__(name='AddPoint live feed', daemon=True)
+        self.source = source
+        self.fixes = fixes
+        self.policy = policy
+        self.stopping = threading.Event()
+        self.error = None
+        self.received = 0
+        self.dropped = 0
+        self.decimation = 1
+        self._last_utc = None
+
+    def run(self):
+        try:
+            self._read()
+        except Exception as ex:
+            if not self.stopping.is_set():
+                self.error = ex
+        finally:
+            self.source.close()
+
+    def _read(self):
+        while not self.stopping.is_set():
+            try:
+                raw = self.source.readline()
+            except socket.timeout:
+                continue
+            if not raw:
+                if self.source.eof_on_empty:
+                    return
+                continue
+            fix = nmea.parse_sentence(raw.decode('ascii', errors='replace'))
+            # GGA and RMC of the same epoch describe one position
+            if fix is None or fix.utc == self._last_utc:
+                continue
+            self._last_utc = fix.utc
+            self.received += 1
+            self._offer(fix)
+            if self.source.pace:
+                self.stopping.wait(self.source.pace)
+
+    def _offer(self, fix):
+        if self.policy == POLICY_DECIMATE:
+            if self.received % self.decimation:
+                self.dropped += 1
+                return
+            size = self.fixes.qsize()
+            if size > self.fixes.maxsize // 2:
+                self.decimation = min(MAX_DECIMATION, self.decimation * 2)
+            elif size < self.fixes.maxsize // 8 and self.decimation > 1:
+                self.decimation //= 2
+        while True:
+            try:
+                self.fixes.put_nowait(fix)
+                return
+            except queue.Full:
+                # drop the oldest; the newest position matters most
+                try:
+                    self.fixes.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class LiveFeed(QObject):
+    """
+    Runs a reader thread and writes its fixes in batches on the GUI thread.
+    write(points) receives a list of (lon, lat) in EPSG:4326 and returns True
+    on success.
+    """
+    fixesWritten = pyqtSignal(int)       # number written in this batch
+    stopped = pyqtSignal(str)            # error text, empty on normal end
+
+    def __init__(self, spec, write, batch_size=DEFAULT_BATCH_SIZE, interval=DEFAULT_INTERVAL,
+                 policy=POLICY_DROP, queue_size=DEFAULT_QUEUE_SIZE, replay_hz=DEFAULT_REPLAY_HZ, parent=None):
+        super().__init__(parent)
+        self.spec = spec
+        self.batch_size = batch_size
+        self.interval = interval
+        self.written = 0
+        self._write = write
+        self._policy = policy
+        self._replay_hz = replay_hz
+        self._fixes = queue.Queue(maxsize=queue_size)
+        self._pending = []
+        self._last_write = 0.0
+        self._reader = None
+        self._running = False
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(min(POLL_INTERVAL, max(1, interval)))
+        self._timer.timeout.connect(self._poll)
+
+    @property
+    def received(self):
+        return self._reader.received if self._reader else 0
+
+    @property
+    def dropped(self):
+        return self._reader.dropped if self._reader else 0
+
+    def start(self):
+        """Open the source and start reading; raises if the source cannot be opened."""
+        source = open_source(self.spec, self._replay_hz)
+        self._reader = _Reader(source, self._fixes, self._policy)
+        self._last_write = time.monotonic()
+        self._reader.start()
+        self._running = True
+        self._timer.start()
+
+    def stop(self, error=''):
+        """Stop reading and write what is still queued."""
+        if not self._running:
+            return
+        self._running = False
+        self._timer.stop()
+        self._reader.stopping.set()
+        self._reader.source.close()
+        self._reader.join(2 * READ_TIMEOUT)
+        self._drain()
+        self._flush()
+        self.stopped.emit(error)
+
+    def is_running(self):
+        return self._running
+
+    def _drain(self):
+        while True:
+            try:
+                fix = self._fixes.get_nowait()
+            except queue.Empty:
+                return
+            self._pending.append((fix.lon, fix.lat))
+
+    def _poll(self):
+        self._drain()
+        due = (time.monotonic() - self._last_write) * 1000.0 >= self.interval
+        if len(self._pending) >= self.batch_size or (due and self._pending):
+            self._flush()
+        if not self._reader.is_alive():
+            error = self._reader.error
+            self.stop(str(error) if error else '')
+
+    def _flush(self):
+        self._last_write = time.monotonic()
+        if not self._pending:
+            return
+        points, self._pending = self._pending, []
+        if self._write(points):
+            self.written += len(points)
+            self.fixesWritten.emit(len(points))
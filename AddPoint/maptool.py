@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Map tool with a live cursor readout and click-to-capture.
+
+Mouse moves only store the latest position; a single-shot timer at the
+display refresh interval turns it into text, so at most one transform and
+one formatting step run per frame however fast events arrive. Positions
+that were overtaken by a newer one before the timer fired are never
+transformed.
+"""
+from qgis.PyQt.QtCore import Qt, QTimer, pyqtSignal
+from qgis.PyQt.QtGui import QGuiApplication
+from qgis.gui import QgsMapTool
+
+DEFAULT_REFRESH_HZ = 60.0
+
+
+def refresh_interval():
+    """Milliseconds per frame of the primary screen (60 Hz if unknown)."""
+    screen = QGuiApplication.primaryScreen()
+    rate = screen.refreshRate() if screen is not None else 0.0
+    return max(1, int(round(1000.0 / (rate if rate > 1 else DEFAULT_REFRESH_HZ))))
+
+
+class CoordinateTool(QgsMapTool):
+    """
+    readout(map point) returns the text for a canvas position; it is called
+    at most once per refresh interval with the newest position.
+    """
+    readoutChanged = pyqtSignal(str)
+    pointCaptured = pyqtSignal(object)   # QgsPointXY in canvas CRS
+
+    def __init__(self, canvas, readout, interval=None):
+        super().__init__(canvas)
+        self._readout = readout
+        self._pending = None
+        self.moves = 0       # mouse move events received
+        self.updates = 0     # readouts computed
+        self.setCursor(Qt.CrossCursor)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval or refresh_interval())
+        self._timer.timeout.connect(self._update)
+
+    def canvasMoveEvent(self, event):
+        self.moves += 1
+        self._pending = event.mapPoint()
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def canvasReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        self.pointCaptured.emit(event.mapPoint())
+
+    def deactivate(self):
+        self._timer.stop()
+        self._pending = None
+        self.readoutChanged.emit('')
+        super().deactivate()
+
+    def refresh(self):
+        """Recompute the readout for the last position (e.g. after a format change)."""
+        if self._pending is not None and not self._timer.isActive():
+            self._timer.start()
+
+    def _update(self):
+        point = self._pending
+        if point is None:
+            return
+        self.updates += 1
+        try:
+            text = self._readout(point)
+        except Exception as ex:
+            text = str(ex)
+        self.readoutChanged.emit(text)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+MGRS grid references and compact UTM references ("33T 456789 5101234").
+
+Both carry the UTM zone and latitude band in the text, so every value comes
+with its own WGS84 / UTM auth id and no zone has to be chosen. Decoding is
+table driven: the 100 km column and row letters and the band minimum
+northings are tables built at import time, and the origin of each 100 km
+square (zone, band, column, row) is computed once and memoized, so a batch
+from one area costs one dictionary lookup per row. Polar (UPS) references
+are not supported. QGIS-free, like coordparse.
+"""
+import re
+from array import array
+
+from . import coordparse
+
+BAND_LETTERS = 'CDEFGHJKLMNPQRSTUVWX'   # 8° bands from 80°S, X is 12°
+COLUMN_LETTERS = ('ABCDEFGH', 'JKLMNPQR', 'STUVWXYZ')   # zone sets 1, 2, 3 (repeating)
+ROW_LETTERS = 'ABCDEFGHJKLMNPQRSTUV'    # 20 letters, shifted by 5 in even zones
+ROW_CYCLE = 2000000
+
+# Smallest northing (m, southern bands with the 10 000 km false northing)
+# reached anywhere in each band
+BAND_MIN_NORTHING = {
+    'C': 1100000, 'D': 2000000, 'E': 2800000, 'F': 3700000, 'G': 4600000,
+    'H': 5500000, 'J': 6400000, 'K': 7300000, 'L': 8200000, 'M': 9100000,
+    'N': 0, 'P': 800000, 'Q': 1700000, 'R': 2600000, 'S': 3500000,
+    'T': 4400000, 'U': 5300000, 'V': 6200000, 'W': 7000000, 'X': 7900000,
+}
+# northing span of a band; larger values are reported as outside the band
+_BAND_SPAN = {band: 1400000 if band == 'X' else 1000000 for band in BAND_LETTERS}
+
+# column letter -> easting of the square, per zone set
+_COLUMN_EASTING = {(zone_set, letter): (i + 1) * 100000
+                   for zone_set, letters in enumerate(COLUMN_LETTERS) for i, letter in enumerate(letters)}
+# row letter -> northing of the square modulo ROW_CYCLE, for odd (0) and even (1) zones
+_ROW_NORTHING = {(even, letter): (i - 5 * even) % 20 * 100000
+                 for even in (0, 1) for i, letter in enumerate(ROW_LETTERS)}
+
+_SQUARES = {}   # (zone, band, column, row) -> (epsg, easting, northing) or None
+
+_MGRS_RE = re.compile(r'^(\d{1,2})\s*([C-HJ-NP-X])\s*([A-HJ-NP-Z])\s*([A-HJ-NP-V])\s*(\d*)\s*(\d*)$')
+_UTM_RE = re.compile(r'^(\d{1,2})\s*([C-HJ-NP-X])[\s,;]+(\d+(?:\.\d*)?)[\s,;]+(\d+(?:\.\d*)?)$')
+
+_ERROR = coordparse.ParseResult(None, None, None, coordparse.ERR_PARSE_MGRS, coordparse.WARN_NONE)
+
+
+def zone_epsg(zone, band):
+    """WGS84 / UTM auth id of a zone; bands below N are in the southern hemisphere."""
+    return f"EPSG:{(32600 if band >= 'N' else 32700) + zone}"
+
+
+def grid_zone_epsg(lon, lat):
+    """
+    WGS84 / UTM auth id of the grid zone containing a WGS84 position, with
+    the MGRS exceptions: zone 32V is widened over south-west Norway and band
+    X has only zones 31, 33, 35 and 37 between 0° and 42°E (Svalbard).
+    """
+    zone = int((lon + 180.0) // 6.0) % 60 + 1
+    if 56.0 <= lat < 64.0 and 3.0 <= lon < 12.0:
+        zone = 32
+    elif 72.0 <= lat <= 84.0 and 0.0 <= lon < 42.0:
+        zone = 31 if lon < 9.0 else 33 if lon < 21.0 else 35 if lon < 33.0 else 37
+    return f"EPSG:{(32600 if lat >= 0 else 32700) + zone}"
+
+
+def _square(zone, band, column, row):
+    key = (zone, band, column, row)
+    try:
+        return _SQUARES[key]
+    except KeyError:
+        pass
+    easting = _COLUMN_EASTING.get(((zone - 1) % 3, column))
+    northing = _ROW_NORTHING.get((1 - zone % 2, row))
+    if easting is None or northing is None:
+        origin = None
+    else:
+        # the row letters repeat every 2000 km: take the cycle that reaches the band
+        while northing < BAND_MIN_NORTHING[band]:
+            northing += ROW_CYCLE
+        origin = (zone_epsg(zone, band), easting, northing)
+    _SQUARES[key] = origin
+    return origin
+
+
+def decode(text):
+    """
+    Decode an MGRS reference ("33TWM5678901234", "33T WM 56789 01234", 1 to 5
+    digits per axis) or a compact UTM reference ("33T 456789 5101234") into
+    a coordparse.ParseResult (easting, northing, UTM auth id). An MGRS value
+    is the south-west corner of the referenced square.
+    """
+    s = ' '.join((text or '').upper().split())
+    if not s:
+        return coordparse.ParseResult(None, None, None, coordparse.ERR_EMPTY, coordparse.WARN_NONE)
+    m = _MGRS_RE.match(s)
+    if m is not None:
+        zone = int(m.group(1))
+        if not 1 <= zone <= 60:
+            return _ERROR
+        digits_e, digits_n = m.group(5), m.group(6)
+        if not digits_n:
+            # run-together digits: first half easting, second half northing
+            if len(digits_e) % 2:
+                return _ERROR
+            half = len(digits_e) // 2
+            digits_e, digits_n = digits_e[:half], digits_e[half:]
+        if len(digits_e) != len(digits_n) or len(digits_e) > 5:
+            return _ERROR
+        origin = _square(zone, m.group(2), m.group(3), m.group(4))
+        if origin is None:
+            return _ERROR
+        epsg, easting, northing = origin
+        if digits_e:
+            scale = 10 ** (5 - len(digits_e))
+            easting += int(digits_e) * scale
+            northing += int(digits_n) * scale
+        return coordparse.ParseResult(float(easting), float(northing), epsg, coordparse.OK, coordparse.WARN_NONE)
+
+    m = _UTM_RE.match(s)
+    if m is None:
+        return _ERROR
+    zone = int(m.group(1))
+    band = m.group(2)
+    if not 1 <= zone <= 60:
+        return _ERROR
+    easting = float(m.group(3))
+    northing = float(m.group(4))
+    warning = coordparse.WARN_NONE
+    low = BAND_MIN_NORTHING[band]
+    if not (100000 <= easting <= 900000 and low <= northing < low + _BAND_SPAN[band]):
+        warning = coordparse.WARN_OUTSIDE_UTM
+    return coordparse.ParseResult(easting, northing, zone_epsg(zone, band), coordparse.OK, warning)
+
+
+def is_reference(text):
+    """True if text has the shape of an MGRS or zone/band UTM reference."""
+    s = ' '.join((text or '').upper().split())
+    return bool(_MGRS_RE.match(s) or _UTM_RE.match(s))
+
+
+def decode_many(texts):
+    """
+    Decode a batch. Returns (xs, ys, epsgs, codes, warnings): array('d')
+    values (NaN when rejected), the auth id of each row (None when
+    rejected) and array('B') status and warning codes.
+    """
+    xs = array('d')
+    ys = array('d')
+    epsgs = []
+    codes = array('B')
+    warnings = array('B')
+    nan = float('nan')
+    for text in texts:
+        res = decode(text)
+        if res.code == coordparse.OK:
+            xs.append(res.x)
+            ys.append(res.y)
+        else:
+            xs.append(nan)
+            ys.append(nan)
+        epsgs.append(res.epsg)
+        codes.append(res.code)
+        warnings.append(res.warning)
+    return xs, ys, epsgs, codes, warnings
+
+
+def group_by_epsg(epsgs, indexes=None):
+    """{auth id: [row index, ...]} in order of first appearance; rejected rows are skipped."""
+    groups = {}
+    for i in (range(len(epsgs)) if indexes is None else indexes):
+        epsg = epsgs[i]
+        if epsg is not None:
+            groups.setdefault(epsg, []).append(i)
+    return groups
+
+
+def band_letter(lat):
+    """Latitude band of a WGS84 latitude (80°S to 84°N), None outside."""
+    if not -80.0 <= lat <= 84.0:
+        return None
+    return BAND_LETTERS[min(int((lat + 80.0) // 8.0), len(BAND_LETTERS) - 1)]
+
+
+def encode(zone, lat, easting, northing, digits=5):
+    """MGRS reference of a UTM position (zone number, WGS84 latitude for the band)."""
+    band = band_letter(lat)
+    if band is None:
+        raise ValueError(f'Latitude {lat} is outside the UTM bands')
+    e = int(easting)
+    n = int(northing)
+    column = COLUMN_LETTERS[(zone - 1) % 3][e // 100000 - 1]
+    row = ROW_LETTERS[(n // 100000 + 5 * (1 - zone % 2)) % 20]
+    scale = 10 ** (5 - digits)
+    return (f'{zone:02d}{band}{column}{row} '
+            f'{e % 100000 // scale:0{digits}d} {n % 100000 // scale:0{digits}d}')
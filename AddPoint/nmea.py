@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Minimal NMEA 0183 decoding for GGA and RMC position sentences.
+
+Pure Python like coordparse. Sentences with a bad checksum, no fix (GGA
+quality 0, RMC status V) or unknown type decode to None.
+"""
+from collections import namedtuple
+
+Fix = namedtuple('Fix', 'lon lat utc kind')
+Fix.__doc__ = """
+lon/lat: WGS84 decimal degrees, utc: hhmmss(.ss) text as sent,
+kind: sentence type ('GGA' or 'RMC').
+"""
+
+
+def checksum_ok(sentence):
+    """True if there is no '*hh' checksum or it matches the XOR of the body."""
+    star = sentence.rfind('*')
+    if star < 0:
+        return True
+    try:
+        expected = int(sentence[star + 1:star + 3], 16)
+    except ValueError:
+        return False
+    value = 0
+    for c in sentence[1:star]:
+        value ^= ord(c)
+    return value == expected
+
+
+def _angle(value, hemi, deg_digits):
+    # ddmm.mmmm / dddmm.mmmm
+    if len(value) < deg_digits + 2:
+        return None
+    try:
+        deg = int(value[:deg_digits])
+        minutes = float(value[deg_digits:])
+    except ValueError:
+        return None
+    if minutes >= 60:
+        return None
+    angle = deg + minutes / 60.0
+    if hemi in ('S', 'W'):
+        return -angle
+    if hemi in ('N', 'E'):
+        return angle
+    return None
+
+
+def _position(lat, ns, lon, ew):
+    lat = _angle(lat, ns, 2)
+    lon = _angle(lon, ew, 3)
+    if lat is None or lon is None or abs(lat) > 90 or abs(lon) > 180:
+        return None
+    return lon, lat
+
+
+def parse_sentence(line):
+    """Decode one sentence ('$GPGGA,...*hh'); returns a Fix or None."""
+    line = line.strip()
+    if not line.startswith('$') or not checksum_ok(line):
+        return None
+    star = line.rfind('*')
+    fields = (line[1:star] if star >= 0 else line[1:]).split(',')
+    kind = fields[0][-3:]
+    if kind == 'GGA' and len(fields) >= 7:
+        if fields[6] in ('', '0'):
+            return None
+        pos = _position(fields[2], fields[3], fields[4], fields[5])
+    elif kind == 'RMC' and len(fields) >= 7:
+        if fields[2] != 'A':
+            return None
+        pos = _position(fields[3], fields[4], fields[5], fields[6])
+    else:
+        return None
+    if pos is None:
+        return None
+    return Fix(pos[0], pos[1], fields[1], kind)
+
+
+def format_sentence(body):
+    """'$' + body + '*hh' with the checksum filled in (for replay files)."""
+    value = 0
+    for c in body:
+        value ^= ord(c)
+    return f"${body}*{value:02X}"
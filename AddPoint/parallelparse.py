@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-process parsing of large coordinate files.
+
+The file is cut into byte ranges that end on line boundaries. Each range is
+parsed in a worker process (validation.validate_rows, so vectorparse for
+angle formats when NumPy is available) and the valid coordinates come back as float64 values in
+a shared memory block; only counts and the first failures are pickled.
+Ranges are at most MAX_CHUNK_BYTES (larger files get more ranges) and a
+worker parses its range in blocks of BLOCK_LINES lines, so worker memory
+does not grow with the file size.
+QGIS-free, so workers do not load QGIS.
+"""
+import multiprocessing
+import os
+import sys
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from . import coordparse, validation
+
+MIN_CHUNK_BYTES = 1 << 20
+MAX_CHUNK_BYTES = 32 << 20
+BLOCK_LINES = 20000
+CHUNKS_PER_WORKER = 4
+MAX_REPORTED_FAILURES = 100
+
+ChunkResult = namedtuple('ChunkResult', 'shm_name count total lines failed failures')
+Chunk = namedtuple('Chunk', 'xs ys total lines failed failures bytes')
+Chunk.__doc__ = """
+xs/ys: array('d') of parsed E/N values (source CRS), total: non-empty lines,
+lines: lines in the range, failed: lines that did not parse,
+failures: first (line number, code) pairs, numbered from 1 for the whole file,
+bytes: size of the range (for progress).
+"""
+
+
+def default_workers():
+    return max(1, min(8, (os.cpu_count() or 1) - 1))
+
+
+def chunk_ranges(path, n_chunks, min_bytes=MIN_CHUNK_BYTES, max_bytes=MAX_CHUNK_BYTES):
+    """
+    Split a file into (start, end) byte ranges aligned on line ends: about
+    n_chunks of them, more if ranges would exceed max_bytes.
+    """
+    size = os.path.getsize(path)
+    n_chunks = max(1, min(n_chunks, size // max(1, min_bytes)), -(-size // max(1, max_bytes)))
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, n_chunks):
+            pos = size * i // n_chunks
+            if pos <= bounds[-1]:
+                continue
+            f.seek(pos - 1)
+            f.readline()  # to the end of the line containing pos - 1
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _python_executable():
+    """Python interpreter for worker processes (sys.executable may be QGIS itself)."""
+    exe = sys.executable or ''
+    if os.path.basename(exe).lower().startswith('python'):
+        return exe
+    names = ('pythonw.exe', 'python.exe', 'python3.exe') if os.name == 'nt' else ('python3', 'python')
+    for folder in (sys.exec_prefix, os.path.join(sys.exec_prefix, 'bin')):
+        for name in names:
+            candidate = os.path.join(folder, name)
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def _mp_context():
+    # spawn: forking a process with QGIS threads running is not safe
+    ctx = multiprocessing.get_context('spawn')
+    exe = _python_executable()
+    if exe:
+        ctx.set_executable(exe)
+    return ctx
+
+
+def parse_range(path, start, end, fmt, order='EN', utm_epsg=coordparse.DEFAULT_UTM_EPSG,
+                delimiter=None, encoding='utf-8'):
+    """
+    Worker: parse the lines of path[start:end] into a new shared memory block
+    holding count E values followed by count N values (float64). The caller
+    owns the block (see read_result). Failure line numbers are 1-based
+    within the range.
+    """
+    xs = array('d')
+    ys = array('d')
+    failures = []
+    lines = 0
+    total = 0
+    with open(path, 'rb') as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            block = []
+            while pos < end and len(block) < BLOCK_LINES:
+                raw = f.readline()
+                if not raw:
+                    pos = end
+                    break
+                pos += len(raw)
+                block.append(raw.decode(encoding, errors='replace'))
+            result = validation.validate_rows(enumerate(block, start=lines + 1), fmt, order, utm_epsg, delimiter)
+            lines += len(block)
+            total += len(result)
+            for i, code in enumerate(result.codes):
+                if code == coordparse.OK:
+                    xs.append(result.xs[i])
+                    ys.append(result.ys[i])
+                elif len(failures) < MAX_REPORTED_FAILURES:
+                    failures.append((result.line_numbers[i], code))
+
+    count = len(xs)
+    name = None
+    if count:
+        shm = shared_memory.SharedMemory(create=True, size=count * 16)
+        shm.buf[:count * 8] = xs.tobytes()
+        shm.buf[count * 8:count * 16] = ys.tobytes()
+        name = shm.name
+        shm.close()
+    return ChunkResult(name, count, total, lines, total - count, failures)
+
+
+def read_result(result):
+    """Copy a worker's values out of shared memory and free the block; returns (xs, ys)."""
+    xs = array('d')
+    ys = array('d')
+    if result.shm_name is None:
+        return xs, ys
+    shm = shared_memory.SharedMemory(name=result.shm_name)
+    try:
+        n = result.count
+        xs.frombytes(shm.buf[:n * 8])
+        ys.frombytes(shm.buf[n * 8:n * 16])
+    finally:
+        shm.close()
+        shm.unlink()
+    return xs, ys
+
+
+def _discard(future):
+    if future.cancel() or future.exception() is not None:
+        return
+    name = future.result().shm_name
+    if name is not None:
+        shm = shared_memory.SharedMemory(name=name)
+        shm.close()
+        shm.unlink()
+
+
+def parse_file(path, fmt, order='EN', utm_epsg=coordparse.DEFAULT_UTM_EPSG, delimiter=None,
+               encoding='utf-8', workers=None, min_chunk_bytes=MIN_CHUNK_BYTES):
+    """
+    Parse a file with a pool of worker processes. Yields one Chunk per byte
+    range in file order while later ranges are still being parsed; at most
+    2 * workers parsed ranges are held at a time. Closing the generator
+    cancels the remaining work.
+    """
+    workers = workers or default_workers()
+    ranges = deque(chunk_ranges(path, workers * CHUNKS_PER_WORKER, min_chunk_bytes))
+    pending = deque()
+    first_line = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+        try:
+            while ranges or pending:
+                while ranges and len(pending) < 2 * workers:
+                    start, end = ranges.popleft()
+                    future = pool.submit(parse_range, path, start, end, fmt, order, utm_epsg,
+                                         delimiter, encoding)
+                    pending.append((future, end - start))
+                future, size = pending.popleft()
+                result = future.result()
+                xs, ys = read_result(result)
+                failures = [(first_line + n, code) for n, code in result.failures]
+                first_line += result.lines
+                yield Chunk(xs, ys, result.total, result.lines, result.failed, failures, size)
+        finally:
+            for future, _size in pending:
+                _discard(future)
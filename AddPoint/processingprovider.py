@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Processing provider exposing the AddPoint algorithms.
+"""
+from qgis.core import QgsProcessingProvider
+
+
+class AddPointProvider(QgsProcessingProvider):
+    def id(self):
+        return 'addpoint'
+
+    def name(self):
+        return 'AddPoint'
+
+    def longName(self):
+        return 'AddPoint coordinate tools'
+
+    def loadAlgorithms(self):
+        # imported here so registering the provider stays cheap at startup
+        from .algorithms import AppendCoordinatesAlgorithm, PointsFromTextAlgorithm
+
+        self.addAlgorithm(PointsFromTextAlgorithm())
+        self.addAlgorithm(AppendCoordinatesAlgorithm())
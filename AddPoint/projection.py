@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized projection engine for the CRSs the plugin supports.
+
+Covers WGS84 geographic (EPSG:4326), D96/TM (EPSG:3794), Web Mercator
+(EPSG:3857) and WGS84 / UTM zones 1-60 N/S (EPSG:32601-32660, 32701-32760).
+Transverse Mercator uses the 6th order Krüger series (Karney 2011), which is
+accurate to a few nanometres within a zone, so whole arrays can be projected
+without one PROJ call per point. D96 (ETRS89) is treated as identical to
+WGS84, which is what PROJ does for this pair without a grid.
+"""
+import math
+
+import numpy as np
+
+_WGS84 = (6378137.0, 1 / 298.257223563)
+_GRS80 = (6378137.0, 1 / 298.257222101)
+
+
+class _TransverseMercator:
+    def __init__(self, ellipsoid, lon0, k0, false_easting, false_northing):
+        a, f = ellipsoid
+        n = f / (2 - f)
+        self.lon0 = math.radians(lon0)
+        self.k0 = k0
+        self.fe = false_easting
+        self.fn = false_northing
+        self.e = math.sqrt(f * (2 - f))
+        n2, n3, n4, n5, n6 = n ** 2, n ** 3, n ** 4, n ** 5, n ** 6
+        self.A = a / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+        self.alpha = (
+            n / 2 - 2 * n2 / 3 + 5 * n3 / 16 + 41 * n4 / 180 - 127 * n5 / 288 + 7891 * n6 / 37800,
+            13 * n2 / 48 - 3 * n3 / 5 + 557 * n4 / 1440 + 281 * n5 / 630 - 1983433 * n6 / 1935360,
+            61 * n3 / 240 - 103 * n4 / 140 + 15061 * n5 / 26880 + 167603 * n6 / 181440,
+            49561 * n4 / 161280 - 179 * n5 / 168 + 6601661 * n6 / 7257600,
+            34729 * n5 / 80640 - 3418889 * n6 / 1995840,
+            212378941 * n6 / 319334400,
+        )
+        self.beta = (
+            n / 2 - 2 * n2 / 3 + 37 * n3 / 96 - n4 / 360 - 81 * n5 / 512 + 96199 * n6 / 604800,
+            n2 / 48 + n3 / 15 - 437 * n4 / 1440 + 46 * n5 / 105 - 1118711 * n6 / 3870720,
+            17 * n3 / 480 - 37 * n4 / 840 - 209 * n5 / 4480 + 5569 * n6 / 90720,
+            4397 * n4 / 161280 - 11 * n5 / 504 - 830251 * n6 / 7257600,
+            4583 * n5 / 161280 - 108847 * n6 / 3991680,
+            20648693 * n6 / 638668800,
+        )
+
+    def forward(self, lon, lat):
+        e = self.e
+        phi = np.radians(lat)
+        lam = np.radians(lon) - self.lon0
+        tau = np.tan(phi)
+        sigma = np.sinh(e * np.arctanh(e * tau / np.sqrt(1 + tau * tau)))
+        tau_p = tau * np.sqrt(1 + sigma * sigma) - sigma * np.sqrt(1 + tau * tau)
+        xi_p = np.arctan2(tau_p, np.cos(lam))
+        eta_p = np.arcsinh(np.sin(lam) / np.sqrt(tau_p * tau_p + np.cos(lam) ** 2))
+        xi = xi_p.copy()
+        eta = eta_p.copy()
+        for j, a_j in enumerate(self.alpha, start=1):
+            xi += a_j * np.sin(2 * j * xi_p) * np.cosh(2 * j * eta_p)
+            eta += a_j * np.cos(2 * j * xi_p) * np.sinh(2 * j * eta_p)
+        x = self.fe + self.k0 * self.A * eta
+        y = self.fn + self.k0 * self.A * xi
+        return x, y
+
+    def inverse(self, x, y):
+        e = self.e
+        xi = (np.asarray(y, dtype=float) - self.fn) / (self.k0 * self.A)
+        eta = (np.asarray(x, dtype=float) - self.fe) / (self.k0 * self.A)
+        xi_p = xi.copy()
+        eta_p = eta.copy()
+        for j, b_j in enumerate(self.beta, start=1):
+            xi_p -= b_j * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+            eta_p -= b_j * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+        sinh_eta = np.sinh(eta_p)
+        sin_xi = np.sin(xi_p)
+        cos_xi = np.cos(xi_p)
+        tau_p = sin_xi / np.sqrt(sinh_eta * sinh_eta + cos_xi * cos_xi)
+        lam = np.arctan2(sinh_eta, cos_xi)
+
+        # Newton iteration for tau from tau' (converges in 2-3 steps)
+        tau = tau_p.copy()
+        for _ in range(5):
+            sigma = np.sinh(e * np.arctanh(e * tau / np.sqrt(1 + tau * tau)))
+            tau_i = tau * np.sqrt(1 + sigma * sigma) - sigma * np.sqrt(1 + tau * tau)
+            d_tau = ((tau_p - tau_i) / np.sqrt(1 + tau_i * tau_i)
+                     * (1 + (1 - e * e) * tau * tau) / ((1 - e * e) * np.sqrt(1 + tau * tau)))
+            tau = tau + d_tau
+        lat = np.degrees(np.arctan(tau))
+        lon = np.degrees(lam + self.lon0)
+        return lon, lat
+
+
+class _WebMercator:
+    R = 6378137.0
+
+    def forward(self, lon, lat):
+        x = self.R * np.radians(lon)
+        y = self.R * np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+        return x, y
+
+    def inverse(self, x, y):
+        lon = np.degrees(np.asarray(x, dtype=float) / self.R)
+        lat = np.degrees(2 * np.arctan(np.exp(np.asarray(y, dtype=float) / self.R)) - np.pi / 2)
+        return lon, lat
+
+
+_PROJECTIONS = {}
+
+
+def _projection(authid):
+    """Projection object for an auth id, None for EPSG:4326, KeyError if unsupported."""
+    authid = authid.upper()
+    if authid == 'EPSG:4326':
+        return None
+    proj = _PROJECTIONS.get(authid)
+    if proj is not None:
+        return proj
+    code = int(authid[5:]) if authid.startswith('EPSG:') and authid[5:].isdigit() else 0
+    if code == 3794:
+        proj = _TransverseMercator(_GRS80, 15.0, 0.9999, 500000.0, -5000000.0)
+    elif code == 3857:
+        proj = _WebMercator()
+    elif 32601 <= code <= 32660 or 32701 <= code <= 32760:
+        zone = code % 100
+        proj = _TransverseMercator(_WGS84, zone * 6 - 183.0, 0.9996, 500000.0,
+                                   0.0 if code < 32700 else 10000000.0)
+    else:
+        raise KeyError(authid)
+    _PROJECTIONS[authid] = proj
+    return proj
+
+
+def supports(authid):
+    """True if authid can be handled by this engine."""
+    try:
+        _projection(authid or '')
+    except KeyError:
+        return False
+    return True
+
+
+def transform(src_authid, dst_authid, x, y):
+    """
+    Transform coordinate arrays between two supported CRSs.
+    Returns float64 arrays (x, y); lon/lat order for EPSG:4326.
+    """
+    src = _projection(src_authid)
+    dst = _projection(dst_authid)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if src_authid.upper() == dst_authid.upper():
+        return x.copy(), y.copy()
+    lon, lat = (x, y) if src is None else src.inverse(x, y)
+    if dst is None:
+        return np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)
+    return dst.forward(lon, lat)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Coalesced layer repaints.
+
+Inserting points one by one used to redraw the whole layer per point. Repaint
+requests are now collected per layer together with the extent of the new
+points and served by one debounce timer; a layer is only redrawn if that
+extent is inside the view of at least one open map canvas (or the extent is
+unknown, or a view that cannot be checked, such as a 3D view, is open). QGIS
+cannot redraw part of a layer, so the check decides between a full redraw
+and none.
+"""
+from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsRectangle
+
+DEFAULT_DELAY = 150   # ms of quiet before repainting
+DEFAULT_MAX_WAIT = 1000   # ms; repaint at the latest after this during continuous input
+SYMBOL_MARGIN_PX = 32
+
+
+def points_extent(points):
+    """Bounding QgsRectangle of QgsPointXY objects (None if empty)."""
+    if not points:
+        return None
+    xs = [p.x() for p in points]
+    ys = [p.y() for p in points]
+    return QgsRectangle(min(xs), min(ys), max(xs), max(ys))
+
+
+class RepaintCoalescer(QObject):
+    """
+    views() returns the open map canvases (main canvas and secondary map
+    views), or None when a view is open that cannot be checked.
+    """
+
+    def __init__(self, views, delay=DEFAULT_DELAY, max_wait=DEFAULT_MAX_WAIT, stats=None, parent=None):
+        super().__init__(parent)
+        self._views = views
+        self._stats = stats
+        self._pending = {}  # layer id -> (layer, extent in layer CRS or None)
+        self._waited = 0
+
+        self._delay = delay
+        self._max_wait = max_wait
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+        self.requested = 0
+        self.repainted = 0
+        self.skipped = 0
+
+    def request(self, layer, extent=None):
+        """
+        Schedule a repaint of layer; extent (layer CRS) is the area that
+        changed. Requests for the same layer are merged.
+        """
+        self.requested += 1
+        layer_id = layer.id()
+        pending = self._pending.get(layer_id)
+        if pending is not None:
+            known = pending[1]
+            if known is None or extent is None:
+                extent = None
+            else:
+                merged = QgsRectangle(known)
+                merged.combineExtentWith(extent)
+                extent = merged
+        self._pending[layer_id] = (layer, extent)
+
+        # debounce, but do not starve the canvas during continuous input
+        if self._timer.isActive():
+            self._waited += self._timer.interval() - self._timer.remainingTime()
+        if self._waited + self._delay > self._max_wait:
+            self._timer.start(max(0, self._max_wait - self._waited))
+        else:
+            self._timer.start(self._delay)
+
+    def flush(self):
+        """Serve all pending repaints now."""
+        self._timer.stop()
+        self._waited = 0
+        pending, self._pending = self._pending, {}
+        for layer, extent in pending.values():
+            try:
+                if self._in_view(layer, extent):
+                    if self._stats is not None:
+                        with self._stats.stage('repaint', layer):
+                            layer.triggerRepaint()
+                    else:
+                        layer.triggerRepaint()
+                    self.repainted += 1
+                else:
+                    self.skipped += 1
+            except RuntimeError:
+                # layer was deleted meanwhile
+                pass
+
+    def close(self):
+        self.flush()
+
+    def _on_timeout(self):
+        self.flush()
+
+    def _in_view(self, layer, extent):
+        if extent is None:
+            return True
+        canvases = self._views()
+        if canvases is None:
+            return True
+        return any(self._in_canvas(canvas, layer, extent) for canvas in canvases)
+
+    @staticmethod
+    def _in_canvas(canvas, layer, extent):
+        if layer.id() not in {l.id() for l in canvas.layers()}:
+            return False
+        if layer.hasScaleBasedVisibility() and not layer.isInScaleRange(canvas.scale()):
+            return False
+        settings = canvas.mapSettings()
+        area = settings.layerExtentToOutputExtent(layer, extent)
+        # symbols reach past the point itself
+        margin = SYMBOL_MARGIN_PX * settings.mapUnitsPerPixel()
+        area.grow(margin)
+        return canvas.extent().intersects(area)
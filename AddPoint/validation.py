@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Batch validation with per-row status codes.
+
+validate_rows() never raises and builds no text: every non-empty row gets a
+coordparse status code and warning code in compact arrays. Localized text
+is rendered on demand (message()) from the plugin's LANG table, once per
+row that is actually shown. QGIS-free, like coordparse.
+"""
+from array import array
+
+from . import coordparse
+
+NAN = float('nan')
+
+
+def parse_columns(e_texts, n_texts, fmt, utm_epsg=coordparse.DEFAULT_UTM_EPSG):
+    """
+    Parse parallel E/N text lists. Returns (xs, ys, codes, warnings), one
+    entry per pair; rejected pairs have NaN values. Angle formats go through
+    vectorparse when NumPy is available.
+    """
+    n = len(e_texts)
+    if fmt in coordparse.ANGLE_FORMATS and n:
+        try:
+            from . import vectorparse
+        except ImportError:  # NumPy not available
+            vectorparse = None
+        if vectorparse is not None:
+            lon, lat, codes = vectorparse.parse_columns_codes(e_texts, n_texts, fmt)
+            xs = array('d', lon.tobytes())
+            ys = array('d', lat.tobytes())
+            return xs, ys, array('B', codes.astype('uint8').tobytes()), array('B', bytes(n))
+    xs = array('d')
+    ys = array('d')
+    codes = array('B')
+    warnings = array('B')
+    for e_text, n_text in zip(e_texts, n_texts):
+        res = coordparse.parse_pair(e_text, n_text, fmt, utm_epsg)
+        if res.code == coordparse.OK:
+            xs.append(res.x)
+            ys.append(res.y)
+        else:
+            xs.append(NAN)
+            ys.append(NAN)
+        codes.append(res.code)
+        warnings.append(res.warning)
+    return xs, ys, codes, warnings
+
+
+class Validation:
+    """
+    Outcome of a batch, as parallel arrays over its non-empty rows:
+    line_numbers (1-based), codes and warnings (coordparse codes), xs/ys
+    (source CRS values, NaN when rejected) and texts (the row text).
+    Grid formats (MGRS) have no common source CRS: epsg is None and epsgs
+    holds the auth id of each row.
+    """
+
+    def __init__(self, fmt, epsg, line_numbers, texts, codes, warnings, xs, ys, epsgs=None):
+        self.fmt = fmt
+        self.epsg = epsg
+        self.epsgs = epsgs
+        self.line_numbers = line_numbers
+        self.texts = texts
+        self.codes = codes
+        self.warnings = warnings
+        self.xs = xs
+        self.ys = ys
+
+    def __len__(self):
+        return len(self.codes)
+
+    def accepted(self):
+        """Indexes of rows that parsed."""
+        return [i for i, code in enumerate(self.codes) if code == coordparse.OK]
+
+    def rejected(self):
+        """Indexes of rows that did not parse."""
+        return [i for i, code in enumerate(self.codes) if code != coordparse.OK]
+
+    def warned(self):
+        """Indexes of accepted rows with a warning (e.g. outside the typical range)."""
+        return [i for i, w in enumerate(self.warnings) if w != coordparse.WARN_NONE]
+
+    def points(self):
+        """(x, y) of the accepted rows."""
+        xs = self.xs
+        ys = self.ys
+        return [(xs[i], ys[i]) for i in self.accepted()]
+
+    def points_by_epsg(self):
+        """[(auth id, [(x, y), ...])] of the accepted rows, one entry per source CRS."""
+        if self.epsgs is None:
+            return [(self.epsg, self.points())] if self.accepted() else []
+        from .mgrs import group_by_epsg
+
+        xs = self.xs
+        ys = self.ys
+        return [(epsg, [(xs[i], ys[i]) for i in rows])
+                for epsg, rows in group_by_epsg(self.epsgs, self.accepted()).items()]
+
+    def counts(self):
+        """{status code: number of rows}."""
+        counts = {}
+        for code in self.codes:
+            counts[code] = counts.get(code, 0) + 1
+        return counts
+
+    def message(self, i, table):
+        """Localized text of row i from a LANG table; empty for a clean row."""
+        code = self.codes[i]
+        if code != coordparse.OK:
+            return table[coordparse.MESSAGE_KEYS[code]]
+        warning = self.warnings[i]
+        if warning != coordparse.WARN_NONE:
+            return table[coordparse.WARNING_KEYS[warning]].format(x=self.xs[i], y=self.ys[i])
+        return ''
+
+
+def validate_rows(rows, fmt='DD', order='EN', utm_epsg=coordparse.DEFAULT_UTM_EPSG, delimiter=None):
+    """Validate (line number, text) rows; empty rows are skipped. Returns a Validation."""
+    line_numbers = array('I')
+    texts = []
+    e_texts = []
+    n_texts = []
+    split_failed = []
+    grid = fmt in coordparse.GRID_FORMATS
+    for line_no, text in rows:
+        text = text.strip()
+        if not text:
+            continue
+        if grid:
+            # one reference per line, zone and band included
+            line_numbers.append(line_no)
+            texts.append(text)
+            continue
+        e_text, n_text = coordparse.split_line(text, order, delimiter)
+        if not e_text or not n_text:
+            split_failed.append(len(texts))
+            e_text = n_text = ''
+        line_numbers.append(line_no)
+        texts.append(text)
+        e_texts.append(e_text)
+        n_texts.append(n_text)
+
+    if grid:
+        from . import mgrs
+
+        xs, ys, epsgs, codes, warnings = mgrs.decode_many(texts)
+        return Validation(fmt, None, line_numbers, texts, codes, warnings, xs, ys, epsgs)
+    xs, ys, codes, warnings = parse_columns(e_texts, n_texts, fmt, utm_epsg)
+    for i in split_failed:
+        codes[i] = coordparse.ERR_SPLIT
+    return Validation(fmt, coordparse.source_epsg(fmt, utm_epsg), line_numbers, texts, codes, warnings, xs, ys)
+
+
+def validate_text(text, fmt='DD', order='EN', utm_epsg=coordparse.DEFAULT_UTM_EPSG, delimiter=None):
+    """Validate multi-line text, one coordinate pair per line."""
+    return validate_rows(enumerate((text or '').splitlines(), start=1), fmt, order, utm_epsg, delimiter)
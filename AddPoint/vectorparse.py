@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+NumPy batch parser for DD/DDM/DMS columns.
+
+Applies the same rules as coordparse.parse_angle / parse_pair (hemisphere
+letters, sign, minute/second/degree bounds) to whole arrays at once. Strings
+are processed as a 2D array of code points; rows that contain anything outside
+the fast path (unknown characters, tokens that are not plain decimal numbers)
+are handed to coordparse one by one, so results always match the scalar path.
+(NumPy string arrays cannot hold trailing NUL characters; such inputs are
+seen without them.)
+"""
+import numpy as np
+
+from . import coordparse
+
+# Character classes, looked up through a table indexed by code point
+_C_UNKNOWN, _C_PAD, _C_SEP, _C_HEMI, _C_DIGIT, _C_DOT, _C_SIGN = range(7)
+
+
+def _build_classes():
+    table = np.full(0x2034 + 1, _C_UNKNOWN, dtype=np.uint8)
+    # whitespace, °, ', ", ′, ″, ’, “, ”, ;, :
+    for c in '\t\n\x0b\x0c\r \'";:°’“”′″':
+        table[ord(c)] = _C_SEP
+    for c in 'NSEWnsew':
+        table[ord(c)] = _C_HEMI
+    table[ord('0'):ord('9') + 1] = _C_DIGIT
+    table[ord('.')] = _C_DOT
+    table[ord(',')] = _C_DOT  # decimal comma
+    table[ord('+')] = _C_SIGN
+    table[ord('-')] = _C_SIGN
+    # 0 pads fixed-width NumPy strings; the last entry catches everything else
+    table[0] = _C_PAD
+    table[-1] = _C_UNKNOWN
+    return table
+
+
+_CLASSES = _build_classes()
+_WHITESPACE_CLASS = np.zeros(0x2034 + 1, dtype=bool)
+_WHITESPACE_CLASS[[0, 9, 10, 11, 12, 13, 32]] = True
+
+_MIN_TOKENS = {'DD': 1, 'DDM': 2, 'DMS': 3}
+_PARSE_ERRORS = {'DD': coordparse.ERR_PARSE_DD,
+                 'DDM': coordparse.ERR_PARSE_DDM,
+                 'DMS': coordparse.ERR_PARSE_DMS}
+
+
+def fixed_width_columns(buffer, record_width, e_span, n_span):
+    """
+    Cut E and N columns out of a fixed-width byte buffer (e.g. a field log
+    read with one ``read()``). Spans are (start, stop) byte offsets inside a
+    record; record_width includes any line terminator.
+    Returns two NumPy bytes arrays usable with parse_columns().
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    raw = raw[:raw.size - raw.size % record_width].reshape(-1, record_width)
+    return (_rows_as_bytes(raw[:, e_span[0]:e_span[1]]),
+            _rows_as_bytes(raw[:, n_span[0]:n_span[1]]))
+
+
+def _rows_as_bytes(block):
+    block = np.ascontiguousarray(block)
+    return block.view(f'S{block.shape[1]}').ravel()
+
+
+def _as_array(values):
+    arr = np.asarray(values)
+    if arr.dtype.kind == 'O':
+        arr = np.array(['' if v is None else str(v) for v in arr.ravel()], dtype='U')
+    elif arr.dtype.kind not in ('U', 'S'):
+        arr = arr.astype('U')
+    arr = arr.ravel()
+    if arr.dtype.kind == 'S':
+        width = arr.dtype.itemsize
+        cp = np.ascontiguousarray(arr).view(np.uint8).reshape(arr.size, width)
+        if (cp >= 0x80).any():
+            arr = np.char.decode(arr, 'utf-8', 'replace')
+        else:
+            return arr, cp.astype(np.uint32)
+    width = arr.dtype.itemsize // 4
+    cp = np.ascontiguousarray(arr).view(np.uint32).reshape(arr.size, width)
+    return arr, cp
+
+
+def _row_text(arr, i):
+    v = arr[i]
+    return v.decode('utf-8', 'replace') if isinstance(v, bytes) else str(v)
+
+
+def _angle_core(cp, kind, fmt):
+    """
+    Vectorized parse of a code point matrix.
+    Returns (values, codes, fallback, empty); rows flagged in ``fallback``
+    must be parsed with coordparse.
+    """
+    n, w = cp.shape
+    values = np.full(n, np.nan)
+    codes = np.full(n, coordparse.OK, dtype=np.uint8)
+    if w == 0 or n == 0:
+        return values, codes, np.zeros(n, dtype=bool), np.ones(n, dtype=bool)
+
+    clipped = np.minimum(cp, _CLASSES.size - 1)
+    cls = _CLASSES[clipped]
+    empty = _WHITESPACE_CLASS[clipped].all(axis=1)
+    fallback = (cls == _C_UNKNOWN).any(axis=1)
+
+    # NUL inside a string (not padding) is not a separator for str.split()
+    used = cls != _C_PAD
+    last_used = np.where(used.any(axis=1), w - np.argmax(used[:, ::-1], axis=1), 0)
+    fallback |= used.sum(axis=1) != last_used
+
+    # Hemisphere = last N/S/E/W letter; letters are removed, not separators
+    chars = cp.astype(np.uint8)
+    is_hemi = cls == _C_HEMI
+    last_hemi = np.where(is_hemi, np.arange(w, dtype=np.int32), -1).max(axis=1)
+    hemi = np.where(last_hemi >= 0, chars[np.arange(n), np.maximum(last_hemi, 0)] & 0xDF, 0)
+    # Only letters glued between number characters ("14E30" -> "1430")
+    # change the tokens; compact just the rows where that happens.
+    glue = (cls == _C_HEMI) | (cls >= _C_DIGIT)
+    glued = np.zeros(n, dtype=bool)
+    if w > 2:
+        glued = (is_hemi[:, 1:-1] & glue[:, :-2] & glue[:, 2:]).any(axis=1)
+    if glued.any():
+        sub = np.flatnonzero(glued)
+        keep = ~is_hemi[sub]
+        pos = np.cumsum(keep, axis=1, dtype=np.int32) - 1
+        rows, cols = np.nonzero(keep)
+        dest = pos[rows, cols]
+        packed_cls = np.full((sub.size, w), _C_PAD, dtype=np.uint8)
+        packed_cls[rows, dest] = cls[sub][rows, cols]
+        packed_chars = np.zeros((sub.size, w), dtype=np.uint8)
+        packed_chars[rows, dest] = chars[sub][rows, cols]
+        cls[sub] = packed_cls
+        chars[sub] = packed_chars
+
+    # Tokens = runs of number characters; a padding column keeps rows apart
+    padded = np.full((n, w + 1), _C_PAD, dtype=np.uint8)
+    padded[:, :w] = cls
+    flat = padded.ravel()
+    tok = flat >= _C_DIGIT
+    edge = np.empty(tok.size + 1, dtype=bool)
+    edge[0] = tok[0]
+    np.not_equal(tok[1:], tok[:-1], out=edge[1:-1])
+    edge[-1] = tok[-1]
+    bounds = np.flatnonzero(edge)
+    starts = bounds[0::2]
+    ends = bounds[1::2] - 1
+    tok_row = starts // (w + 1)
+
+    acc = np.int32 if flat.size < 2 ** 31 else np.int64
+
+    def _count(mask):
+        c = np.cumsum(mask, dtype=acc)
+        return c[ends] - c[starts] + mask[starts]
+
+    # float() accepts a leading sign and one decimal point, and needs a digit
+    inner_sign = (flat[1:] == _C_SIGN) & tok[:-1]
+    fallback[np.flatnonzero(inner_sign) // (w + 1)] = True
+    digits = _count(flat == _C_DIGIT)
+    dots = _count(flat == _C_DOT)
+    fallback[tok_row[(digits == 0) | (dots > 1)]] = True
+
+    need = _MIN_TOKENS[fmt]
+    count = np.bincount(tok_row, minlength=n)
+    first = np.searchsorted(tok_row, np.arange(n))
+    rank = np.arange(starts.size) - first[tok_row]
+    sel = (rank < need) & ~fallback[tok_row]
+
+    nums = np.zeros((n, 3))
+    if sel.any():
+        s_sel = starts[sel]
+        lengths = ends[sel] - s_sel + 1
+        width = int(lengths.max())
+        flat_chars = np.zeros((n, w + 1), dtype=np.uint8)
+        flat_chars[:, :w] = chars
+        flat_chars = flat_chars.ravel()
+        flat_chars[flat_chars == 44] = 46
+        offs = np.arange(width)
+        idx = np.minimum(s_sel[:, None] + offs, flat_chars.size - 1)
+        token_bytes = np.where(offs < lengths[:, None], flat_chars[idx], 0).astype(np.uint8)
+        parsed = token_bytes.view(f'S{width}').ravel().astype(np.float64)
+        nums[tok_row[sel], rank[sel]] = parsed
+
+    deg = nums[:, 0]
+    abs_m = np.abs(nums[:, 1])
+    abs_s = np.abs(nums[:, 2])
+
+    codes[count < need] = _PARSE_ERRORS[fmt]
+    ok = codes == coordparse.OK
+    if need > 1:
+        codes[ok & ~((0 <= abs_m) & (abs_m < 60))] = coordparse.ERR_MINUTES
+        ok = codes == coordparse.OK
+    if need > 2:
+        codes[ok & ~((0 <= abs_s) & (abs_s < 60))] = coordparse.ERR_SECONDS
+        ok = codes == coordparse.OK
+
+    negative = deg < 0
+    deg = np.abs(deg)
+    negative |= hemi == (ord('W') if kind == 'lon' else ord('S'))
+    value = deg + (abs_m / 60.0) + (abs_s / 3600.0)
+    value = np.where(negative, -value, value)
+
+    max_deg = 180 if kind == 'lon' else 90
+    out_of_bounds = (deg > max_deg) | ((deg == max_deg) & ((abs_m > 0) | (abs_s > 0)))
+    codes[ok & out_of_bounds] = coordparse.ERR_DEGREES
+    ok = codes == coordparse.OK
+    values[ok] = value[ok]
+    return values, codes, fallback, empty
+
+
+def parse_angles(values, kind='lon', fmt='DD'):
+    """
+    Parse an array of DD/DDM/DMS angle strings.
+    Returns (float64 values, uint8 status codes); invalid rows are NaN.
+    """
+    if fmt not in _MIN_TOKENS:
+        raise ValueError(f'Unsupported format: {fmt}')
+    arr, cp = _as_array(values)
+    out, codes, fallback, _ = _angle_core(cp, kind, fmt)
+    for i in np.flatnonzero(fallback):
+        value, code = coordparse.parse_angle(_row_text(arr, i), kind=kind, fmt=fmt)
+        out[i] = np.nan if value is None else value
+        codes[i] = code
+    return out, codes
+
+
+def parse_columns_codes(e_values, n_values, fmt='DD'):
+    """
+    Parse E (lon) and N (lat) columns with coordparse.parse_pair semantics.
+    Returns (lon, lat, codes) as float64, float64 and uint8 arrays.
+    """
+    if fmt not in _MIN_TOKENS:
+        raise ValueError(f'Unsupported format: {fmt}')
+    e_arr, e_cp = _as_array(e_values)
+    n_arr, n_cp = _as_array(n_values)
+    if e_arr.size != n_arr.size:
+        raise ValueError('E and N columns differ in length.')
+
+    lon, lon_codes, lon_fb, lon_empty = _angle_core(e_cp, 'lon', fmt)
+    lat, lat_codes, lat_fb, lat_empty = _angle_core(n_cp, 'lat', fmt)
+
+    codes = np.where(lon_codes != coordparse.OK, lon_codes, lat_codes)
+    ok = codes == coordparse.OK
+    codes[ok & ((lon < -180) | (lon > 180))] = coordparse.ERR_RANGE_LON
+    ok = codes == coordparse.OK
+    codes[ok & ((lat < -90) | (lat > 90))] = coordparse.ERR_RANGE_LAT
+    codes[lon_empty | lat_empty] = coordparse.ERR_EMPTY
+
+    for i in np.flatnonzero(lon_fb | lat_fb):
+        res = coordparse.parse_pair(_row_text(e_arr, i), _row_text(n_arr, i), fmt)
+        codes[i] = res.code
+        if res.code == coordparse.OK:
+            lon[i] = res.x
+            lat[i] = res.y
+
+    bad = codes != coordparse.OK
+    lon[bad] = np.nan
+    lat[bad] = np.nan
+    return lon, lat, codes
+
+
+def parse_columns(e_values, n_values, fmt='DD'):
+    """
+    Parse E (lon) and N (lat) columns of DD/DDM/DMS strings.
+    Returns (lon, lat, valid) where lon/lat are float64 and valid is a bool mask.
+    """
+    lon, lat, codes = parse_columns_codes(e_values, n_values, fmt)
+    return lon, lat, codes == coordparse.OK
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Background write queue for slow (networked) providers.
+
+Inserts are queued on the GUI thread and written by one worker thread
+through a data provider of its own per layer (the layer source opened
+again, like the import task does), so a slow PostGIS or WFS-T commit does
+not block the dock. Jobs are written in order. Only failures before the
+features were sent (the source cannot be opened) are retried, with
+exponential backoff on a freshly opened provider: a server may commit an
+insert and still time out, and sending it again would add the features
+twice. Any other failure, and every job still queued when close() gives
+up, is reported as failed. Results come back to the GUI thread through
+queued signals.
+"""
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from qgis.PyQt.QtCore import QObject, pyqtSignal
+from qgis.core import QgsFeatureSink, QgsVectorLayer
+
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # s, doubled per retry
+STOP_TIMEOUT = 5.0     # s to wait for queued jobs on close()
+CLOSED_ERROR = 'The write queue was closed before the job was written'
+
+# providers that are written through a network connection
+REMOTE_PROVIDERS = ('postgres', 'WFS', 'oracle', 'mssql', 'hana', 'arcgisfeatureserver')
+
+_Job = namedtuple('_Job', 'layer_id source provider_type features geometries')
+
+
+def is_remote(layer):
+    return layer.providerType() in REMOTE_PROVIDERS
+
+
+class WriteQueue(QObject):
+    """
+    add(layer, features, geometries) queues new features and geometry changes
+    ({fid: QgsGeometry}) for a layer that can be reopened from its source
+    (not a memory layer). latency adds a delay before every write, for
+    testing against a local stand-in.
+    """
+    pendingChanged = pyqtSignal(int)                 # jobs not yet written
+    committed = pyqtSignal(str, int)                 # layer id, features written
+    failed = pyqtSignal(str, int, str)               # layer id, features lost, error
+
+    def __init__(self, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, latency=0.0, parent=None):
+        super().__init__(parent)
+        self.retries = retries
+        self.backoff = backoff
+        self.latency = latency
+        self.committed_count = 0
+        self.failed_count = 0
+        self._jobs = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._providers = {}  # layer id -> (QgsVectorLayer, provider); worker thread only
+        self._thread = threading.Thread(target=self._run, name='AddPoint write queue', daemon=True)
+        self._thread.start()
+
+    def pending(self):
+        with self._lock:
+            return self._pending
+
+    def add(self, layer, features, geometries=None):
+        if layer.providerType() == 'memory':
+            raise ValueError('Memory layers cannot be written from another thread')
+        job = _Job(layer.id(), layer.source(), layer.providerType(), list(features), dict(geometries or {}))
+        with self._lock:
+            self._pending += 1
+            pending = self._pending
+        self._jobs.put(job)
+        self.pendingChanged.emit(pending)
+
+    def close(self, timeout=STOP_TIMEOUT):
+        """
+        Write what is queued (up to timeout seconds) and stop the worker.
+        Jobs not written by then are reported through failed.
+        """
+        self._jobs.put(None)
+        self._thread.join(timeout)
+        self._stopping.set()
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                self._finish(job, CLOSED_ERROR)
+
+    def _finish(self, job, error):
+        count = len(job.features) + len(job.geometries)
+        with self._lock:
+            self._pending -= 1
+            pending = self._pending
+            if error is None:
+                self.committed_count += count
+            else:
+                self.failed_count += count
+        if error is None:
+            self.committed.emit(job.layer_id, len(job.features))
+        else:
+            self.failed.emit(job.layer_id, count, error)
+        self.pendingChanged.emit(pending)
+
+    # -- worker thread ------------------------------------------------------
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if self._stopping.is_set():
+                self._finish(job, CLOSED_ERROR)
+                continue
+            self._finish(job, self._write_with_retries(job))
+        self._providers.clear()
+
+    def _write_with_retries(self, job):
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                # the source could not be opened (dropped connection, lock):
+                # back off and retry on a new connection
+                self._providers.pop(job.layer_id, None)
+                if self._stopping.wait(self.backoff * 2 ** (attempt - 1)):
+                    return error
+            try:
+                self._write(job)
+                return None
+            except ConnectionError as ex:
+                error = str(ex)
+            except Exception as ex:
+                # the request may have reached the server: do not send it again
+                return str(ex)
+        return error
+
+    def _provider(self, job):
+        entry = self._providers.get(job.layer_id)
+        if entry is None or entry[0].source() != job.source:
+            layer = QgsVectorLayer(job.source, 'AddPoint write queue', job.provider_type)
+            if not layer.isValid():
+                raise ConnectionError(f'Cannot open layer source: {job.source}')
+            entry = self._providers[job.layer_id] = (layer, layer.dataProvider())
+        return entry[1]
+
+    def _write(self, job):
+        provider = self._provider(job)
+        if self.latency:
+            time.sleep(self.latency)
+        # setting the same geometries again is harmless, so this may be retried
+        if job.geometries and not provider.changeGeometryValues(job.geometries):
+            raise ConnectionError('; '.join(provider.errors()) or 'changeGeometryValues failed')
+        if job.features:
+            ok, _ = provider.addFeatures(job.features, QgsFeatureSink.FastInsert)
+            if not ok:
+                raise RuntimeError('; '.join(provider.errors()) or 'addFeatures failed')
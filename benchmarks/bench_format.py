@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of coordinate text output (coordformat.format_lines) against a
+per-point f-string formatter, for each angle format. QGIS-free:
+
+    python benchmarks/bench_format.py --points 500000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from AddPoint import coordformat  # noqa: E402
+
+
+def naive(xs, ys, fmt):
+    """Reference: one f-string per value, the straightforward way."""
+    def angle(v, pos, neg):
+        hemi = neg if v < 0 else pos
+        v = abs(v)
+        if fmt == 'DD':
+            return f'{v:.6f}°{hemi}'
+        deg = int(v)
+        minutes = (v - deg) * 60
+        if fmt == 'DDM':
+            return f'{deg}°{minutes:07.4f}′{hemi}'
+        mins = int(minutes)
+        return f'{deg}°{mins:02d}′{(minutes - mins) * 60:05.2f}″{hemi}'
+    return [f"{angle(x, 'E', 'W')}\t{angle(y, 'N', 'S')}" for x, y in zip(xs, ys)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(1)
+    xs = [rnd.uniform(-180, 180) for _ in range(args.points)]
+    ys = [rnd.uniform(-90, 90) for _ in range(args.points)]
+    results = []
+    for fmt in ('DD', 'DDM', 'DMS'):
+        for name, func in (('naive', lambda: naive(xs, ys, fmt)),
+                           ('format_lines', lambda: coordformat.format_lines(xs, ys, fmt))):
+            best = min(_timed(func) for _ in range(args.repeat))
+            results.append({'format': fmt, 'method': name, 'seconds': best,
+                            'points_per_s': args.points / best})
+    print(json.dumps({'points': args.points, 'results': results}, indent=2))
+    return 0
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    sys.exit(main())
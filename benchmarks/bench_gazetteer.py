@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Gazetteer index build time and completion latency on a synthetic CSV of
+place names and marker IDs. QGIS-free:
+
+    python benchmarks/bench_gazetteer.py --places 2000000 --queries 5000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from AddPoint import gazetteer  # noqa: E402
+
+SYLLABLES = ('lju', 'blja', 'na', 'kra', 'nj', 'čr', 'no', 'melj', 'ma', 'ri', 'bor', 'ce', 'lje',
+             'ko', 'per', 'no', 'vo', 'me', 'sto', 'šmar', 'je', 'ta', 'vas', 'dol', 'gor', 'ica')
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000.0  # noqa: E731
+    return {'p50_ms': pick(0.5), 'p99_ms': pick(0.99), 'max_ms': samples[-1] * 1000.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--places', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(1)
+    tmp = tempfile.mkdtemp()
+    source = os.path.join(tmp, 'places.csv')
+    names = []
+    with open(source, 'w', encoding='utf-8') as f:
+        f.write('name;id;lon;lat\n')
+        for i in range(args.places):
+            name = ''.join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))).capitalize()
+            names.append(name)
+            f.write(f'{name};GPS-{i:07d};{rnd.uniform(13.3, 16.6):.6f};{rnd.uniform(45.4, 46.9):.6f}\n')
+
+    index_path = os.path.join(tmp, 'places.idx')
+    start = time.perf_counter()
+    records = gazetteer.build_index([source], index_path)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    gaz = gazetteer.Gazetteer(index_path)
+    open_s = time.perf_counter() - start
+
+    complete_times = []
+    for _ in range(args.queries):
+        name = names[rnd.randrange(len(names))]
+        prefix = name[:rnd.randint(1, len(name))]
+        t = time.perf_counter()
+        gaz.complete(prefix)
+        complete_times.append(time.perf_counter() - t)
+
+    lookup_times = []
+    misses = 0
+    for _ in range(args.queries):
+        marker = f'gps-{rnd.randrange(args.places):07d}'
+        t = time.perf_counter()
+        place = gaz.lookup(marker)
+        lookup_times.append(time.perf_counter() - t)
+        misses += place is None
+    gaz.close()
+
+    print(json.dumps({
+        'places': args.places,
+        'records': records,
+        'index_mb': os.path.getsize(index_path) / 1e6,
+        'build_s': build,
+        'open_ms': open_s * 1000.0,
+        'complete': _percentiles(complete_times),
+        'lookup': _percentiles(lookup_times),
+        'lookup_misses': misses,
+    }, indent=2))
+    shutil.rmtree(tmp, ignore_errors=True)
+    return 0 if not misses else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
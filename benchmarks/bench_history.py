@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Latency of history completion and bounding-box lookup with many stored
+entries. QGIS-free:
+
+    python benchmarks/bench_history.py --entries 300000 --queries 2000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from AddPoint import coordformat  # noqa: E402
+from AddPoint.history import EntryHistory, normalize  # noqa: E402
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000.0  # noqa: E731
+    return {'p50_ms': pick(0.5), 'p99_ms': pick(0.99), 'max_ms': samples[-1] * 1000.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=300000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(1)
+    path = os.path.join(tempfile.mkdtemp(), 'history.sqlite')
+    history = EntryHistory(path)
+    lons = [rnd.uniform(13.3, 16.6) for _ in range(args.entries)]
+    lats = [rnd.uniform(45.4, 46.9) for _ in range(args.entries)]
+    texts = coordformat.format_lines(lons, lats, 'DMS', delimiter=' ')
+
+    start = time.perf_counter()
+    with history._db:
+        for text, lon, lat in zip(texts, lons, lats):
+            history._db.execute(
+                'INSERT INTO entry (key, text, fmt, ord, utm_epsg, x, y, src_epsg, lon, lat, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (normalize(text), text, 'DMS', 'EN', '', lon, lat, 'EPSG:4326', lon, lat, time.time()))
+        history._db.execute('INSERT INTO entry_rtree SELECT id, lon, lon, lat, lat FROM entry')
+    fill = time.perf_counter() - start
+
+    single = []
+    for _ in range(200):
+        lon, lat = rnd.uniform(13.3, 16.6), rnd.uniform(45.4, 46.9)
+        t = time.perf_counter()
+        history.add(f'{lon:.6f} {lat:.6f}', 'DD', 'EN', '', lon, lat, 'EPSG:4326', lon, lat, 'layer')
+        single.append(time.perf_counter() - t)
+
+    prefix_times = []
+    for _ in range(args.queries):
+        text = texts[rnd.randrange(len(texts))]
+        prefix = text[:rnd.randint(1, 12)]
+        t = time.perf_counter()
+        history.complete(prefix)
+        prefix_times.append(time.perf_counter() - t)
+
+    bbox_times = []
+    for _ in range(args.queries):
+        lon, lat = rnd.uniform(13.3, 16.5), rnd.uniform(45.4, 46.8)
+        t = time.perf_counter()
+        history.in_bbox(lon, lat, lon + 0.05, lat + 0.05)
+        bbox_times.append(time.perf_counter() - t)
+    history.close()
+
+    print(json.dumps({
+        'entries': args.entries,
+        'rtree': history.rtree,
+        'fill_s': fill,
+        'add': _percentiles(single),
+        'complete': _percentiles(prefix_times),
+        'bbox': _percentiles(bbox_times),
+    }, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+MGRS batch decoding throughput on references spread over several UTM
+zones, and how they group by zone. QGIS-free; needs pyproj to generate the
+references:
+
+    python benchmarks/bench_mgrs.py --rows 200000 --digits 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from AddPoint import mgrs, validation  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--digits', type=int, default=5, choices=range(0, 6))
+    parser.add_argument('--west', type=float, default=6.0, help='area of the sample (degrees)')
+    parser.add_argument('--east', type=float, default=24.0)
+    parser.add_argument('--south', type=float, default=40.0)
+    parser.add_argument('--north', type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    from pyproj import Transformer
+
+    rnd = random.Random(1)
+    transformers = {}
+    lines = []
+    for _ in range(args.rows):
+        lon = rnd.uniform(args.west, args.east)
+        lat = rnd.uniform(args.south, args.north)
+        epsg = int(mgrs.grid_zone_epsg(lon, lat)[5:])
+        if epsg not in transformers:
+            transformers[epsg] = Transformer.from_crs(4326, epsg, always_xy=True)
+        e, n = transformers[epsg].transform(lon, lat)
+        lines.append(mgrs.encode(epsg % 100, lat, e, n, args.digits))
+
+    mgrs._SQUARES.clear()
+    start = time.perf_counter()
+    result = validation.validate_rows(enumerate(lines, start=1), 'MGRS')
+    decode_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    groups = result.points_by_epsg()
+    group_s = time.perf_counter() - start
+
+    print(json.dumps({
+        'rows': args.rows,
+        'digits': args.digits,
+        'accepted': len(result.accepted()),
+        'decode_s': decode_s,
+        'rows_per_s': args.rows / decode_s,
+        'squares_cached': len(mgrs._SQUARES),
+        'group_s': group_s,
+        'zones': {epsg: len(points) for epsg, points in groups},
+    }, indent=2))
+    return 0 if len(result.accepted()) == args.rows else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
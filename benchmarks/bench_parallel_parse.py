@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Scaling of multi-process file parsing across worker counts.
+
+QGIS-free: generates a coordinate file (or uses --input) and times
+AddPoint.parallelparse.parse_file for 1..N workers against the serial
+coordparse loop:
+
+    python benchmarks/bench_parallel_parse.py --rows 2000000 --format DMS
+    python benchmarks/bench_parallel_parse.py --input big.txt --format DD --max-workers 8
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from AddPoint import coordparse, parallelparse  # noqa: E402
+
+
+def _angle(value, hemi, fmt):
+    value = abs(value)
+    if fmt == 'DD':
+        return f'{value:.6f}{hemi}'
+    deg = int(value)
+    minutes = (value - deg) * 60
+    if fmt == 'DDM':
+        return f'{deg}°{minutes:.4f}′{hemi}'
+    sec = (minutes - int(minutes)) * 60
+    return f'{deg}°{int(minutes)}′{sec:.2f}″{hemi}'
+
+
+def write_sample(path, rows, fmt, seed=1):
+    rnd = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(rows):
+            lon = 13.3 + rnd.random() * 3.3
+            lat = 45.4 + rnd.random() * 1.5
+            if fmt in coordparse.ANGLE_FORMATS:
+                f.write(f'{_angle(lon, "E", fmt)};{_angle(lat, "N", fmt)}\n')
+            else:
+                f.write(f'{370000 + rnd.random() * 250000:.2f} {30000 + rnd.random() * 160000:.2f}\n')
+
+
+def serial(path, fmt):
+    ok = 0
+    with open(path, 'rb') as f:
+        for raw in f:
+            line = raw.decode('utf-8', errors='replace').strip()
+            if not line:
+                continue
+            res = coordparse.parse_text(line, fmt)
+            ok += res.code == coordparse.OK
+    return ok
+
+
+def parallel(path, fmt, workers):
+    ok = 0
+    for chunk in parallelparse.parse_file(path, fmt, workers=workers):
+        ok += len(chunk.xs)
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', help='existing coordinate file (default: generate one)')
+    parser.add_argument('--rows', type=int, default=1000000, help='rows to generate')
+    parser.add_argument('--format', default='DMS', choices=coordparse.ANGLE_FORMATS + coordparse.METRIC_FORMATS)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+
+    path = args.input
+    tmp = None
+    if not path:
+        fd, tmp = tempfile.mkstemp(suffix='.txt')
+        os.close(fd)
+        write_sample(tmp, args.rows, args.format)
+        path = tmp
+
+    try:
+        results = []
+        start = time.perf_counter()
+        ok = serial(path, args.format)
+        base = time.perf_counter() - start
+        results.append({'mode': 'serial', 'workers': 1, 'seconds': base, 'rows_ok': ok, 'speedup': 1.0})
+        for workers in range(1, args.max_workers + 1):
+            start = time.perf_counter()
+            ok = parallel(path, args.format, workers)
+            seconds = time.perf_counter() - start
+            results.append({'mode': 'parallel', 'workers': workers, 'seconds': seconds, 'rows_ok': ok,
+                            'speedup': base / seconds})
+    finally:
+        if tmp:
+            os.remove(tmp)
+
+    report = {
+        'meta': {
+            'format': args.format,
+            'bytes': os.path.getsize(args.input) if args.input else None,
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the AddPoint parse -> transform -> insert pipeline.
+
+Drives AddPointPlugin through a fake iface and memory layers and times each
+stage separately. Run with the Python that ships with QGIS:
+
+    python benchmarks/bench_pipeline.py --output bench.json
+    python benchmarks/bench_pipeline.py --baseline bench.json --threshold 1.25
+
+With --baseline the run fails (exit code 1) when any stage is slower per item
+than the baseline by more than the threshold factor.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from fake_iface import FakeIface, start_app
+
+from AddPoint.coordparse import split_single_field
+
+SIZES = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+# (format, single-field text in E N order)
+SAMPLES = (
+    ('DD', '14.50597 46.05695'),
+    ('DDM', '14°30.3582′E 46°3.417′N'),
+    ('DMS', '14°30′21.5″E;46°3′25.0″N'),
+    ('EPSG:3794', '462000.12 101000.34'),
+    ('EPSG:3857', '1614800.5 5789100.25'),
+    ('UTM', '457123.4 5101234.5'),
+)
+
+
+def _timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return time.perf_counter() - start
+
+
+def _record(results, stage, fmt, size, seconds, items):
+    results.append({
+        'stage': stage,
+        'format': fmt,
+        'size': size,
+        'seconds': seconds,
+        'per_item_us': seconds / max(items, 1) * 1e6,
+    })
+
+
+def _select_format(plugin, fmt):
+    combo = plugin._format_combo
+    for i in range(combo.count()):
+        if combo.itemData(i) == fmt:
+            combo.setCurrentIndex(i)
+            return
+    raise ValueError(fmt)
+
+
+def _memory_layer(crs='EPSG:3794'):
+    from qgis.core import QgsProject, QgsVectorLayer
+
+    layer = QgsVectorLayer(f'Point?crs={crs}', 'bench', 'memory')
+    QgsProject.instance().addMapLayer(layer)
+    return layer
+
+
+def bench_parse(plugin, results, repeat):
+    plugin._single_mode_chk.setChecked(True)
+    for fmt, text in SAMPLES:
+        _select_format(plugin, fmt)
+        plugin._one_edit.setText(text)
+        _record(results, 'parse_inputs', fmt, 1, _timed(plugin._parse_inputs, repeat), repeat)
+        if fmt in ('DD', 'DDM', 'DMS'):
+            e_text = split_single_field(text)[0]
+            seconds = _timed(lambda: plugin._parse_angle(e_text, kind='lon', fmt=fmt), repeat)
+            _record(results, 'parse_angle', fmt, 1, seconds, repeat)
+
+
+def bench_transform_setup(plugin, results, repeat):
+    from qgis.core import QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProject
+
+    layer = _memory_layer()
+    for fmt, _ in SAMPLES:
+        src = 'EPSG:32633' if fmt == 'UTM' else ('EPSG:4326' if fmt in ('DD', 'DDM', 'DMS') else fmt)
+
+        def _uncached():
+            QgsCoordinateTransform(QgsCoordinateReferenceSystem(src), layer.crs(), QgsProject.instance())
+
+        _record(results, 'transform_setup', fmt, 1, _timed(_uncached, repeat), repeat)
+        seconds = _timed(lambda: plugin._transform_to_layer(src, layer), repeat)
+        _record(results, 'transform_setup_cached', fmt, 1, seconds, repeat)
+    QgsProject.instance().removeMapLayer(layer.id())
+
+
+def bench_batch(plugin, results, sizes):
+    from qgis.core import QgsFeature, QgsGeometry, QgsPointXY, QgsProject, edit
+
+    for size in sizes:
+        points = [(13.4 + (i % 1000) * 0.002, 45.4 + (i // 1000 % 1000) * 0.001) for i in range(size)]
+        layer = _memory_layer()
+        xform = plugin._transform_to_layer('EPSG:4326', layer)
+
+        start = time.perf_counter()
+        pts = [xform.transform(QgsPointXY(x, y)) for x, y in points]
+        _record(results, 'transform', 'DD', size, time.perf_counter() - start, size)
+
+        start = time.perf_counter()
+        feats = []
+        fields = layer.fields()
+        for pt in pts:
+            feat = QgsFeature(fields)
+            feat.setGeometry(QgsGeometry.fromPointXY(pt))
+            feats.append(feat)
+        _record(results, 'feature_create', 'DD', size, time.perf_counter() - start, size)
+
+        start = time.perf_counter()
+        with edit(layer):
+            layer.addFeatures(feats)
+        _record(results, 'add_commit', 'DD', size, time.perf_counter() - start, size)
+
+        start = time.perf_counter()
+        layer.triggerRepaint()
+        _record(results, 'trigger_repaint', 'DD', size, time.perf_counter() - start, 1)
+
+        start = time.perf_counter()
+        plugin._insert_points(layer, points, 'EPSG:4326')
+        _record(results, 'insert_points', 'DD', size, time.perf_counter() - start, size)
+
+        QgsProject.instance().removeMapLayer(layer.id())
+
+
+def bench_single_add(plugin, results, repeat):
+    from qgis.core import QgsProject
+
+    layer = _memory_layer()
+    plugin._single_mode_chk.setChecked(True)
+    for fmt, text in SAMPLES:
+        _select_format(plugin, fmt)
+        plugin._one_edit.setText(text)
+        seconds = _timed(lambda: plugin._on_add_point(target_layer=layer), repeat)
+        _record(results, 'add_point', fmt, 1, seconds, repeat)
+    QgsProject.instance().removeMapLayer(layer.id())
+
+
+def compare(results, baseline, threshold):
+    """Return a list of (stage, format, size, now, before) regressions."""
+    before = {(r['stage'], r['format'], r['size']): r['per_item_us'] for r in baseline['results']}
+    regressions = []
+    for r in results:
+        ref = before.get((r['stage'], r['format'], r['size']))
+        if ref and r['per_item_us'] > ref * threshold:
+            regressions.append((r['stage'], r['format'], r['size'], r['per_item_us'], ref))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='allowed slowdown factor per stage (default 1.25)')
+    parser.add_argument('--max-size', type=int, default=SIZES[-1], help='largest batch size')
+    parser.add_argument('--repeat', type=int, default=1000, help='repetitions of single-item stages')
+    args = parser.parse_args(argv)
+
+    app = start_app()
+    from qgis.core import Qgis
+    from AddPoint.AddPoint import AddPointPlugin
+
+    plugin = AddPointPlugin(FakeIface())
+    plugin.initGui()
+    plugin._ensure_dock()
+
+    results = []
+    bench_parse(plugin, results, args.repeat)
+    bench_transform_setup(plugin, results, max(1, args.repeat // 10))
+    bench_single_add(plugin, results, max(1, args.repeat // 10))
+    bench_batch(plugin, results, [s for s in SIZES if s <= args.max_size])
+    plugin.unload()
+
+    report = {
+        'meta': {
+            'qgis': Qgis.QGIS_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for stage, fmt, size, now, ref in regressions:
+            print(f'REGRESSION {stage} {fmt} n={size}: {now:.2f} us/item (baseline {ref:.2f})', file=sys.stderr)
+        status = 1 if regressions else 0
+
+    app.exitQgis()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Check of the near-duplicate index on geographic layers at high latitude,
+where a degree of longitude is much shorter than a degree of latitude.
+
+At each test latitude the layer holds two points near the probe: one
+outside the tolerance in metres, which at high latitude is the nearer one
+in degrees, and one inside it. The index must report the second. Fails
+(exit code 1) otherwise. Run with the Python that ships with QGIS:
+
+    python benchmarks/check_dedup.py
+"""
+import math
+import sys
+
+from fake_iface import start_app
+
+TOLERANCE_M = 2.0
+LATITUDES = (0.0, 46.0, 60.0, 70.0, 78.0, -70.0)
+
+
+def main():
+    start_app()
+    from qgis.core import QgsFeature, QgsGeometry, QgsPointXY, QgsProject, QgsVectorLayer
+    from AddPoint.dedup import DuplicateIndex, _METRES_PER_DEGREE
+
+    failures = 0
+    for lat in LATITUDES:
+        lon = 15.0
+        metres_per_lon = _METRES_PER_DEGREE * math.cos(math.radians(lat))
+        # 2.2 m north: closer in degrees than the east point at high latitude
+        north = QgsPointXY(lon, lat + 2.2 / _METRES_PER_DEGREE)
+        # 1.5 m east: the real duplicate
+        east = QgsPointXY(lon + 1.5 / metres_per_lon, lat)
+        layer = QgsVectorLayer('Point?crs=EPSG:4326', f'dedup {lat}', 'memory')
+        feats = []
+        for pt in (north, east):
+            feat = QgsFeature(layer.fields())
+            feat.setGeometry(QgsGeometry.fromPointXY(pt))
+            feats.append(feat)
+        _ok, added = layer.dataProvider().addFeatures(feats)
+        QgsProject.instance().addMapLayer(layer)
+
+        index = DuplicateIndex()
+        match = index.find(layer, [QgsPointXY(lon, lat)], TOLERANCE_M)[0]
+        expected = ('layer', added[1].id())
+        ok = match == expected
+        failures += not ok
+        print(f'lat {lat:6.1f}: match {match}, expected {expected} {"ok" if ok else "FAIL"}')
+        index.close()
+        QgsProject.instance().removeMapLayer(layer)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Check that the dock's Add button writes to the target layer and to every
+checked further target (fan-out), through the real button click. Two
+memory layers in different CRSs; fails (exit code 1) unless each receives
+exactly one feature. Run with the Python that ships with QGIS:
+
+    python benchmarks/check_fanout.py
+"""
+import json
+import sys
+
+from fake_iface import FakeIface, start_app
+
+
+def main():
+    start_app()
+    from qgis.PyQt.QtCore import Qt
+    from qgis.core import QgsProject, QgsVectorLayer
+
+    import AddPoint
+
+    project = QgsProject.instance()
+    target = QgsVectorLayer('Point?crs=EPSG:4326', 'target', 'memory')
+    extra = QgsVectorLayer('Point?crs=EPSG:3794', 'extra', 'memory')
+    project.addMapLayers([target, extra])
+
+    plugin = AddPoint.classFactory(FakeIface())
+    plugin.initGui()
+    plugin._ensure_dock()
+    plugin._history_chk.setChecked(False)
+    plugin._dedup_chk.setChecked(False)
+    plugin._batch_mode_chk.setChecked(False)
+    plugin._single_mode_chk.setChecked(True)
+    plugin._select_combo_data(plugin._format_combo, 'DD')
+    plugin._select_combo_data(plugin._single_order_combo, 'EN')
+    plugin._layers_combo.setLayer(target)
+    plugin._refresh_extra_layers()
+    plugin._extra_layers_combo.setItemCheckState(plugin._extra_layers_combo.findData(extra.id()), Qt.Checked)
+    plugin._one_edit.setText('14.50597 46.05695')
+
+    plugin._btn_add.click()
+    if plugin._buffer:
+        plugin._buffer.flush_all()
+
+    counts = {layer.name(): layer.featureCount() for layer in (target, extra)}
+    print(json.dumps(counts, indent=2))
+    plugin.unload()
+    project.removeAllMapLayers()
+    return 0 if all(n == 1 for n in counts.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
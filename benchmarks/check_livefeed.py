@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Check of the live feed over TCP against a local NMEA server that sends one
+GGA sentence per second, slower than the reader's read timeout, so every
+fix arrives after at least one timed-out read. Fails (exit code 1) unless
+every fix is written and the feed ends without an error when the server
+closes. Run with the Python that ships with QGIS:
+
+    python benchmarks/check_livefeed.py --fixes 5 --hz 1
+"""
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+
+from fake_iface import start_app
+
+
+def serve(server, fixes, hz):
+    from AddPoint import nmea
+
+    conn, _addr = server.accept()
+    with conn:
+        for i in range(fixes):
+            body = f'GPGGA,1200{i:02d}.00,4603.{417 + i:04d},N,01430.{358 + i:04d},E,1,08,0.9,300.0,M,47.0,M,,'
+            # sentence split over two sends, as a slow link may deliver it
+            data = (nmea.format_sentence(body) + '\r\n').encode('ascii')
+            conn.sendall(data[:20])
+            time.sleep(0.05)
+            conn.sendall(data[20:])
+            time.sleep(1.0 / hz)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixes', type=int, default=5)
+    parser.add_argument('--hz', type=float, default=1.0, help='sentences per second')
+    args = parser.parse_args(argv)
+
+    app = start_app()
+    from AddPoint.livefeed import LiveFeed
+
+    server = socket.create_server(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+    threading.Thread(target=serve, args=(server, args.fixes, args.hz), daemon=True).start()
+
+    points = []
+    ended = []
+    feed = LiveFeed(f'tcp://127.0.0.1:{port}', lambda batch: points.extend(batch) or True,
+                    batch_size=1, interval=100)
+    feed.stopped.connect(ended.append)
+    feed.start()
+    deadline = time.monotonic() + args.fixes / args.hz + 10
+    while not ended and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    feed.stop()
+    server.close()
+
+    report = {
+        'fixes_sent': args.fixes,
+        'hz': args.hz,
+        'written': len(points),
+        'error': ended[0] if ended else 'feed did not end',
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if len(points) == args.fixes and ended == [''] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
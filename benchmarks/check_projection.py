@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Accuracy check of the built-in projection engine (AddPoint/projection.py).
+
+Compares forward and inverse results with reference coordinates computed with
+PROJ and fails (exit code 1) if any point differs by 1 mm or more. Needs NumPy
+only, no QGIS:
+
+    python benchmarks/check_projection.py
+"""
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from AddPoint import projection  # noqa: E402
+
+TOLERANCE_M = 0.001
+
+# (CRS, lon, lat, E, N) from PROJ 9
+REFERENCE = (
+    ('EPSG:32601', -177, 0.5, 500000.000000, 55265.037143),
+    ('EPSG:32601', -179.9, 45.2, 272232.756789, 5009260.092014),
+    ('EPSG:32601', -174.05, 71.3, 605525.227098, 7913430.118263),
+    ('EPSG:32617', -81, 0.5, 500000.000000, 55265.037143),
+    ('EPSG:32617', -83.9, 45.2, 272232.756789, 5009260.092014),
+    ('EPSG:32617', -78.05, 71.3, 605525.227098, 7913430.118263),
+    ('EPSG:32633', 15, 0.5, 500000.000000, 55265.037143),
+    ('EPSG:32633', 12.1, 45.2, 272232.756789, 5009260.092014),
+    ('EPSG:32633', 17.95, 71.3, 605525.227098, 7913430.118263),
+    ('EPSG:32634', 21, 0.5, 500000.000000, 55265.037143),
+    ('EPSG:32634', 18.1, 45.2, 272232.756789, 5009260.092014),
+    ('EPSG:32634', 23.95, 71.3, 605525.227098, 7913430.118263),
+    ('EPSG:32660', 177, 0.5, 500000.000000, 55265.037143),
+    ('EPSG:32660', 174.1, 45.2, 272232.756789, 5009260.092014),
+    ('EPSG:32660', 179.95, 71.3, 605525.227098, 7913430.118263),
+    ('EPSG:32719', -69, -0.5, 500000.000000, 9944734.962857),
+    ('EPSG:32719', -71.9, -33.7, 231209.056798, 6267330.420736),
+    ('EPSG:32719', -66.05, -62.1, 653968.075964, 3111175.580389),
+    ('EPSG:32733', 15, -0.5, 500000.000000, 9944734.962857),
+    ('EPSG:32733', 12.1, -33.7, 231209.056798, 6267330.420736),
+    ('EPSG:32733', 17.95, -62.1, 653968.075964, 3111175.580389),
+    ('EPSG:32756', 153, -0.5, 500000.000000, 9944734.962857),
+    ('EPSG:32756', 150.1, -33.7, 231209.056798, 6267330.420736),
+    ('EPSG:32756', 155.95, -62.1, 653968.075964, 3111175.580389),
+    ('EPSG:3794', 14.50597, 46.05695, 461773.927170, 102024.447244),
+    ('EPSG:3794', 13.38, 45.42, 373217.654245, 32395.089992),
+    ('EPSG:3794', 16.61, 46.87, 622733.538762, 193534.316230),
+    ('EPSG:3794', 15.0, 46.0, 500000.000000, 95576.317739),
+    ('EPSG:3794', 13.7, 46.5, 400219.043804, 151970.038315),
+    ('EPSG:3857', 14.50597, 46.05695, 1614797.193863, 5789480.199158),
+    ('EPSG:3857', -122.4194, 37.7749, -13627665.271218, 4547675.354341),
+    ('EPSG:3857', 151.2093, -33.8688, 16832542.279207, -4011198.647308),
+    ('EPSG:3857', 0, 0, 0.000000, 0.000000),
+    ('EPSG:3857', 179.9, 84.9, 20026376.393710, 19845401.335496),
+)
+
+
+def main():
+    worst = 0.0
+    failures = 0
+    for crs, lon, lat, e, n in REFERENCE:
+        x, y = projection.transform('EPSG:4326', crs, [lon], [lat])
+        forward = math.hypot(x[0] - e, y[0] - n)
+        lon2, lat2 = projection.transform(crs, 'EPSG:4326', [e], [n])
+        # angular error expressed in metres on the ground
+        inverse = math.hypot((lon2[0] - lon) * 111320 * math.cos(math.radians(lat)), (lat2[0] - lat) * 110574)
+        worst = max(worst, forward, inverse)
+        if forward >= TOLERANCE_M or inverse >= TOLERANCE_M:
+            failures += 1
+            print(f'FAIL {crs} ({lon}, {lat}): forward {forward:.6f} m, inverse {inverse:.6f} m')
+
+    lon = np.random.default_rng(0).uniform(13.4, 16.6, 1000000)
+    lat = np.random.default_rng(1).uniform(45.4, 46.9, 1000000)
+    start = time.perf_counter()
+    projection.transform('EPSG:4326', 'EPSG:3794', lon, lat)
+    elapsed = time.perf_counter() - start
+    print(f'{len(REFERENCE)} reference points, worst error {worst * 1000:.6f} mm')
+    print(f'1e6 points EPSG:4326 -> EPSG:3794 in {elapsed:.3f} s')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Agreement check of the batch parsers with the scalar coordparse path.
+
+A seeded random corpus of well-formed and malformed coordinate text (signs,
+hemisphere letters, degree/minute/second symbols, decimal commas, values
+out of bounds, missing and junk tokens) is parsed twice:
+
+    vectorparse.parse_columns_codes   against coordparse.parse_pair (DD/DDM/DMS)
+    validation.validate_rows          against coordparse.parse_text per line
+                                      (every format and both orders)
+
+Values must be identical (NaN for rejected rows), as must status and warning
+codes. Fails (exit code 1) on the first mismatches. Needs NumPy only, no QGIS:
+
+    python benchmarks/check_vectorparse.py --rows 200000 --seed 1
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AddPoint import coordparse, mgrs, validation, vectorparse  # noqa: E402
+
+MAX_REPORTED = 10
+JUNK = ('', ' ', 'abc', '.', '5.', '.5', '--5', '+-3', '1e5', '12..3', '1,2,3', 'N', 'E 5', '5 5 5 5',
+        '°', '14°°30', '46 3 25 X', '∞', '１２', '14 30.5.1', '\t', '-', 'NS 14')
+
+
+def _number(rnd, value, decimals):
+    text = f'{value:.{decimals}f}'
+    return text.replace('.', ',') if rnd.random() < 0.1 else text
+
+
+def _angle(rnd, value, kind, fmt):
+    """Text of an angle in a format, with the usual variations."""
+    hemis = ('E', 'W') if kind == 'lon' else ('N', 'S')
+    use_hemi = rnd.random() < 0.5
+    sign = '-' if value < 0 and not use_hemi else ''
+    a = abs(value)
+    if fmt == 'DD':
+        parts = [_number(rnd, a, rnd.randint(0, 9))]
+        symbols = ('°',)
+    elif fmt == 'DDM':
+        deg = int(a)
+        parts = [str(deg), _number(rnd, (a - deg) * 60, rnd.randint(0, 6))]
+        symbols = ('°', rnd.choice(("'", '′', '’')))
+    else:
+        deg = int(a)
+        minutes = int((a - deg) * 60)
+        seconds = ((a - deg) * 60 - minutes) * 60
+        parts = [str(deg), str(minutes), _number(rnd, seconds, rnd.randint(0, 4))]
+        symbols = ('°', rnd.choice(("'", '′')), rnd.choice(('"', '″', '”')))
+    if rnd.random() < 0.5:
+        text = ''.join(p + s for p, s in zip(parts, symbols))
+    else:
+        text = rnd.choice((' ', '  ', ':', '; ')).join(parts)
+    text = sign + text
+    if use_hemi:
+        hemi = hemis[value < 0]
+        hemi = hemi.lower() if rnd.random() < 0.1 else hemi
+        text = f'{hemi} {text}' if rnd.random() < 0.3 else f'{text} {hemi}'
+    return text
+
+
+def _malformed(rnd, text):
+    """Damage a value in one of several ways (or replace it with junk)."""
+    choice = rnd.randrange(6)
+    if choice == 0:
+        return rnd.choice(JUNK)
+    if choice == 1:
+        return text + ' ' + rnd.choice(('x', '?', '#', 'Z'))
+    if choice == 2:
+        return text.replace(rnd.choice('0123456789'), rnd.choice(('', '.', ' ')), 1)
+    if choice == 3:
+        return str(rnd.choice((181, 200, 90.5, 999, -181))) + text[text.find(' '):] if ' ' in text else '181'
+    if choice == 4:
+        return text.replace(' ', ' 61 ', 1) if ' ' in text else text + ' 60'
+    return ' ' + text + ' '
+
+
+def angle_pair(rnd, fmt):
+    # include the exact bounds and values around them
+    lon = rnd.choice((rnd.uniform(-180, 180), rnd.uniform(-180, 180), 180.0, -180.0, 0.0, rnd.uniform(179, 181)))
+    lat = rnd.choice((rnd.uniform(-90, 90), rnd.uniform(-90, 90), 90.0, -90.0, rnd.uniform(89, 91)))
+    e_text = _angle(rnd, lon, 'lon', fmt)
+    n_text = _angle(rnd, lat, 'lat', fmt)
+    if rnd.random() < 0.25:
+        if rnd.random() < 0.5:
+            e_text = _malformed(rnd, e_text)
+        else:
+            n_text = _malformed(rnd, n_text)
+    return e_text, n_text
+
+
+def metric_pair(rnd, fmt):
+    if fmt == 'EPSG:3794':
+        e, n = rnd.uniform(250000, 850000), rnd.uniform(-50000, 350000)
+    elif fmt == 'EPSG:3857':
+        e, n = rnd.uniform(-2.1e7, 2.1e7), rnd.uniform(-2.1e7, 2.1e7)
+    else:
+        e, n = rnd.uniform(0, 1e6), rnd.uniform(-1e5, 1.01e7)
+    e_text = _number(rnd, e, rnd.randint(0, 3))
+    n_text = _number(rnd, n, rnd.randint(0, 3))
+    if rnd.random() < 0.2:
+        e_text = _malformed(rnd, e_text)
+    return e_text, n_text
+
+
+def grid_line(rnd):
+    lon, lat = rnd.uniform(-180, 180), rnd.uniform(-80, 84)
+    zone = int((lon + 180) // 6) % 60 + 1
+    digits = rnd.randint(0, 5)
+    text = (f'{zone}{mgrs.band_letter(lat)}{rnd.choice(mgrs.COLUMN_LETTERS[(zone - 1) % 3])}'
+            f'{rnd.choice(mgrs.ROW_LETTERS)} {rnd.randrange(10 ** digits):0{digits}d} '
+            f'{rnd.randrange(10 ** digits):0{digits}d}')
+    if rnd.random() < 0.3:
+        text = f'{zone}{mgrs.band_letter(lat)} {rnd.uniform(0, 1e6):.1f} {rnd.uniform(0, 1e7):.1f}'
+    if rnd.random() < 0.2:
+        text = _malformed(rnd, text)
+    return text
+
+
+def _same(a, b):
+    if a is None or b is None:
+        return a is None and b is None
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return a == b
+
+
+def check_vectorparse(rnd, rows, fmt, mismatches):
+    pairs = [angle_pair(rnd, fmt) for _ in range(rows)]
+    e_texts = [p[0] for p in pairs]
+    n_texts = [p[1] for p in pairs]
+    lon, lat, codes = vectorparse.parse_columns_codes(e_texts, n_texts, fmt)
+    for i, (e_text, n_text) in enumerate(pairs):
+        res = coordparse.parse_pair(e_text, n_text, fmt)
+        x = float('nan') if res.x is None else res.x
+        y = float('nan') if res.y is None else res.y
+        if codes[i] != res.code or not _same(float(lon[i]), x) or not _same(float(lat[i]), y):
+            mismatches.append(('vectorparse', fmt, repr(e_text), repr(n_text),
+                               (float(lon[i]), float(lat[i]), int(codes[i])), (x, y, res.code)))
+
+
+def check_validation(rnd, rows, fmt, order, mismatches):
+    lines = []
+    for _ in range(rows):
+        if fmt in coordparse.GRID_FORMATS:
+            lines.append(grid_line(rnd))
+            continue
+        e_text, n_text = angle_pair(rnd, fmt) if fmt in coordparse.ANGLE_FORMATS else metric_pair(rnd, fmt)
+        # single-field text: values must not contain the separators
+        e_text = ' '.join(e_text.replace(',', '.').replace(';', ' ').split()).replace(' ', '')
+        n_text = ' '.join(n_text.replace(',', '.').replace(';', ' ').split()).replace(' ', '')
+        first, second = (n_text, e_text) if order == 'NE' else (e_text, n_text)
+        lines.append(f'{first}{rnd.choice((" ", ", ", ";", "  "))}{second}')
+    result = validation.validate_rows(enumerate(lines, start=1), fmt, order)
+    j = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        res = coordparse.parse_text(line.strip(), fmt, order)
+        x = float('nan') if res.x is None else res.x
+        y = float('nan') if res.y is None else res.y
+        epsg = result.epsgs[j] if result.epsgs is not None else (result.epsg if res.code == coordparse.OK else None)
+        got = (result.xs[j], result.ys[j], result.codes[j], result.warnings[j], epsg)
+        if (got[2] != res.code or got[3] != res.warning or not _same(got[0], x) or not _same(got[1], y)
+                or got[4] != res.epsg):
+            mismatches.append(('validation', fmt, order, repr(line), got, (x, y, res.code, res.warning, res.epsg)))
+        j += 1
+    if j != len(result):
+        mismatches.append(('validation', fmt, order, 'row count', len(result), j))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000, help='rows per format (and order)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(args.seed)
+    mismatches = []
+    for fmt in coordparse.ANGLE_FORMATS:
+        check_vectorparse(rnd, args.rows, fmt, mismatches)
+    for fmt in coordparse.FORMATS:
+        for order in ('EN', 'NE'):
+            check_validation(rnd, args.rows // 4, fmt, order, mismatches)
+
+    for mismatch in mismatches[:MAX_REPORTED]:
+        print('MISMATCH', *mismatch)
+    checked = args.rows * len(coordparse.ANGLE_FORMATS) + args.rows // 4 * len(coordparse.FORMATS) * 2
+    print(f'{checked} rows checked (seed {args.seed}), {len(mismatches)} mismatches')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
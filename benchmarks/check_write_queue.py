@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Check of the background write queue against a local stand-in for a slow
+remote provider: a GeoPackage layer (or any --uri/--provider, e.g. a local
+PostgreSQL) with injected latency and optional transient failures.
+
+Measures how long the GUI thread is blocked per queued insert and verifies
+that every feature arrives; --flaky makes the first writes fail as if the
+source could not be opened, which the queue retries. Run with the Python that ships with QGIS:
+
+    python benchmarks/check_write_queue.py --jobs 50 --latency 0.2 --flaky 3
+    python benchmarks/check_write_queue.py --provider postgres --uri "dbname=gis table=pts (geom)"
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from fake_iface import start_app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=50, help='number of queued inserts')
+    parser.add_argument('--points', type=int, default=1, help='points per insert')
+    parser.add_argument('--latency', type=float, default=0.1, help='seconds added before every write')
+    parser.add_argument('--flaky', type=int, default=0, help='fail this many write attempts first')
+    parser.add_argument('--uri', help='existing point layer source (default: temporary GeoPackage)')
+    parser.add_argument('--provider', default='ogr')
+    args = parser.parse_args(argv)
+
+    app = start_app()
+    from qgis.core import QgsCoordinateReferenceSystem, QgsFeature, QgsGeometry, QgsPointXY, QgsProject, \
+        QgsVectorLayer
+    from AddPoint import writequeue
+    from AddPoint.filewriter import create_point_layer
+
+    tmp = None
+    if args.uri:
+        layer = QgsVectorLayer(args.uri, 'check', args.provider)
+    else:
+        tmp = tempfile.mkdtemp()
+        layer = create_point_layer(os.path.join(tmp, 'check.gpkg'), QgsCoordinateReferenceSystem('EPSG:4326'),
+                                   QgsProject.instance().transformContext(), 'check')
+    if not layer.isValid():
+        print(f'Invalid layer: {args.uri}', file=sys.stderr)
+        return 2
+    before = layer.featureCount()
+
+    queue = writequeue.WriteQueue(backoff=0.05, latency=args.latency)
+    if args.flaky:
+        write = queue._write
+        remaining = [args.flaky]
+
+        def flaky_write(job):
+            if remaining[0] > 0:
+                remaining[0] -= 1
+                raise ConnectionError('injected connection failure')
+            write(job)
+        queue._write = flaky_write
+
+    blocked = []
+    start = time.perf_counter()
+    for i in range(args.jobs):
+        feats = []
+        for j in range(args.points):
+            feat = QgsFeature(layer.fields())
+            feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(14.0 + i * 1e-4, 46.0 + j * 1e-4)))
+            feats.append(feat)
+        t = time.perf_counter()
+        queue.add(layer, feats)
+        blocked.append(time.perf_counter() - t)
+    while queue.pending():
+        app.processEvents()
+        time.sleep(0.01)
+    total = time.perf_counter() - start
+    queue.close()
+
+    layer.dataProvider().reloadData()
+    written = layer.featureCount() - before
+    expected = args.jobs * args.points
+    report = {
+        'jobs': args.jobs,
+        'latency_s': args.latency,
+        'flaky': args.flaky,
+        'gui_blocked_max_ms': max(blocked) * 1000.0,
+        'gui_blocked_mean_ms': sum(blocked) / len(blocked) * 1000.0,
+        'total_s': total,
+        'written': written,
+        'expected': expected,
+        'failed': queue.failed_count,
+    }
+    print(json.dumps(report, indent=2))
+    if tmp:
+        del layer
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0 if written == expected and not queue.failed_count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Minimal stand-in for QgisInterface so AddPointPlugin can run outside QGIS.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def start_app():
+    """Start a headless QgsApplication (offscreen Qt platform by default)."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from qgis.core import QgsApplication
+
+    app = QgsApplication.instance()
+    if app is None:
+        app = QgsApplication([], True)
+        app.initQgis()
+    return app
+
+
+class FakeMessageBar:
+    def __init__(self):
+        self.messages = []
+
+    def pushMessage(self, title, text, level=0, duration=0):
+        self.messages.append((title, text, level))
+
+
+class FakeIface:
+    def __init__(self):
+        from qgis.PyQt.QtWidgets import QMainWindow
+        from qgis.gui import QgsMapCanvas
+
+        self._main = QMainWindow()
+        self._canvas = QgsMapCanvas(self._main)
+        self._main.setCentralWidget(self._canvas)
+        self._bar = FakeMessageBar()
+
+    def mainWindow(self):
+        return self._main
+
+    def mapCanvas(self):
+        return self._canvas
+
+    def mapCanvases(self):
+        return [self._canvas]
+
+    def messageBar(self):
+        return self._bar
+
+    def addPluginToMenu(self, name, action):
+        pass
+
+    def removePluginMenu(self, name, action):
+        pass
+
+    def addToolBarIcon(self, action):
+        pass
+
+    def removeToolBarIcon(self, action):
+        pass
+
+    def addDockWidget(self, area, dock):
+        self._main.addDockWidget(area, dock)
+
+    def removeDockWidget(self, dock):
+        self._main.removeDockWidget(dock)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Startup cost probe: time AddPoint classFactory + initGui as QGIS does it.
+
+Each sample runs in a fresh interpreter so module imports are counted. The
+first show of the panel (dock construction) is timed separately. Run with the
+Python that ships with QGIS:
+
+    python benchmarks/probe_startup.py --samples 10
+    python benchmarks/probe_startup.py --panel hidden
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _sample(panel_visible):
+    """One measurement in this process; returns a dict of seconds per step."""
+    from fake_iface import FakeIface, start_app
+
+    app = start_app()
+    from qgis.core import QgsSettings
+
+    settings = QgsSettings()
+    previous = settings.value('AddPoint/panelVisible')
+    settings.setValue('AddPoint/panelVisible', panel_visible)
+    iface = FakeIface()
+
+    start = time.perf_counter()
+    import AddPoint
+    plugin = AddPoint.classFactory(iface)
+    class_factory = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plugin.initGui()
+    init_gui = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app.processEvents()  # deferred dock construction, if the panel is open
+    deferred = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plugin._ensure_dock()
+    first_show = time.perf_counter() - start
+
+    plugin.unload()
+    if previous is None:
+        settings.remove('AddPoint/panelVisible')
+    else:
+        settings.setValue('AddPoint/panelVisible', previous)
+    return {
+        'class_factory': class_factory,
+        'init_gui': init_gui,
+        'startup': class_factory + init_gui,
+        'deferred': deferred,
+        'first_show': first_show,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=int, default=10, help='number of fresh interpreters')
+    parser.add_argument('--panel', choices=('visible', 'hidden'), default='visible',
+                        help='panel state remembered from the previous session')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_sample(args.panel == 'visible')))
+        return 0
+
+    runs = []
+    for _ in range(args.samples):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', '--panel', args.panel],
+                             cwd=HERE, check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+
+    report = {
+        'panel': args.panel,
+        'samples': len(runs),
+        'median_ms': {k: statistics.median(r[k] for r in runs) * 1e3 for k in runs[0]},
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())